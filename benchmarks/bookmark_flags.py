@@ -0,0 +1,92 @@
+"""
+웹툰 목록 is_bookmarked: 로그인 사용자 응답과 익명 응답의 시간과 쿼리 수.
+
+--bookmarks 개를 북마크한 사용자로 ListView 한 페이지를 요청한다. 응답 캐시와 북마크 id
+집합 캐시가 채워진 뒤에는 캐시 읽기만으로 항목마다 is_bookmarked 를 붙인다. 비교로 같은
+페이지 항목마다 북마크 여부를 조회했을 때의 쿼리 수도 출력한다.
+
+    python -m benchmarks.bookmark_flags --bookmarks 5000
+"""
+
+import argparse
+from contextlib import ExitStack
+
+from benchmarks.search_latency import create_webtoons
+from benchmarks.utils import benchmark_database, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--webtoons", type=int, default=10000)
+    parser.add_argument("--bookmarks", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connections
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    from bookmark.models import Bookmark
+    from users.models import CustomUser
+    from webtoons.models import Webtoon
+
+    def count_queries(func):
+        # 조회는 replica 로 갈 수 있으므로 모든 연결의 쿼리를 센다
+        with ExitStack() as stack:
+            captures = [
+                stack.enter_context(CaptureQueriesContext(connections[alias]))
+                for alias in connections
+            ]
+            result = func()
+        return result, sum(len(queries) for queries in captures)
+
+    settings.ALLOWED_HOSTS = ["*"]
+    with benchmark_database():
+        create_webtoons(args.webtoons)
+        user = CustomUser.objects.create_user("user@example.com", nick_name="유저")
+        Bookmark.objects.bulk_create(
+            (
+                Bookmark(user=user, webtoon_id=webtoon_id)
+                for webtoon_id in Webtoon.objects.order_by("?").values_list(
+                    "id", flat=True
+                )[: args.bookmarks]
+            ),
+            batch_size=5000,
+        )
+
+        anonymous = APIClient()
+        client = APIClient()
+        client.force_authenticate(user)
+        params = {"page_size": args.page_size}
+
+        print(
+            f"webtoons={args.webtoons} bookmarks={args.bookmarks} "
+            f"page_size={args.page_size}"
+        )
+        print(f"{'':>10}{'median ms':>11}{'p95 ms':>9}{'queries':>9}")
+        for name, api_client in [("익명", anonymous), ("로그인", client)]:
+            api_client.get("/api/webtoons/list", params)
+            response, queries = count_queries(
+                lambda: api_client.get("/api/webtoons/list", params)
+            )
+            median, p95 = measure(
+                lambda: api_client.get("/api/webtoons/list", params),
+                repeat=args.repeat,
+            )
+            print(f"{name:>10}{median:>11.2f}{p95:>9.2f}{queries:>9}")
+
+        flagged = sum(item["is_bookmarked"] for item in response.data["results"])
+        _, queries = count_queries(
+            lambda: [
+                Bookmark.objects.filter(user=user, webtoon_id=item["id"]).exists()
+                for item in response.data["results"]
+            ]
+        )
+        print(f"북마크한 항목 {flagged}개, 항목마다 조회하면 쿼리 {queries}개")
+
+
+if __name__ == "__main__":
+    main()
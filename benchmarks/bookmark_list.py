@@ -0,0 +1,95 @@
+"""
+북마크 목록 expand=webtoon: 첫 페이지와 마지막 페이지의 응답 시간과 쿼리 수.
+
+사용자 한 명에게 --bookmarks 개 북마크(웹툰마다 태그 3개)를 만들어 두고, 커서를 따라
+전체를 읽으면서 첫 페이지/마지막 페이지의 시간을 재고 페이지별 쿼리 수가 일정한지 확인한다.
+비교로 같은 페이지를 조인/prefetch 없이 직렬화했을 때의 쿼리 수도 출력한다.
+
+    python -m benchmarks.bookmark_list --bookmarks 5000
+"""
+
+import argparse
+from contextlib import ExitStack
+
+from benchmarks.search_latency import create_webtoons
+from benchmarks.utils import benchmark_database, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookmarks", type=int, default=5000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection, connections
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.test import APIClient
+
+    from bookmark.models import Bookmark
+    from bookmark.serializers import BookmarkExpandedSerializer
+    from users.models import CustomUser
+    from webtoons.models import Tag, Webtoon, WebtoonTag
+
+    settings.ALLOWED_HOSTS = ["*"]
+    with benchmark_database():
+        create_webtoons(args.bookmarks)
+        webtoon_ids = list(Webtoon.objects.values_list("id", flat=True))
+        tags = Tag.objects.bulk_create(
+            Tag(tag_name=f"태그 {i}", category="genre") for i in range(30)
+        )
+        WebtoonTag.objects.bulk_create(
+            (
+                WebtoonTag(webtoon_id=webtoon_id, tag=tags[(webtoon_id + i) % 30])
+                for webtoon_id in webtoon_ids
+                for i in range(3)
+            ),
+            batch_size=5000,
+        )
+        user = CustomUser.objects.create_user("user@example.com", nick_name="유저")
+        Bookmark.objects.bulk_create(
+            (Bookmark(user=user, webtoon_id=webtoon_id) for webtoon_id in webtoon_ids),
+            batch_size=5000,
+        )
+
+        client = APIClient()
+        client.force_authenticate(user)
+        params = {"expand": "webtoon", "page_size": args.page_size}
+
+        page_urls = []
+        page_queries = set()
+        url = "/api/bookmark/"
+        while url:
+            page_urls.append(url)
+            # 조회는 replica 로 갈 수 있으므로 모든 연결의 쿼리를 센다
+            with ExitStack() as stack:
+                captures = [
+                    stack.enter_context(CaptureQueriesContext(connections[alias]))
+                    for alias in connections
+                ]
+                response = client.get(url, params if url == page_urls[0] else None)
+            page_queries.add(sum(len(queries) for queries in captures))
+            url = response.data["next"]
+
+        print(
+            f"bookmarks={args.bookmarks} page_size={args.page_size} "
+            f"pages={len(page_urls)} 페이지별 쿼리 수={sorted(page_queries)}"
+        )
+        print(f"{'':>8}{'median ms':>11}{'p95 ms':>9}")
+        for name, url, query in [
+            ("첫 페이지", page_urls[0], params),
+            ("마지막", page_urls[-1], None),
+        ]:
+            median, p95 = measure(lambda: client.get(url, query), repeat=args.repeat)
+            print(f"{name:>8}{median:>11.2f}{p95:>9.2f}")
+
+        page = list(Bookmark.objects.filter(user=user)[: args.page_size])
+        with CaptureQueriesContext(connection) as queries:
+            BookmarkExpandedSerializer(page, many=True).data
+        print(f"조인/prefetch 없이 한 페이지 직렬화: 쿼리 {len(queries)}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+북마크 토글 처리량: 행 잠금(select_for_update) 후 조회/삭제/추가 vs INSERT 먼저, 중복이면 DELETE.
+
+기존 뷰와 같이 트랜잭션 안에서 (user, webtoon) 행을 잠그고 읽은 뒤 지우거나 만드는 방식과
+bookmark.toggle.toggle_bookmark 를 --webtoons 개 웹툰에 번갈아 --toggles 번 토글해 비교한다.
+sqlite 는 FOR UPDATE 를 쓰지 않으므로 MySQL 에서는 잠금 대기만큼 차이가 더 난다.
+
+추가/삭제 한 번에 실행한 SELECT/INSERT/DELETE 문 수도 함께 출력한다.
+
+    python -m benchmarks.bookmark_toggle --toggles 5000
+"""
+
+import argparse
+import time
+
+from benchmarks.search_latency import create_webtoons
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--webtoons", type=int, default=100)
+    parser.add_argument("--toggles", type=int, default=5000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection, reset_queries, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    from bookmark.models import Bookmark
+    from bookmark.toggle import toggle_bookmark
+    from users.models import CustomUser
+    from webtoons.models import Webtoon
+
+    def statements(queries):
+        # 트랜잭션 제어(BEGIN/SAVEPOINT 등)를 뺀 SELECT/INSERT/DELETE 수
+        return sum(
+            query["sql"].split()[0] in ("SELECT", "INSERT", "DELETE")
+            for query in queries.captured_queries
+        )
+
+    def locked_toggle(user, webtoon_id):
+        with transaction.atomic():
+            existing = (
+                Bookmark.objects.select_for_update()
+                .filter(user=user, webtoon_id=webtoon_id)
+                .first()
+            )
+            if existing:
+                existing.delete()
+                return None
+            return Bookmark.objects.create(user=user, webtoon_id=webtoon_id)
+
+    with benchmark_database():
+        create_webtoons(args.webtoons)
+        webtoon_ids = list(Webtoon.objects.values_list("id", flat=True))
+        user = CustomUser.objects.create_user("user@example.com", nick_name="유저")
+
+        print(f"webtoons={len(webtoon_ids)} toggles={args.toggles}")
+        print(f"{'':>18}{'toggles/s':>11}{'add':>7}{'remove':>10}")
+        for name, toggle in [
+            ("select_for_update", locked_toggle),
+            ("insert", toggle_bookmark),
+        ]:
+            Bookmark.objects.all().delete()
+            reset_queries()
+            with CaptureQueriesContext(connection) as added:
+                toggle(user, webtoon_ids[0])
+            with CaptureQueriesContext(connection) as removed:
+                toggle(user, webtoon_ids[0])
+
+            started = time.perf_counter()
+            for i in range(args.toggles):
+                toggle(user, webtoon_ids[i % len(webtoon_ids)])
+            elapsed = time.perf_counter() - started
+            print(
+                f"{name:>18}{args.toggles / elapsed:>11.0f}"
+                f"{statements(added):>7}{statements(removed):>10}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+웹툰 목록(ListView) 초당 요청 수: 요청마다 새 연결(CONN_MAX_AGE=0) vs 연결 유지.
+
+WSGIHandler 로 요청을 처리해 운영과 같이 요청 시작/끝에 연결을 닫거나 유지한다.
+응답 캐시는 끄고(DummyCache) 매 요청이 DB 를 읽게 한다. sqlite 는 연결 비용이 거의
+없으므로 --connect-ms 로 원격 MySQL 의 TCP/TLS/인증 시간을 연결마다 더할 수 있다.
+
+    python -m benchmarks.list_view_throughput --requests 2000 --connect-ms 5
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from benchmarks.search_latency import create_webtoons
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--webtoons", type=int, default=1000)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument(
+        "--connect-ms", type=float, default=0, help="연결마다 더할 연결 시간 (ms)"
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIHandler
+    from django.db import connection
+    from django.test import RequestFactory, override_settings
+
+    settings.ALLOWED_HOSTS = ["*"]
+    directory = tempfile.TemporaryDirectory()
+    # 메모리 DB 는 닫지 않으므로 파일 DB 로 연결을 실제로 열고 닫는다
+    connection.settings_dict["TEST"]["NAME"] = os.path.join(
+        directory.name, "benchmark.sqlite3"
+    )
+
+    connects = 0
+    get_new_connection = connection.get_new_connection
+
+    def slow_connect(conn_params):
+        nonlocal connects
+        connects += 1
+        time.sleep(args.connect_ms / 1000)
+        return get_new_connection(conn_params)
+
+    # replica 라우팅 없이 default 연결 하나로 측정
+    with benchmark_database(), override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}},
+        DATABASE_REPLICAS=[],
+    ):
+        create_webtoons(args.webtoons)
+        connection.get_new_connection = slow_connect
+        handler = WSGIHandler()
+        environ = RequestFactory()._base_environ(
+            PATH_INFO="/api/webtoons/list", QUERY_STRING="sort=view"
+        )
+
+        print(
+            f"webtoons={args.webtoons} requests={args.requests} "
+            f"connect={args.connect_ms}ms"
+        )
+        print(f"{'CONN_MAX_AGE':>12}{'req/s':>10}{'connects':>10}")
+        for conn_max_age in [0, 60]:
+            # 닫을 시각은 연결할 때 정해지므로 설정을 바꾼 뒤 다시 연결
+            connection.settings_dict["CONN_MAX_AGE"] = conn_max_age
+            connection.close()
+            connects = 0
+            started = time.perf_counter()
+            for _ in range(args.requests):
+                response = handler(dict(environ), lambda status, headers: None)
+                assert response.status_code == 200
+                response.close()  # request_finished: 연결 정리
+            elapsed = time.perf_counter() - started
+            print(f"{conn_max_age:>12}{args.requests / elapsed:>10.1f}{connects:>10}")
+        connection.close()
+    directory.cleanup()
+
+
+if __name__ == "__main__":
+    main()
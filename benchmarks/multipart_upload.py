@@ -0,0 +1,108 @@
+"""
+대용량 파일 업로드 방식별 최대 메모리 비교.
+
+디스크에 있는 업로드 파일(TemporaryUploadedFile 과 같은 상황)을 로컬 S3 대역 서버로
+올리면서, 기존 방식(put_object(Body=file.read()))과 ObjectStorage.upload_stream
+(chunks() → multipart upload)의 최대 RSS 증가량과 tracemalloc 최대값을 잰다.
+측정이 섞이지 않도록 방식/크기마다 새 프로세스에서 실행한다.
+
+    python -m benchmarks.multipart_upload --sizes 50 200
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.s3_stub import S3Stub
+from benchmarks.utils import setup_django
+
+MB = 1024 * 1024
+
+
+def make_file(size_mb):
+    file = tempfile.NamedTemporaryFile(suffix=".bin", delete=False)
+    block = os.urandom(MB)
+    for _ in range(size_mb):
+        file.write(block)
+    file.close()
+    return file.name
+
+
+def max_rss_mb():
+    # 리눅스에서 ru_maxrss 단위는 KB
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run(mode, path, results):
+    setup_django()
+    from django.core.files import File
+
+    from common.storage import ObjectStorage
+
+    with S3Stub() as stub:
+        storage = ObjectStorage(
+            "toonchu", stub.endpoint_url, "access", "secret", "kr-standard"
+        )
+        storage.client  # 클라이언트 생성 비용은 측정에서 제외
+
+        rss_before = max_rss_mb()
+        tracemalloc.start()
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            file = File(f, name=os.path.basename(path))
+            if mode == "read":
+                storage.client.put_object(
+                    Bucket=storage.bucket, Key="form/bench.bin", Body=file.read()
+                )
+            else:
+                storage.upload_stream(file, "form/bench.bin")
+        elapsed = time.perf_counter() - started
+        _, traced_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        results.put(
+            {
+                "rss": max_rss_mb() - rss_before,
+                "traced": traced_peak / MB,
+                "seconds": elapsed,
+                "received": stub.server.received_bytes / MB,
+                "requests": stub.server.requests,
+            }
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200], help="MB")
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    print(
+        f"{'mode':>7} {'size':>6} {'peak rss +':>11} {'tracemalloc':>12}"
+        f" {'requests':>9} {'seconds':>8}"
+    )
+    for size in args.sizes:
+        path = make_file(size)
+        try:
+            for mode in ["read", "stream"]:
+                results = context.Queue()
+                process = context.Process(target=run, args=(mode, path, results))
+                process.start()
+                result = results.get()
+                process.join()
+                assert round(result["received"]) == size
+                print(
+                    f"{mode:>7} {size:>4}MB {result['rss']:>9.1f}MB"
+                    f" {result['traced']:>10.1f}MB {result['requests']:>9}"
+                    f" {result['seconds']:>8.2f}"
+                )
+        finally:
+            os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
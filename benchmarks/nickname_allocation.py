@@ -0,0 +1,94 @@
+"""
+랜덤 닉네임 할당: 이전 방식(이름 무작위 조합) vs NicknameAllocator.
+
+기존 방식은 무작위로 뽑은 이름이 이미 쓰였으면 가입이 IntegrityError 로 실패하므로
+가입 수별 누적 충돌 수를 센다. NicknameAllocator 는 --count 개를 할당하면서 중복이
+없는지, 할당 한 번의 시간과 순번 예약(DB 쓰기) 횟수를 잰다. 마지막으로 --users 명이
+가입된 상태에서 사용 중인 이름 확인(exists)까지 포함한 allocate() 시간을 잰다.
+
+    python -m benchmarks.nickname_allocation --count 1000000
+"""
+
+import argparse
+import random
+import time
+
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def legacy_collisions(first_names, last_names, hidden_names, signups):
+    """이름을 무작위로 조합하던 이전 방식으로 signups 번 뽑았을 때 누적 충돌 수"""
+    used, collisions, report = set(), 0, {}
+    for signup in range(1, max(signups) + 1):
+        if random.random() < 0.02:
+            name = random.choice(hidden_names)
+        else:
+            name = f"{random.choice(first_names)} {random.choice(last_names)}"
+        if name in used:
+            collisions += 1
+        used.add(name)
+        if signup in signups:
+            report[signup] = collisions
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--checked", type=int, default=10_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+
+    from users.models import NicknameSequence
+    from users.nicknames import NicknameAllocator, NicknameSpace
+    from users.utils import FIRST_NAMES, HIDDEN_NICKNAMES, LAST_NAMES
+
+    space = NicknameSpace(FIRST_NAMES, LAST_NAMES)
+    print(f"조합 공간 {space.size}개 (히든 {len(HIDDEN_NICKNAMES)}개)")
+
+    signups = [1_000, 10_000, 100_000]
+    print("\n기존 방식 누적 충돌(가입 실패)")
+    for signup, collisions in legacy_collisions(
+        FIRST_NAMES, LAST_NAMES, HIDDEN_NICKNAMES, signups
+    ).items():
+        print(f"{signup:>9} 가입 {collisions:>7} ({collisions / signup:.1%})")
+
+    with benchmark_database():
+        allocator = NicknameAllocator("benchmark", space)
+        started = time.perf_counter()
+        names = [allocator.next_name() for _ in range(args.count)]
+        elapsed = time.perf_counter() - started
+        assert len(set(names)) == args.count
+        blocks = NicknameSequence.objects.get(name="benchmark").next_value
+        blocks //= settings.NICKNAME_BLOCK_SIZE
+        print(
+            f"\nNicknameAllocator {args.count}개: {elapsed:.2f}s"
+            f" ({elapsed / args.count * 1e6:.2f}us/개), 중복 0,"
+            f" 순번 예약 {blocks}번, 마지막 이름 '{names[-1]}'"
+        )
+
+        # 가입자가 있는 상태에서 사용 중인 이름 확인(exists)까지 포함한 비용
+        User = get_user_model()
+        User.objects.bulk_create(
+            (
+                User(email=f"user{i}@example.com", nick_name=name)
+                for i, name in enumerate(names[-args.users :])
+            ),
+            batch_size=1000,
+        )
+        started = time.perf_counter()
+        checked = [allocator.allocate() for _ in range(args.checked)]
+        elapsed = time.perf_counter() - started
+        assert len(set(checked) | set(names)) == args.count + args.checked
+        print(
+            f"allocate() {args.checked}개 (가입자 {args.users}명):"
+            f" {elapsed / args.checked * 1e6:.1f}us/개"
+        )
+
+
+if __name__ == "__main__":
+    main()
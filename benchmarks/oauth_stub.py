@@ -0,0 +1,68 @@
+"""
+벤치마크용 로컬 소셜 로그인 provider 대역 서버.
+
+카카오 토큰(POST)/프로필(GET) API 형식으로 응답하며, 모든 응답을 latency 초만큼
+늦춰 실제 provider 왕복 시간을 흉내 낸다. 인가 코드별로 다른 사용자 정보를 돌려준다.
+대역 서버의 CPU 사용이 측정 대상과 GIL 을 다투지 않도록 별도 프로세스에서 실행한다.
+"""
+
+import multiprocessing
+import time
+
+from common.testing import StubHandler, StubServer
+
+
+class OAuthStubHandler(StubHandler):
+    def do_POST(self):
+        self.reply({"access_token": f"token-{self.read_form()['code']}"})
+
+    def do_GET(self):
+        code = self.headers["Authorization"].removeprefix("Bearer token-")
+        self.reply(
+            {
+                "kakao_account": {"email": f"{code}@example.com"},
+                "properties": {"nick_name": f"user-{code}", "profile_image": None},
+            }
+        )
+
+    def reply(self, data, status=200):
+        time.sleep(self.server.latency)
+        with self.server.requests.get_lock():
+            self.server.requests.value += 1
+        super().reply(data, status)
+
+
+def serve(latency, requests, addresses):
+    server = StubServer(("127.0.0.1", 0), OAuthStubHandler)
+    server.latency = latency
+    server.requests = requests
+    addresses.put(server.server_address)
+    server.serve_forever()
+
+
+class OAuthStub:
+    def __init__(self, latency):
+        context = multiprocessing.get_context("spawn")
+        self.requests = context.Value("i", 0)
+        self.addresses = context.Queue()
+        self.process = context.Process(
+            target=serve, args=(latency, self.requests, self.addresses), daemon=True
+        )
+        self.address = None
+
+    @property
+    def endpoints(self):
+        host, port = self.address
+        return {
+            "token_url": f"http://{host}:{port}/token",
+            "profile_url": f"http://{host}:{port}/me",
+        }
+
+    def __enter__(self):
+        self.process.start()
+        self.address = self.addresses.get()
+        return self
+
+    def __exit__(self, *exc):
+        self.process.terminate()
+        self.process.join()
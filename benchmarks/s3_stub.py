@@ -0,0 +1,84 @@
+"""
+벤치마크용 로컬 S3 대역 서버.
+
+put_object 와 multipart upload(create/upload_part/complete/abort) 요청만 처리하고,
+받은 본문은 저장하지 않고 크기만 센다.
+"""
+
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+READ_SIZE = 1024 * 1024
+
+
+class S3StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _query(self):
+        return parse_qs(urlsplit(self.path).query, keep_blank_values=True)
+
+    def _consume_body(self):
+        remaining = int(self.headers.get("Content-Length", 0))
+        while remaining:
+            chunk = self.rfile.read(min(remaining, READ_SIZE))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            self.server.received_bytes += len(chunk)
+
+    def _reply(self, status=200, body=b"", headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_PUT(self):
+        self._consume_body()
+        self.server.requests += 1
+        self._reply(headers={"ETag": f'"{uuid.uuid4().hex}"'})
+
+    def do_POST(self):
+        self._consume_body()
+        self.server.requests += 1
+        query = self._query()
+        if "uploads" in query:
+            body = (
+                "<InitiateMultipartUploadResult>"
+                f"<UploadId>{uuid.uuid4().hex}</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            )
+        else:
+            body = "<CompleteMultipartUploadResult></CompleteMultipartUploadResult>"
+        self._reply(body=body.encode(), headers={"Content-Type": "application/xml"})
+
+    def do_DELETE(self):
+        self.server.requests += 1
+        self._reply(status=204)
+
+
+class S3Stub:
+    def __init__(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), S3StubHandler)
+        self.server.received_bytes = 0
+        self.server.requests = 0
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def endpoint_url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
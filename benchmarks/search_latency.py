@@ -0,0 +1,111 @@
+"""
+웹툰 통합 검색 지연시간 비교: icontains(LIKE '%검색어%') vs 2-gram 색인.
+
+    python -m benchmarks.search_latency --count 100000
+"""
+
+import argparse
+import datetime
+import random
+
+from benchmarks.utils import benchmark_database, measure, setup_django
+
+# 합성 제목/작가에 쓸 자주 쓰이는 한글 음절
+SYLLABLES = list(
+    "가나다라마바사아자차카타파하고노도로모보소오조초코토포호구누두루무부수우주"
+    "추쿠투푸후기니디리미비시이지치키티피히나의너를은는이가에서와과한대왕검신마법"
+)
+
+
+def random_word(rng, min_length=1, max_length=4):
+    return "".join(rng.choices(SYLLABLES, k=rng.randint(min_length, max_length)))
+
+
+def random_title(rng):
+    return " ".join(random_word(rng) for _ in range(rng.randint(1, 4)))
+
+
+def create_webtoons(count, seed=0, batch_size=5000):
+    from webtoons.models import Webtoon
+    from webtoons.search import index_webtoons
+
+    rng = random.Random(seed)
+    for start in range(0, count, batch_size):
+        batch = [
+            Webtoon(
+                title=random_title(rng),
+                author=random_word(rng, 2, 3),
+                thumbnail="https://example.com/thumbnail.jpg",
+                age_rating="all",
+                publication_day=datetime.date(2025, 1, 1),
+                webtoon_url="https://example.com/webtoon",
+                platform=rng.choice(["naver", "kakao", "kakaopage"]),
+                serialization_cycle="1weeks",
+                like_count=rng.randint(0, 10000),
+            )
+            for _ in range(min(batch_size, count - start))
+        ]
+        index_webtoons(Webtoon.objects.bulk_create(batch))
+
+
+def sample_terms(rng, size):
+    from webtoons.models import Webtoon
+
+    titles = list(Webtoon.objects.values_list("title", flat=True)[:1000])
+    terms = []
+    for _ in range(size):
+        title = rng.choice(titles).replace(" ", "")
+        start = rng.randrange(len(title))
+        terms.append(title[start : start + rng.randint(1, 3)])
+    return terms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100_000)
+    parser.add_argument("--terms", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db.models import Q
+
+    from webtoons.models import Webtoon
+    from webtoons.search import search_webtoons
+
+    with benchmark_database():
+        create_webtoons(args.count)
+        terms = sample_terms(random.Random(1), args.terms)
+
+        def icontains(term):
+            return list(
+                Webtoon.objects.filter(
+                    Q(title__icontains=term) | Q(author__icontains=term)
+                ).values_list("id", flat=True)
+            )
+
+        def ngram(term):
+            return list(
+                search_webtoons(Webtoon.objects.all(), term).values_list(
+                    "id", flat=True
+                )
+            )
+
+        print(f"webtoons={args.count} terms={len(terms)} repeat={args.repeat}")
+        print(f"{'term':<8}{'hits':>8}{'icontains ms':>16}{'ngram ms':>12}")
+        totals = {"icontains": 0.0, "ngram": 0.0}
+        for term in terms:
+            assert set(icontains(term)) == set(ngram(term))
+            old, _ = measure(lambda: icontains(term), args.repeat)
+            new, _ = measure(lambda: ngram(term), args.repeat)
+            totals["icontains"] += old
+            totals["ngram"] += new
+            print(f"{term:<8}{len(ngram(term)):>8}{old:>16.2f}{new:>12.2f}")
+        print(
+            f"{'mean':<16}{totals['icontains'] / len(terms):>16.2f}"
+            f"{totals['ngram'] / len(terms):>12.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+소셜 로그인 처리량: 동기(WSGI) SocialLoginView vs 비동기(ASGI) AsyncSocialLoginView.
+
+provider 는 응답마다 --latency 초가 걸리는 로컬 대역 서버로 바꾸고, 로그인마다 새
+인가 코드를 써서 사용자 생성까지 포함한다. WSGI 는 워커 스레드 --threads 개가
+django.test.Client(WSGIHandler)로, ASGI 는 이벤트 루프 하나에서 --concurrency 개의
+요청을 django.test.AsyncClient(ASGIHandler)로 동시에 보낸다.
+
+    python -m benchmarks.social_login_load --logins 400 --threads 8 --concurrency 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.oauth_stub import OAuthStub
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def summarize(mode, workers, timings, elapsed):
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(
+        f"{mode:>5} {workers:>8} {len(timings) / elapsed:>10.1f}"
+        f" {statistics.median(timings):>9.1f} {p95:>9.1f}"
+    )
+
+
+def run_wsgi(codes, threads):
+    from django.test import Client
+
+    def login(code):
+        started = time.perf_counter()
+        response = Client().post(
+            "/api/users/login/kakao/", {"code": code}, content_type="application/json"
+        )
+        assert response.status_code == 200, response.content
+        return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        timings = list(executor.map(login, codes))
+    return timings, time.perf_counter() - started
+
+
+async def run_asgi(codes, concurrency):
+    from django.test import AsyncClient
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login(code):
+        async with semaphore:
+            started = time.perf_counter()
+            response = await AsyncClient().post(
+                "/api/users/login/kakao/async/",
+                {"code": code},
+                content_type="application/json",
+            )
+            assert response.status_code == 200, response.content
+            return (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    timings = await asyncio.gather(*(login(code) for code in codes))
+    return list(timings), time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--threads", type=int, default=8, help="WSGI 워커 스레드 수")
+    parser.add_argument("--concurrency", type=int, default=200, help="ASGI 동시 요청")
+    parser.add_argument("--latency", type=float, default=0.2, help="provider 응답(초)")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.contrib.auth import get_user_model
+    from django.test import override_settings
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    database = settings.DATABASES["default"]
+    if database["ENGINE"] == "django.db.backends.sqlite3":
+        # 여러 스레드가 함께 쓰는 메모리 DB 는 테이블 잠금이 나므로 파일 DB 사용
+        path = os.path.join(tempfile.mkdtemp(), "social_login_load.sqlite3")
+        database.setdefault("TEST", {})["NAME"] = path
+
+    with OAuthStub(args.latency) as stub, benchmark_database():
+        # setting_changed 로 캐시된 provider 정보도 다시 만든다
+        overrides = override_settings(
+            OAUTH_PROVIDER_ENDPOINTS={"kakao": stub.endpoints}
+        )
+        overrides.enable()
+
+        print(f"provider latency {args.latency * 1000:.0f}ms x 2, {args.logins} logins")
+        print(
+            f"{'mode':>5} {'workers':>8} {'logins/s':>10} {'p50 ms':>9} {'p95 ms':>9}"
+        )
+        codes = [f"wsgi-{i}" for i in range(args.logins)]
+        summarize("wsgi", args.threads, *run_wsgi(codes, args.threads))
+        codes = [f"asgi-{i}" for i in range(args.logins)]
+        summarize(
+            "asgi", args.concurrency, *asyncio.run(run_asgi(codes, args.concurrency))
+        )
+
+        assert get_user_model().objects.count() == args.logins * 2
+        assert stub.requests.value == args.logins * 4
+
+
+if __name__ == "__main__":
+    main()
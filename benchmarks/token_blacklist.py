@@ -0,0 +1,76 @@
+"""
+리프레시 토큰 검증: 블랙리스트 DB 조회 대비 Bloom filter.
+
+블랙리스트에 --blacklisted 개의 토큰을 넣어 두고, 블랙리스트에 없는 토큰을 simplejwt 기본
+RefreshToken(매번 조회) 과 users.tokens.RefreshToken(filter 에 없으면 조회 생략) 으로
+검증하는 시간을 비교한다.
+
+    python -m benchmarks.token_blacklist --blacklisted 100000
+"""
+
+import argparse
+import datetime
+
+from benchmarks.utils import benchmark_database, measure, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--blacklisted", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.utils import timezone
+    from rest_framework_simplejwt import tokens
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken,
+        OutstandingToken,
+    )
+
+    from users.models import CustomUser
+    from users.tokens import RefreshToken, blacklist_filter
+
+    with benchmark_database():
+        expires_at = timezone.now() + datetime.timedelta(days=1)
+        OutstandingToken.objects.bulk_create(
+            (
+                OutstandingToken(jti=f"jti-{i}", token="token", expires_at=expires_at)
+                for i in range(args.blacklisted)
+            ),
+            batch_size=1000,
+        )
+        BlacklistedToken.objects.bulk_create(
+            (
+                BlacklistedToken(token_id=token_id)
+                for token_id in range(1, args.blacklisted + 1)
+            ),
+            batch_size=1000,
+        )
+        user = CustomUser.objects.create_user("user@example.com", nick_name="유저")
+        token = str(RefreshToken.for_user(user))
+        blacklist_filter.might_contain("warmup")
+
+        print(f"blacklisted={args.blacklisted} repeat={args.repeat}")
+        print(f"{'':>12}{'median ms':>11}{'p95 ms':>9}{'queries':>9}")
+        for name, token_class in [
+            ("DB 조회", tokens.RefreshToken),
+            ("filter", RefreshToken),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                token_class(token)
+            median, p95 = measure(lambda: token_class(token), repeat=args.repeat)
+            print(f"{name:>12}{median:>11.3f}{p95:>9.3f}{len(queries):>9}")
+
+        bloom = blacklist_filter.filter
+        false_positives = sum(f"other-{i}" in bloom for i in range(100_000))
+        print(
+            f"filter: {bloom.size / 8 / 2**20:.2f}MB, 해시 {bloom.hashes}개, "
+            f"false positive {false_positives / 1000:.2f}%"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+벤치마크 공통 유틸.
+
+벤치마크는 운영 DB 를 건드리지 않도록 테스트 DB 를 새로 만들어 사용하고 끝나면 삭제한다.
+CI 와 같이 마이그레이션 없이 현재 모델 기준으로 테이블을 만든다.
+
+    python -m benchmarks.search_latency
+"""
+
+import os
+import statistics
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django():
+    sys.path.insert(0, str(BASE_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.local")
+
+    import django
+
+    django.setup()
+
+
+@contextmanager
+def benchmark_database():
+    from django.apps import apps
+    from django.conf import settings
+    from django.db import connection, connections
+
+    settings.MIGRATION_MODULES = {
+        app_config.label: None for app_config in apps.get_app_configs()
+    }
+    old_name = connection.creation.create_test_db(verbosity=0)
+    # replica 조회도 테스트 DB 를 읽도록 (common.routers)
+    for alias in settings.DATABASE_REPLICAS:
+        connections[alias].close()
+        connections[alias].creation.set_as_test_mirror(connection.settings_dict)
+    try:
+        yield connection
+    finally:
+        for alias in settings.DATABASE_REPLICAS:
+            connections[alias].close()
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+
+def measure(func, repeat=20):
+    """func 를 repeat 번 실행해 (중앙값, p95) 밀리초를 반환"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    return statistics.median(timings), p95
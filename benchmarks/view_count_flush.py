@@ -0,0 +1,93 @@
+"""
+조회수 반영 주기별 쓰기 증폭 비교.
+
+인기 편중(Zipf) 분포의 조회 이벤트를 흘려보내면서 반영 주기마다 ViewCountBuffer.flush 를
+실행해, 이벤트당 UPDATE 를 날리는 방식 대비 실제 실행된 UPDATE 수를 센다.
+
+    python -m benchmarks.view_count_flush --events 200000 --rate 2000
+"""
+
+import argparse
+import datetime
+import random
+
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def zipf_weights(size, s=1.1):
+    return [1 / (rank**s) for rank in range(1, size + 1)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--webtoons", type=int, default=5000)
+    parser.add_argument("--events", type=int, default=200_000)
+    parser.add_argument("--rate", type=int, default=2000, help="초당 조회 이벤트 수")
+    parser.add_argument(
+        "--intervals", type=float, nargs="+", default=[0.1, 1, 5, 10, 30, 60]
+    )
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    from webtoons.models import Webtoon
+    from webtoons.view_counter import ViewCountBuffer
+
+    # 백그라운드 반영 스레드 없이 반영 시점을 직접 제어
+    settings.VIEW_COUNT_FLUSH_INTERVAL = 0
+
+    with benchmark_database():
+        Webtoon.objects.bulk_create(
+            Webtoon(
+                title=f"웹툰{i}",
+                author="작가",
+                thumbnail="https://example.com/thumbnail.jpg",
+                age_rating="all",
+                publication_day=datetime.date(2025, 1, 1),
+                webtoon_url="https://example.com/webtoon",
+                platform="naver",
+                serialization_cycle="1weeks",
+            )
+            for i in range(args.webtoons)
+        )
+        webtoon_ids = list(Webtoon.objects.values_list("id", flat=True))
+        events = random.Random(0).choices(
+            webtoon_ids, weights=zipf_weights(len(webtoon_ids)), k=args.events
+        )
+        duration = args.events / args.rate
+
+        print(
+            f"events={args.events} rate={args.rate}/s duration={duration:.0f}s "
+            f"webtoons={args.webtoons}"
+        )
+        print(
+            f"{'interval s':>10}{'flushes':>10}{'UPDATEs':>10}"
+            f"{'UPDATE/event':>14}{'vs per-event':>14}"
+        )
+        for interval in args.intervals:
+            Webtoon.objects.update(view_count=0)
+            buffer = ViewCountBuffer()
+            per_flush = max(1, int(interval * args.rate))
+            flushes = 0
+            with CaptureQueriesContext(connection) as queries:
+                for start in range(0, len(events), per_flush):
+                    # 반영 주기 동안 들어온 이벤트를 버퍼에 쌓고 한 번에 반영
+                    for webtoon_id in events[start : start + per_flush]:
+                        buffer.add(webtoon_id)
+                    buffer.flush()
+                    flushes += 1
+            updates = len(queries)
+            assert sum(Webtoon.objects.values_list("view_count", flat=True)) == len(
+                events
+            )
+            print(
+                f"{interval:>10}{flushes:>10}{updates:>10}"
+                f"{updates / len(events):>14.4f}{len(events) / updates:>13.0f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
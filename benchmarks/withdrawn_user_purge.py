@@ -0,0 +1,140 @@
+"""
+탈퇴 사용자 삭제: 한 번의 delete() 와 청크 단위 삭제 비교.
+
+탈퇴 사용자마다 북마크, 좋아요, 토큰(블랙리스트 포함)을 만들어 두고 같은 데이터를
+두 방식으로 지우면서 전체 시간, 가장 긴 트랜잭션 시간, 최대 메모리 증가량을 잰다.
+가장 긴 트랜잭션 시간이 다른 요청이 테이블 락을 기다릴 수 있는 최대 시간이다.
+
+    python -m benchmarks.withdrawn_user_purge --users 20000 --chunk-size 500
+"""
+
+import argparse
+import datetime
+import time
+import tracemalloc
+
+from benchmarks.utils import benchmark_database, setup_django
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--bookmarks", type=int, default=5, help="사용자당 북마크 수")
+    parser.add_argument("--chunk-size", type=int, default=500)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.utils import timezone
+    from rest_framework_simplejwt.token_blacklist.models import (
+        BlacklistedToken,
+        OutstandingToken,
+    )
+
+    from bookmark.models import Bookmark
+    from users.delete_users import delete_withdrawn_users
+    from users.models import CustomUser
+    from webtoons.models import Webtoon, WebtoonLike
+
+    def populate():
+        # 기존 방식은 토큰을 남기므로(SET_NULL) 매번 비우고 시작
+        OutstandingToken.objects.all().delete()
+        withdraw_at = timezone.now() - datetime.timedelta(days=60)
+        CustomUser.objects.bulk_create(
+            (
+                CustomUser(
+                    email=f"user{i}@example.com",
+                    nick_name=f"유저{i}",
+                    withdraw_at=withdraw_at,
+                )
+                for i in range(args.users)
+            ),
+            batch_size=1000,
+        )
+        user_ids = list(CustomUser.objects.values_list("id", flat=True))
+        webtoon_ids = list(Webtoon.objects.values_list("id", flat=True))
+        Bookmark.objects.bulk_create(
+            (
+                Bookmark(user_id=user_id, webtoon_id=webtoon_id)
+                for user_id in user_ids
+                for webtoon_id in webtoon_ids[: args.bookmarks]
+            ),
+            batch_size=1000,
+        )
+        WebtoonLike.objects.bulk_create(
+            (
+                WebtoonLike(user_id=user_id, webtoon_id=webtoon_ids[0])
+                for user_id in user_ids
+            ),
+            batch_size=1000,
+        )
+        expires_at = timezone.now() - datetime.timedelta(days=59)
+        OutstandingToken.objects.bulk_create(
+            (
+                OutstandingToken(
+                    user_id=user_id,
+                    jti=f"jti-{user_id}",
+                    token="token",
+                    expires_at=expires_at,
+                )
+                for user_id in user_ids
+            ),
+            batch_size=1000,
+        )
+        BlacklistedToken.objects.bulk_create(
+            (BlacklistedToken(token=token) for token in OutstandingToken.objects.all()),
+            batch_size=1000,
+        )
+
+    def legacy():
+        # 기존 방식: 전체를 한 번에 (트랜잭션 하나)
+        started = time.perf_counter()
+        CustomUser.objects.filter(withdraw_at__lte=timezone.now()).delete()
+        elapsed = time.perf_counter() - started
+        return elapsed, elapsed
+
+    def chunked():
+        longest = 0
+        last = time.perf_counter()
+
+        def progress(deleted, last_id):
+            nonlocal longest, last
+            now = time.perf_counter()
+            longest = max(longest, now - last)
+            last = now
+
+        started = time.perf_counter()
+        delete_withdrawn_users(chunk_size=args.chunk_size, pause=0, progress=progress)
+        return time.perf_counter() - started, longest
+
+    with benchmark_database():
+        Webtoon.objects.bulk_create(
+            Webtoon(
+                title=f"웹툰{i}",
+                author="작가",
+                thumbnail="https://example.com/thumbnail.jpg",
+                age_rating="all",
+                publication_day=datetime.date(2025, 1, 1),
+                webtoon_url="https://example.com/webtoon",
+                platform="naver",
+                serialization_cycle="1weeks",
+            )
+            for i in range(args.bookmarks)
+        )
+        print(
+            f"users={args.users} bookmarks/user={args.bookmarks} "
+            f"chunk_size={args.chunk_size}"
+        )
+        print(f"{'':>10}{'total s':>10}{'longest tx s':>14}{'peak MB':>10}")
+        for name, purge in [("delete()", legacy), ("chunked", chunked)]:
+            populate()
+            tracemalloc.start()
+            total, longest = purge()
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            assert not CustomUser.objects.exists()
+            assert not Bookmark.objects.exists()
+            print(f"{name:>10}{total:>10.2f}{longest:>14.3f}{peak / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+사용자별 북마크한 웹툰 id 집합 캐시.
+
+웹툰 목록/검색 응답의 항목마다 is_bookmarked 를 붙일 때 행마다 조회하지 않고 캐시 읽기 한
+번으로 확인한다. 집합은 처음 필요할 때 한 번 읽어 두고, 북마크 토글이 커밋되면 캐시에 있는
+집합에 더하거나 뺀다. 같은 사용자의 토글이 동시에 고치는 경우는 짧은 잠금 키로 막는다.
+캐시에 집합이 없거나 잠금을 얻지 못하면 사용자별 버전을 올려, 토글 전에 DB 를 읽은 요청이
+예전 집합을 새 키에 저장하지 못하게 한다 (키의 버전은 DB 를 읽기 전에 정해진다).
+"""
+
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.cache import bump_versions, get_versions
+from common.routers import primary_reads
+
+from .models import Bookmark
+
+BOOKMARKED_NAMESPACE = "bookmarked_webtoons:{user_id}"
+BOOKMARKED_KEY = "bookmarked_webtoons:{user_id}:{version}"
+LOCK_KEY = "bookmarked_webtoons:{user_id}:lock"
+LOCK_TIMEOUT = 5
+LOCK_RETRIES = 3
+
+
+def _namespace(user_id):
+    return BOOKMARKED_NAMESPACE.format(user_id=user_id)
+
+
+def bookmarked_key(user_id):
+    (version,) = get_versions([_namespace(user_id)])
+    return BOOKMARKED_KEY.format(user_id=user_id, version=version)
+
+
+def get_bookmarked_ids(user):
+    """user 가 북마크한 웹툰 id 집합, 캐시에 없으면 DB 에서 읽어 채운다"""
+    key = bookmarked_key(user.pk)
+    webtoon_ids = cache.get(key)
+    if webtoon_ids is None:
+        with primary_reads():
+            webtoon_ids = set(
+                Bookmark.objects.filter(user=user).values_list("webtoon_id", flat=True)
+            )
+        # 그사이 토글이 고친 집합을 덮어쓰지 않는다
+        cache.add(key, webtoon_ids, timeout=settings.BOOKMARKED_IDS_CACHE_TIMEOUT)
+    return webtoon_ids
+
+
+def update_bookmarked_ids(user_id, webtoon_id, bookmarked):
+    """토글 결과를 캐시된 집합에 반영, 캐시에 없으면 버전만 올린다"""
+    lock_key = LOCK_KEY.format(user_id=user_id)
+    for _ in range(LOCK_RETRIES):
+        if cache.add(lock_key, True, timeout=LOCK_TIMEOUT):
+            break
+        time.sleep(0.01)
+    else:
+        bump_versions(_namespace(user_id))
+        return
+
+    try:
+        key = bookmarked_key(user_id)
+        webtoon_ids = cache.get(key)
+        if webtoon_ids is None:
+            # 지금 DB 를 읽고 있는 요청이 토글 전 집합을 저장할 수 있다
+            bump_versions(_namespace(user_id))
+            return
+        if bookmarked:
+            webtoon_ids.add(webtoon_id)
+        else:
+            webtoon_ids.discard(webtoon_id)
+        cache.set(key, webtoon_ids, timeout=settings.BOOKMARKED_IDS_CACHE_TIMEOUT)
+    finally:
+        cache.delete(lock_key)
+
+
+class BookmarkFlagMixin:
+    """
+    로그인 사용자에게 웹툰 목록 응답의 항목마다 is_bookmarked 를 붙이는 APIView mixin.
+    응답 캐시(cache_response)는 사용자와 관계없이 공유되므로 캐시된 응답 위에 붙인다.
+    """
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code != 200 or not request.user.is_authenticated:
+            return response
+
+        webtoon_ids = get_bookmarked_ids(request.user)
+        data = response.data
+        # 키셋 페이지네이션 응답({"next", "results"}) 과 목록 응답 모두 처리
+        items = data["results"] if isinstance(data, dict) else data
+        flagged = [
+            {**item, "is_bookmarked": item["id"] in webtoon_ids} for item in items
+        ]
+        response.data = (
+            {**data, "results": flagged} if isinstance(data, dict) else flagged
+        )
+        return response
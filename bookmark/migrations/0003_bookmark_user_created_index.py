@@ -0,0 +1,22 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bookmark", "0002_initial"),
+        ("webtoons", "0007_webtoon_thumbnail_variants"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="bookmark",
+            index=models.Index(
+                fields=["user", "-created", "-id"], name="bookmark_user_created_id_idx"
+            ),
+        ),
+    ]
@@ -20,6 +20,12 @@ class Bookmark(models.Model):
         unique_together = (
             ("user", "webtoon"),
         )  # 사용자가 같은 웹툰 중복 bookmark 방지
+        indexes = [
+            # 사용자별 북마크 목록 (created, id) 키셋 페이지네이션
+            models.Index(
+                fields=["user", "-created", "-id"], name="bookmark_user_created_id_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.username}'s bookmark for {self.webtoon.title}"
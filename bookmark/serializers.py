@@ -1,6 +1,7 @@
 from rest_framework import serializers
 
 from bookmark.models import Bookmark
+from webtoons.serializers import WebtoonsSerializer
 
 
 class BookmarkSerializer(serializers.ModelSerializer):
@@ -8,3 +9,9 @@ class BookmarkSerializer(serializers.ModelSerializer):
         model = Bookmark
         fields = ["id", "user", "webtoon", "created"]
         read_only_fields = ["user", "created"]
+
+
+class BookmarkExpandedSerializer(BookmarkSerializer):
+    """expand=webtoon: 웹툰 id 대신 목록과 같은 웹툰 요약을 포함"""
+
+    webtoon = WebtoonsSerializer(read_only=True)
@@ -1,41 +1,255 @@
-# from django.contrib.auth import get_user_model
-# from django.utils import timezone
-# from rest_framework.test import APITestCase
-#
-# from bookmark.models import Bookmark
-#
-# from .models import Webtoon
-#
-#
-# class BookmarkTestCase(APITestCase):
-#     def setUp(self):
-#         self.user = get_user_model().objects.create_user(
-#             # username='testuser',
-#             email="test@example.com",
-#             nick_name="TestNick",
-#             password="testpass",
-#         )
-#         self.webtoon = Webtoon.objects.create(
-#             title="Test Webtoon",
-#             publication_day=timezone.now().date(),  # publication_day 값 제공
-#         )
-#         self.client.force_authenticate(user=self.user)
-#         self.url = "/api/bookmarks/"
-#
-#     def test_create_bookmark(self):
-#         response = self.client.post(self.url, {"webtoon": self.webtoon.id})
-#         self.assertEqual(response.status_code, 201)
-#         self.assertEqual(Bookmark.objects.count(), 1)
-#         self.assertEqual(Bookmark.objects.get().webtoon, self.webtoon)
-#
-#     def test_list_bookmarks(self):
-#         Bookmark.objects.create(user=self.user, webtoon=self.webtoon)
-#         response = self.client.get(self.url)
-#         self.assertEqual(response.status_code, 200)
-#         self.assertEqual(len(response.data), 1)
-#
-#     def test_delete_bookmark(self):
-#         bookmark = Bookmark.objects.create(user=self.user, webtoon=self.webtoon)
-#         response = self.client.post(self.url, {"webtoon": self.webtoon.id})
-#         self.assertEqual(response.status_code, 204)
-#         self.assertEqual(Bookmark.objects.count(), 0)
+import threading
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import IntegrityError, connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from bookmark.bookmarked import get_bookmarked_ids
+from bookmark.models import Bookmark
+from bookmark.toggle import DEBOUNCE_KEY, TOGGLE_ATTEMPTS, toggle_bookmark
+from common.testing import create_webtoon
+from users.models import CustomUser
+from webtoons.models import Tag, WebtoonTag
+
+
+class BookmarkToggleTestCase(TestCase):
+    url = "/api/bookmark/"
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            "test@example.com", nick_name="TestNick"
+        )
+        self.webtoon = create_webtoon()
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    @override_settings(BOOKMARK_TOGGLE_DEBOUNCE_SECONDS=0)
+    def test_toggle(self):
+        response = self.client.post(self.url, {"webtoon": self.webtoon.id})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["webtoon"], self.webtoon.id)
+        self.assertTrue(Bookmark.objects.filter(user=self.user).exists())
+
+        response = self.client.post(self.url, {"webtoon": self.webtoon.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Bookmark.objects.filter(user=self.user).exists())
+
+    def test_debounce(self):
+        response = self.client.post(self.url, {"webtoon": self.webtoon.id})
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(self.url, {"webtoon": self.webtoon.id})
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(Bookmark.objects.count(), 1)
+
+    def test_missing_webtoon_keeps_debounce(self):
+        response = self.client.post(self.url, {"webtoon": self.webtoon.id + 1})
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(
+            cache.get(
+                DEBOUNCE_KEY.format(
+                    user_id=self.user.pk, webtoon_id=self.webtoon.id + 1
+                )
+            )
+        )
+
+    def test_give_up_after_attempts(self):
+        # 추가는 계속 중복, 삭제할 행은 없는 상태가 이어지면 무한히 돌지 않고 포기
+        with mock.patch.object(
+            Bookmark.objects, "create", side_effect=IntegrityError
+        ) as create:
+            with self.assertRaises(IntegrityError):
+                toggle_bookmark(self.user, self.webtoon.id)
+        self.assertEqual(create.call_count, TOGGLE_ATTEMPTS)
+
+    def test_missing_webtoon_id(self):
+        response = self.client.post(self.url, {})
+        self.assertEqual(response.status_code, 400)
+
+    def test_remove_without_lock(self):
+        Bookmark.objects.create(user=self.user, webtoon=self.webtoon)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertIsNone(toggle_bookmark(self.user, self.webtoon.id))
+        # 잠금 없이 INSERT(중복) → DELETE 두 문장
+        statements = [
+            query["sql"].split()[0]
+            for query in queries.captured_queries
+            if "SAVEPOINT" not in query["sql"]
+        ]
+        self.assertEqual(statements, ["INSERT", "DELETE"])
+        self.assertNotIn(
+            "FOR UPDATE", " ".join(q["sql"] for q in queries.captured_queries)
+        )
+
+
+class BookmarkListTestCase(TestCase):
+    url = "/api/bookmark/"
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            "test@example.com", nick_name="TestNick"
+        )
+        tag = Tag.objects.create(tag_name="판타지", category="genre")
+        cls.bookmarks = []
+        for i in range(25):
+            webtoon = create_webtoon(title=f"웹툰 {i}")
+            WebtoonTag.objects.create(webtoon=webtoon, tag=tag)
+            cls.bookmarks.append(
+                Bookmark.objects.create(user=cls.user, webtoon=webtoon)
+            )
+        # 다른 사용자의 북마크는 보이지 않는다
+        other = CustomUser.objects.create_user("other@example.com", nick_name="다른")
+        Bookmark.objects.create(user=other, webtoon=webtoon)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def fetch_all(self, params, page_queries):
+        ids = []
+        url = self.url
+        while url:
+            with self.assertNumQueries(page_queries):
+                response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 200)
+            ids += [bookmark["id"] for bookmark in response.data["results"]]
+            url = response.data["next"]
+            params = None
+        return ids
+
+    def test_cursor_pages(self):
+        ids = self.fetch_all({"page_size": 10}, page_queries=1)
+        expected = [bookmark.id for bookmark in reversed(self.bookmarks)]
+        self.assertEqual(ids, expected)
+
+    def test_expand_webtoon(self):
+        # 페이지 크기와 관계없이 북마크+웹툰 1번, 태그 1번
+        for page_size in [5, 25]:
+            ids = self.fetch_all({"expand": "webtoon", "page_size": page_size}, 2)
+            self.assertEqual(len(ids), 25)
+
+        response = self.client.get(self.url, {"expand": "webtoon", "page_size": 1})
+        webtoon = response.data["results"][0]["webtoon"]
+        self.assertEqual(webtoon["id"], self.bookmarks[-1].webtoon_id)
+        self.assertEqual(webtoon["title"], "웹툰 24")
+        self.assertEqual(webtoon["tags"][0]["tag_name"], "판타지")
+
+
+@override_settings(BOOKMARK_TOGGLE_DEBOUNCE_SECONDS=0)
+class BookmarkFlagTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(
+            "test@example.com", nick_name="TestNick"
+        )
+        self.webtoons = [create_webtoon(title=f"웹툰 {i}") for i in range(3)]
+        Bookmark.objects.create(user=self.user, webtoon=self.webtoons[0])
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+
+    def flags(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        items = data["results"] if isinstance(data, dict) else data
+        return {item["id"]: item.get("is_bookmarked") for item in items}
+
+    def test_list_flags(self):
+        first, second, third = (webtoon.id for webtoon in self.webtoons)
+        self.assertEqual(
+            self.flags("/api/webtoons/list"),
+            {first: True, second: False, third: False},
+        )
+
+        # 토글은 캐시된 집합만 고치므로 다음 응답은 캐시 읽기만으로 만든다
+        with self.captureOnCommitCallbacks(execute=True):
+            toggle_bookmark(self.user, second)
+            toggle_bookmark(self.user, first)
+        with self.assertNumQueries(0):
+            flags = self.flags("/api/webtoons/list")
+        self.assertEqual(flags, {first: False, second: True, third: False})
+
+        flags = self.flags("/api/webtoons/search", {"term": "웹툰"})
+        self.assertEqual(flags, {first: False, second: True, third: False})
+
+    def test_anonymous_without_flags(self):
+        self.client.force_authenticate(None)
+        flags = self.flags("/api/webtoons/list")
+        self.assertEqual(set(flags.values()), {None})
+
+    def test_toggle_during_load(self):
+        """집합을 DB 에서 읽은 뒤 저장하기 전에 커밋된 토글은 다음 조회에 보인다"""
+        filter_bookmarks = Bookmark.objects.filter
+
+        def read_then_toggle(*args, **kwargs):
+            webtoon_ids = list(
+                filter_bookmarks(*args, **kwargs).values_list("webtoon_id", flat=True)
+            )
+            with self.captureOnCommitCallbacks(execute=True):
+                toggle_bookmark(self.user, self.webtoons[1].id)
+            return mock.Mock(values_list=mock.Mock(return_value=webtoon_ids))
+
+        with mock.patch.object(Bookmark.objects, "filter", read_then_toggle):
+            self.assertEqual(get_bookmarked_ids(self.user), {self.webtoons[0].id})
+        self.assertEqual(
+            get_bookmarked_ids(self.user), {self.webtoons[0].id, self.webtoons[1].id}
+        )
+
+    def test_load_once(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(get_bookmarked_ids(self.user), {self.webtoons[0].id})
+        with self.assertNumQueries(0):
+            get_bookmarked_ids(self.user)
+
+
+@override_settings(BOOKMARK_TOGGLE_DEBOUNCE_SECONDS=0)
+class BookmarkToggleTransactionTestCase(TransactionTestCase):
+    def test_missing_webtoon(self):
+        # sqlite 는 외래 키를 커밋할 때 확인하므로 TestCase 트랜잭션 밖에서 확인
+        user = CustomUser.objects.create_user("test@example.com", nick_name="유저")
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.post("/api/bookmark/", {"webtoon": 1})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Bookmark.objects.count(), 0)
+
+    @skipUnlessDBFeature("test_db_allows_multiple_connections")
+    def test_parallel_toggles(self):
+        """같은 (사용자, 웹툰) 을 여러 스레드에서 동시에 토글해도 결과와 최종 상태가 맞는지 확인"""
+        user = CustomUser.objects.create_user("test@example.com", nick_name="유저")
+        webtoon = create_webtoon()
+        results = []
+        errors = []
+        barrier = threading.Barrier(8)
+
+        def toggle():
+            try:
+                barrier.wait()
+                for _ in range(5):
+                    results.append(toggle_bookmark(user, webtoon.id) is not None)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=toggle) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        added = results.count(True)
+        removed = results.count(False)
+        # 토글마다 실제로 상태가 바뀌었으므로 추가 - 삭제 = 남은 북마크 수
+        self.assertEqual(added - removed, Bookmark.objects.count())
+        self.assertLessEqual(Bookmark.objects.count(), 1)
@@ -0,0 +1,57 @@
+"""
+북마크 토글.
+
+(user, webtoon) unique 제약에 기대어 행 잠금 없이 INSERT 를 먼저 시도하고, 이미 있으면
+DELETE 한다. 같은 웹툰 연속 클릭은 DB 잠금 대신 캐시 키(cache.add)로 막는다.
+커밋되면 사용자별 북마크 id 집합 캐시(bookmark.bookmarked)도 고친다.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+
+from webtoons.models import Webtoon
+
+from .bookmarked import update_bookmarked_ids
+from .models import Bookmark
+
+DEBOUNCE_KEY = "bookmark_toggle:{user_id}:{webtoon_id}"
+# 추가/삭제가 다른 요청과 계속 엇갈릴 때 다시 시도하는 횟수
+TOGGLE_ATTEMPTS = 3
+
+
+def acquire_toggle(user, webtoon_id):
+    """BOOKMARK_TOGGLE_DEBOUNCE_SECONDS 안에 같은 웹툰을 다시 토글하면 False"""
+    timeout = settings.BOOKMARK_TOGGLE_DEBOUNCE_SECONDS
+    if not timeout:
+        return True
+    key = DEBOUNCE_KEY.format(user_id=user.pk, webtoon_id=webtoon_id)
+    return cache.add(key, True, timeout=timeout)
+
+
+def toggle_bookmark(user, webtoon_id):
+    """
+    북마크가 없으면 추가해 Bookmark 를, 있으면 삭제해 None 을 반환.
+    없는 웹툰이면 Webtoon.DoesNotExist, TOGGLE_ATTEMPTS 번 모두 엇갈리면 IntegrityError
+    """
+    for _ in range(TOGGLE_ATTEMPTS):
+        try:
+            with transaction.atomic():
+                bookmark = Bookmark.objects.create(user=user, webtoon_id=webtoon_id)
+                transaction.on_commit(
+                    lambda: update_bookmarked_ids(user.pk, webtoon_id, True)
+                )
+            return bookmark
+        except IntegrityError as e:
+            conflict = e
+
+        deleted, _ = Bookmark.objects.filter(user=user, webtoon_id=webtoon_id).delete()
+        if deleted:
+            transaction.on_commit(
+                lambda: update_bookmarked_ids(user.pk, webtoon_id, False)
+            )
+            return None
+        # 그사이 다른 요청이 지웠으면 다시 추가, 웹툰이 없어 실패했으면 중단
+        if not Webtoon.objects.filter(pk=webtoon_id).exists():
+            raise Webtoon.DoesNotExist
+    raise conflict
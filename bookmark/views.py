@@ -1,61 +1,104 @@
-from django.db import transaction
-from django.utils import timezone
+from django.db.models import Prefetch
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics, status
 from rest_framework.response import Response
 
 from bookmark.models import Bookmark
-from bookmark.serializers import BookmarkSerializer
+from bookmark.serializers import BookmarkExpandedSerializer, BookmarkSerializer
+from bookmark.toggle import acquire_toggle, toggle_bookmark
+from common.pagination import KeysetPagination
+from common.routers import ReplicaReadMixin
+from webtoons.models import Webtoon, WebtoonTag
 
 
-class BookmarkListCreateView(generics.ListCreateAPIView):
+class BookmarkListCreateView(ReplicaReadMixin, generics.ListCreateAPIView):
     serializer_class = BookmarkSerializer
 
+    def expand_webtoon(self):
+        return self.request.query_params.get("expand") == "webtoon"
+
     def get_queryset(self):
-        return Bookmark.objects.filter(user=self.request.user)
+        queryset = Bookmark.objects.filter(user=self.request.user)
+        if self.expand_webtoon():
+            # 북마크+웹툰 조인 1번, 태그 prefetch 1번으로 페이지 크기와 관계없이 일정
+            queryset = queryset.select_related("webtoon").prefetch_related(
+                Prefetch(
+                    "webtoon__webtoon_tags",
+                    queryset=WebtoonTag.objects.select_related("tag"),
+                )
+            )
+        return queryset
+
+    def get_serializer_class(self):
+        if self.request.method == "GET" and self.expand_webtoon():
+            return BookmarkExpandedSerializer
+        return BookmarkSerializer
+
+    @extend_schema(
+        summary="북마크 목록",
+        description="최근 북마크 순 키셋 페이지네이션, expand=webtoon 이면 웹툰 요약을 포함합니다.",
+        tags=["Bookmark"],
+        parameters=[
+            OpenApiParameter(
+                name="expand",
+                description="webtoon 이면 웹툰 id 대신 웹툰 요약",
+                type=str,
+                enum=["webtoon"],
+            ),
+            OpenApiParameter(
+                name="cursor",
+                description="다음 페이지 커서 (응답의 next 링크에 포함)",
+                type=str,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description="페이지 크기 (기본 20, 최대 100)",
+                type=int,
+            ),
+        ],
+    )
+    def list(self, request, *args, **kwargs):
+        # (created, id) 키셋 페이지네이션
+        paginator = KeysetPagination("-created")
+        page = paginator.paginate_queryset(self.get_queryset(), request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
-    @transaction.atomic
     def create(self, request, *args, **kwargs):
-        webtoon_id = request.data.get("webtoon")
-        if not webtoon_id:
+        try:
+            webtoon_id = int(request.data.get("webtoon"))
+        except (TypeError, ValueError):
             return Response(
                 {"error": "Webtoon ID is required."}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        try:
-            with transaction.atomic():
-                existing_bookmark = (
-                    Bookmark.objects.select_for_update()
-                    .filter(user=request.user, webtoon_id=webtoon_id)
-                    .first()
-                )
+        # 없는 웹툰이 연속 클릭 방지 시간을 차지하지 않도록 먼저 확인
+        if not Webtoon.objects.filter(pk=webtoon_id).exists():
+            return Response(
+                {"error": "Webtoon not found."}, status=status.HTTP_404_NOT_FOUND
+            )
 
-                if existing_bookmark:
-                    # 시간 기반 제어: 마지막 수정으로부터 5초 이내 요청은 무시(연속클릭 방지)
-                    if (
-                        timezone.now() - existing_bookmark.last_modified
-                    ).total_seconds() < 5:
-                        return Response(
-                            {"error": "Action too frequent. Please try again later."},
-                            status=status.HTTP_429_TOO_MANY_REQUESTS,
-                        )
-                    existing_bookmark.delete()
-                    return Response(
-                        {"message": "Bookmark removed successfully."},
-                        status=status.HTTP_200_OK,
-                    )
-
-                serializer = self.get_serializer(data=request.data)
-                serializer.is_valid(raise_exception=True)
-                self.perform_create(serializer)
-                headers = self.get_success_headers(serializer.data)
-                return Response(
-                    serializer.data, status=status.HTTP_201_CREATED, headers=headers
-                )
+        # 연속 클릭 방지: 같은 웹툰은 일정 시간 안에 한 번만 토글
+        if not acquire_toggle(request.user, webtoon_id):
+            return Response(
+                {"error": "Action too frequent. Please try again later."},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
 
-        except Exception as e:
+        try:
+            bookmark = toggle_bookmark(request.user, webtoon_id)
+        except Webtoon.DoesNotExist:
             return Response(
-                {"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {"error": "Webtoon not found."}, status=status.HTTP_404_NOT_FOUND
             )
 
-    def perform_create(self, serializer):
-        serializer.save(user=self.request.user, last_modified=timezone.now())
+        if bookmark is None:
+            return Response(
+                {"message": "Bookmark removed successfully."},
+                status=status.HTTP_200_OK,
+            )
+        serializer = self.get_serializer(bookmark)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
@@ -0,0 +1,19 @@
+"""
+연결 풀을 쓰는 MySQL 백엔드 (ASGI 배포용).
+
+    DB_ENGINE=common.backends.mysql_pool
+    DB_CONN_MAX_AGE=0
+"""
+
+from django.db.backends.mysql import base
+
+from common.backends.pool import PooledDatabaseWrapperMixin
+
+
+class DatabaseWrapper(PooledDatabaseWrapperMixin, base.DatabaseWrapper):
+    def _is_usable_connection(self, connection):
+        try:
+            connection.ping()
+        except base.Database.Error:
+            return False
+        return True
@@ -0,0 +1,112 @@
+"""
+DB 연결 풀.
+
+ASGI 에서는 요청마다 다른 스레드에서 DB 를 쓸 수 있어 CONN_MAX_AGE 로 스레드별 연결을
+유지하면 연결이 쌓이기만 한다. ASGI 배포는 CONN_MAX_AGE=0 으로 요청이 끝날 때 연결을
+닫되, PooledDatabaseWrapperMixin 이 실제로 닫지 않고 프로세스 공용 풀에 돌려 놓았다가
+다음 연결에 다시 준다. POOL_CHECK_AFTER 초 넘게 쉬던 연결은 꺼낼 때 살아 있는지 확인한다.
+"""
+
+import collections
+import os
+import threading
+import time
+from contextlib import closing
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _close_quietly(connection):
+    try:
+        connection.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    def __init__(self, size, check_after):
+        self.size = size
+        self.check_after = check_after
+        self.pid = os.getpid()
+        self.lock = threading.Lock()
+        self.idle = collections.deque()  # (연결, 반납 시각)
+
+    def acquire(self, is_usable):
+        """쉬고 있는 연결, 없으면 None"""
+        while True:
+            with self.lock:
+                if self.pid != os.getpid():
+                    # fork 전에 만든 연결은 부모와 소켓을 공유하므로 버린다 (닫지 않음)
+                    self.idle.clear()
+                    self.pid = os.getpid()
+                if not self.idle:
+                    return None
+                # 가장 최근에 쓴 연결부터 (오래 쉰 연결은 서버가 끊었을 수 있음)
+                connection, released_at = self.idle.pop()
+            if time.monotonic() - released_at < self.check_after or is_usable(
+                connection
+            ):
+                return connection
+            _close_quietly(connection)
+
+    def release(self, connection):
+        """풀에 돌려 놓으면 True, 풀이 가득 찼으면 False"""
+        with self.lock:
+            if self.pid == os.getpid() and len(self.idle) < self.size:
+                self.idle.append((connection, time.monotonic()))
+                return True
+        return False
+
+    def close_all(self):
+        with self.lock:
+            idle, self.idle = self.idle, collections.deque()
+        for connection, _ in idle:
+            _close_quietly(connection)
+
+
+def get_pool(alias, settings_dict):
+    pool = _pools.get(alias)
+    if pool is None:
+        with _pools_lock:
+            pool = _pools.get(alias)
+            if pool is None:
+                pool = _pools[alias] = ConnectionPool(
+                    settings_dict.get("POOL_SIZE", 10),
+                    settings_dict.get("POOL_CHECK_AFTER", 30),
+                )
+    return pool
+
+
+class PooledDatabaseWrapperMixin:
+    """DatabaseWrapper 에 섞어 쓰는 연결 풀 (get_new_connection/_close 만 바꾼다)"""
+
+    @property
+    def pool(self):
+        return get_pool(self.alias, self.settings_dict)
+
+    def _is_usable_connection(self, connection):
+        try:
+            with closing(connection.cursor()) as cursor:
+                cursor.execute("SELECT 1")
+        except Exception:
+            return False
+        return True
+
+    def get_new_connection(self, conn_params):
+        connection = self.pool.acquire(self._is_usable_connection)
+        if connection is None:
+            connection = super().get_new_connection(conn_params)
+        return connection
+
+    def _close(self):
+        # 트랜잭션 중이거나 오류가 났던 연결은 상태를 알 수 없으므로 실제로 닫는다
+        reusable = (
+            self.connection is not None
+            and self.autocommit
+            and not self.in_atomic_block
+            and not self.errors_occurred
+        )
+        if reusable and self.pool.release(self.connection):
+            return
+        super()._close()
@@ -0,0 +1,115 @@
+"""
+응답 캐시.
+
+같은 쿼리스트링이면 같은 JSON 을 돌려주는 조회 API 의 응답 데이터를 Django 캐시에 저장한다.
+캐시 키에는 네임스페이스 버전이 들어가므로, 데이터가 바뀌면 버전만 올려서 해당
+네임스페이스에 의존하는 응답을 한 번에 무효화한다.
+"""
+
+import functools
+import hashlib
+import time
+from contextlib import nullcontext
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from .routers import primary_reads
+
+VERSION_KEY = "cache_version:{namespace}"
+# 버전을 올린 뒤 REPLICA_PIN_SECONDS 동안 남는 표시 (fill_reads)
+BUMPED_KEY = "cache_version:{namespace}:bumped"
+RESPONSE_KEY = "response:{view}:{scheme}:{host}:{versions}:{query}"
+
+
+def _new_version():
+    # 버전 키가 캐시에서 밀려나도 예전 값으로 돌아가지 않도록 시간 기반 값으로 시작
+    return time.time_ns()
+
+
+def get_versions(namespaces):
+    keys = [VERSION_KEY.format(namespace=namespace) for namespace in namespaces]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, _new_version(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_versions(*namespaces):
+    for namespace in namespaces:
+        key = VERSION_KEY.format(namespace=namespace)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, _new_version(), timeout=None)
+    cache.set_many(
+        {BUMPED_KEY.format(namespace=namespace): True for namespace in namespaces},
+        timeout=settings.REPLICA_PIN_SECONDS,
+    )
+
+
+def fill_reads(namespaces):
+    """
+    namespaces 에 의존하는 캐시를 채우는 조회용 context manager.
+    최근 REPLICA_PIN_SECONDS 안에 버전이 오른 namespace 가 있으면 replica 가 아직 그 쓰기를
+    반영하지 못했을 수 있으므로 primary 에서 읽고, 그 밖에는 replica 에서 읽는다.
+    """
+    keys = [BUMPED_KEY.format(namespace=namespace) for namespace in namespaces]
+    if cache.get_many(keys):
+        return primary_reads()
+    return nullcontext()
+
+
+def normalize_query(query_params):
+    """반복 파라미터(tag, id 등)의 순서와 관계없이 같은 문자열이 되도록 정렬 후 해시"""
+    # 값은 이어 붙이지 않고 urlencode 로 escape 해야 ?tag=a,b 와 ?tag=a&tag=b 가 구분된다
+    raw = urlencode(
+        sorted(
+            (key, value) for key in query_params for value in query_params.getlist(key)
+        )
+    )
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def cache_response(*namespaces, timeout=None):
+    """
+    APIView 의 get 메서드용 데코레이터.
+    namespaces 중 하나라도 버전이 오르면 캐시된 응답은 더 이상 사용되지 않는다.
+    캐시를 채우는 조회는 버전이 막 오른 namespace 가 있을 때만 primary 에서 읽는다 (fill_reads).
+    """
+
+    def decorator(method):
+        view_name = f"{method.__module__}.{method.__qualname__}"
+
+        @functools.wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = RESPONSE_KEY.format(
+                view=view_name,
+                # next 링크 등 절대 URL 이 응답에 들어가므로 scheme, 호스트별로 구분
+                scheme=request.scheme,
+                host=request.get_host(),
+                versions=".".join(str(version) for version in get_versions(namespaces)),
+                query=normalize_query(request.query_params),
+            )
+            data = cache.get(key)
+            if data is not None:
+                return Response(data)
+
+            with fill_reads(namespaces):
+                response = method(self, request, *args, **kwargs)
+            if response.status_code == status.HTTP_200_OK:
+                cache.set(
+                    key,
+                    response.data,
+                    timeout=timeout or settings.RESPONSE_CACHE_TIMEOUT,
+                )
+            return response
+
+        return wrapper
+
+    return decorator
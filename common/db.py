@@ -0,0 +1,20 @@
+from django.db import connections, router
+
+
+def delete_ids(model, ids):
+    """
+    pk 가 ids 인 model 행을 DELETE 한 번으로 지우고 지운 행 수를 반환.
+
+    QuerySet.delete() 는 model 을 참조하는 관계가 있으면 Collector 가 행을 모두 읽으므로,
+    참조하는 행을 먼저 지운 대량 삭제에서만 쓴다. 행을 읽지 않고 시그널도 보내지 않는다.
+    """
+    ids = list(ids)
+    if not ids:
+        return 0
+    connection = connections[router.db_for_write(model)]
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(model._meta.pk.column)
+    placeholders = ", ".join(["%s"] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", ids)
+        return cursor.rowcount
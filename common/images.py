@@ -0,0 +1,122 @@
+"""
+업로드 이미지 처리.
+
+업로드된 이미지를 디코딩해 메타데이터(EXIF 등)를 버리고, 고정 너비 변형본을
+WebP(미지원 시 JPEG)로 다시 인코딩해 common.storage 로 업로드한다.
+디코딩/인코딩은 CPU 작업이므로 프로세스 풀에서 실행하고, 요청 스레드는 형식만
+확인한 뒤 변형본 URL 을 바로 반환한다.
+"""
+
+import io
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+logger = logging.getLogger(__name__)
+
+# 형식별 (확장자, Content-Type)
+OUTPUT_FORMATS = {
+    "AVIF": ("avif", "image/avif"),
+    "WEBP": ("webp", "image/webp"),
+    "JPEG": ("jpg", "image/jpeg"),
+}
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_output_format():
+    """IMAGE_VARIANT_FORMATS 중 현재 Pillow 가 인코딩할 수 있는 첫 형식"""
+    for image_format in settings.IMAGE_VARIANT_FORMATS:
+        if image_format == "JPEG" or features.check(image_format.lower()):
+            return image_format
+    return "JPEG"
+
+
+def read_image(file):
+    """업로드 파일 내용을 읽고 이미지인지 확인 (디코딩은 하지 않는다)"""
+    if hasattr(file, "chunks"):
+        data = b"".join(file.chunks())
+    else:
+        data = file.read()
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            image.verify()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError):
+        raise ValueError("이미지 파일이 아닙니다")
+    return data
+
+
+def render_variants(data, widths, image_format, quality):
+    """
+    너비별 인코딩 결과(bytes)를 반환, 프로세스 풀에서 실행된다.
+    원본보다 큰 너비는 확대하지 않고 원본 크기로 인코딩한다.
+    """
+    with Image.open(io.BytesIO(data)) as image:
+        # 회전 정보를 반영한 뒤에는 메타데이터 없이 저장한다
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ("RGBA", "LA", "PA") or (
+            image.mode == "P" and "transparency" in image.info
+        )
+        image = image.convert("RGBA" if has_alpha and image_format != "JPEG" else "RGB")
+
+        variants = {}
+        for width in widths:
+            resized = image
+            if image.width > width:
+                height = max(round(image.height * width / image.width), 1)
+                resized = image.resize((width, height), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, image_format, quality=quality)
+            variants[width] = buffer.getvalue()
+    return variants
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # 요청 처리 스레드가 있는 프로세스를 fork 하지 않도록 spawn 사용
+                _executor = ProcessPoolExecutor(
+                    max_workers=settings.IMAGE_PROCESS_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+    return _executor
+
+
+def upload_image_variants(storage, file, key_prefix, widths):
+    """
+    너비별 변형본 URL({"320": url, ...})을 바로 반환.
+    변형본 생성은 프로세스 풀에서, 업로드는 storage 의 업로드 스레드 풀에서 진행된다.
+    """
+    data = read_image(file)
+    image_format = get_output_format()
+    extension, content_type = OUTPUT_FORMATS[image_format]
+    keys = {width: f"{key_prefix}/{width}.{extension}" for width in widths}
+
+    def upload(variants):
+        for width, content in variants.items():
+            storage.upload_async(
+                io.BytesIO(content), keys[width], content_type=content_type
+            )
+
+    def on_rendered(future):
+        if future.exception() is not None:
+            logger.error(
+                "이미지 변형본 생성 실패: %s", key_prefix, exc_info=future.exception()
+            )
+            return
+        upload(future.result())
+
+    args = (data, widths, image_format, settings.IMAGE_VARIANT_QUALITY)
+    if not settings.IMAGE_PROCESS_WORKERS:
+        # 프로세스 풀 없이 바로 처리 (테스트, 관리 명령 등)
+        upload(render_variants(*args))
+    else:
+        _get_executor().submit(render_variants, *args).add_done_callback(on_rendered)
+    return {str(width): storage.url(key) for width, key in keys.items()}
@@ -0,0 +1,135 @@
+"""
+요청 단위 DB 미들웨어.
+
+QueryBudgetMiddleware: DEBUG 와 관계없이 execute_wrapper 로 요청 동안 실행된 쿼리 수와
+시간을 요청별 contextvar 에 모으고, QUERY_BUDGET_MAX_QUERIES / QUERY_BUDGET_MAX_DB_TIME_MS 를 넘으면 경고 로그를
+남긴다 (0 이면 확인하지 않음). DEBUG 이거나 QUERY_BUDGET_SERVER_TIMING 이면 Server-Timing
+헤더로도 알려 준다.
+
+ReplicaRoutingMiddleware: replica 라우팅(common.routers) 상태를 요청마다 만들고, 쓰기가
+있었던 요청의 사용자는 잠시 primary 에서 읽도록 고정한다.
+
+둘 다 sync/async 를 모두 지원해 ASGI 에서 요청마다 스레드로 옮겨 실행되지 않는다.
+"""
+
+import logging
+import time
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import connections
+
+from .routers import pin_to_primary, routing_scope
+
+logger = logging.getLogger(__name__)
+
+
+class QueryStats:
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+
+_stats = ContextVar("query_stats", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    # 연결을 여러 요청이 번갈아 쓸 수 있으므로(ASGI) 실행 중인 요청의 QueryStats 에 센다
+    stats = _stats.get()
+    if stats is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        stats.count += 1
+        stats.duration += time.perf_counter() - started
+
+
+def track_queries():
+    """현재 스레드의 연결에 record_query 를 한 번만 건다"""
+    for connection in connections.all():
+        if record_query not in connection.execute_wrappers:
+            connection.execute_wrappers.append(record_query)
+
+
+class AsyncCapableMiddleware:
+    async_capable = True
+    sync_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        return self.handle(request)
+
+
+class QueryBudgetMiddleware(AsyncCapableMiddleware):
+    def handle(self, request):
+        track_queries()
+        stats = QueryStats()
+        token = _stats.set(stats)
+        try:
+            response = self.get_response(request)
+        finally:
+            _stats.reset(token)
+        return self.report(request, response, stats)
+
+    async def __acall__(self, request):
+        # 연결은 스레드별이므로 sync 뷰와 ORM 이 실행되는 (thread_sensitive) 스레드에서 건다
+        await sync_to_async(track_queries)()
+        stats = QueryStats()
+        token = _stats.set(stats)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _stats.reset(token)
+        return self.report(request, response, stats)
+
+    def report(self, request, response, stats):
+        duration_ms = stats.duration * 1000
+        if settings.DEBUG or settings.QUERY_BUDGET_SERVER_TIMING:
+            response.headers["Server-Timing"] = (
+                f'db;dur={duration_ms:.1f};desc="{stats.count} queries"'
+            )
+        max_queries = settings.QUERY_BUDGET_MAX_QUERIES
+        max_duration_ms = settings.QUERY_BUDGET_MAX_DB_TIME_MS
+        if (max_queries and stats.count > max_queries) or (
+            max_duration_ms and duration_ms > max_duration_ms
+        ):
+            logger.warning(
+                "쿼리 예산 초과: %s %s 쿼리 %d개, DB %.1fms",
+                request.method,
+                request.path,
+                stats.count,
+                duration_ms,
+            )
+        return response
+
+
+class ReplicaRoutingMiddleware(AsyncCapableMiddleware):
+    @staticmethod
+    def pin_writer(request, state):
+        # DRF 가 인증한 사용자도 request.user 로 남는다
+        user = getattr(request, "user", None)
+        if state.wrote and user is not None and user.is_authenticated:
+            pin_to_primary(user)
+
+    def handle(self, request):
+        with routing_scope() as state:
+            response = self.get_response(request)
+        self.pin_writer(request, state)
+        return response
+
+    async def __acall__(self, request):
+        # contextvar 는 sync_to_async 로 옮겨 실행되는 뷰에도 전달된다
+        with routing_scope() as state:
+            response = await self.get_response(request)
+        if state.wrote:
+            await sync_to_async(self.pin_writer)(request, state)
+        return response
@@ -0,0 +1,191 @@
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+# BigAutoField 최댓값
+MAX_ID = 2**63 - 1
+
+
+class KeysetPagination(BasePagination):
+    """
+    (정렬 컬럼, id) 기준 키셋(커서) 페이지네이션.
+
+    OFFSET 없이 마지막 행의 (정렬값, id) 다음부터 조회하므로 깊은 페이지도
+    첫 페이지와 같은 비용으로 조회된다. 커서는 base64 로 인코딩된 불투명 문자열이다.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "유효하지 않은 커서입니다."
+
+    def __init__(self, ordering, page_size=None, max_page_size=None):
+        # ordering: "-like_count" 처럼 정렬 컬럼 하나, id 가 같은 방향으로 tie-breaker 가 된다
+        self.descending = ordering.startswith("-")
+        self.field_name = ordering.lstrip("-")
+        self.page_size = page_size or settings.KEYSET_PAGE_SIZE
+        self.max_page_size = max_page_size or settings.KEYSET_MAX_PAGE_SIZE
+        self.next_cursor = None
+
+    def get_ordering(self):
+        prefix = "-" if self.descending else ""
+        return (f"{prefix}{self.field_name}", f"{prefix}id")
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        page_size = self.get_page_size(request)
+        field = queryset.model._meta.get_field(self.field_name)
+
+        queryset = queryset.order_by(*self.get_ordering())
+        cursor = self.decode_cursor(request, field)
+        if cursor is not None:
+            value, pk, _ = cursor
+            queryset = queryset.filter(self.get_cursor_filter(value, pk))
+
+        # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+        page = list(queryset[: page_size + 1])
+        if len(page) > page_size:
+            page = page[:page_size]
+            last = page[-1]
+            self.next_cursor = self.encode_cursor(field.value_to_string(last), last.pk)
+        else:
+            self.next_cursor = None
+        return page
+
+    def paginate_ids(self, ids, queryset, request, view=None, include=None):
+        """
+        이미 정렬된 id 목록(랭킹 스냅샷)에서 페이지를 잘라 해당 행만 조회한다.
+        include 를 주면 그 안의 id 만 남긴다. 커서에는 스냅샷 위치가 들어가고, 그 위치의 id 나
+        커서 행의 정렬값이 지금과 다르면 None 을 반환하므로 paginate_queryset 으로 처리한다.
+        include 가 ids 에 비해 너무 적어 페이지를 채우려면 길게 훑어야 할 때도 None 을 반환한다.
+        """
+        if include is not None and len(
+            include
+        ) * settings.KEYSET_SNAPSHOT_SCAN_RATIO < len(ids):
+            return None
+        self.request = request
+        page_size = self.get_page_size(request)
+        field = queryset.model._meta.get_field(self.field_name)
+
+        start = 0
+        cursor = self.decode_cursor(request, field)
+        if cursor is not None:
+            _, pk, position = cursor
+            # 스냅샷이 다시 만들어져 순서가 바뀌었으면 DB 에서
+            if position is None or position >= len(ids) or ids[position] != pk:
+                return None
+            start = position + 1
+
+        while True:
+            positions = self.scan_positions(ids, start, page_size + 1, include)
+            has_next = len(positions) > page_size
+            positions = positions[:page_size]
+            page_ids = [ids[position] for position in positions]
+            # 커서 행도 같은 쿼리로 읽어 정렬값이 그대로인지 확인
+            fetch_ids = page_ids + [cursor[1]] if cursor is not None else page_ids
+            rows = queryset.in_bulk(fetch_ids) if fetch_ids else {}
+            if cursor is not None:
+                value, pk, _ = cursor
+                if pk not in rows or getattr(rows[pk], field.attname) != value:
+                    return None
+                cursor = None
+
+            # 스냅샷 이후 삭제된 행은 건너뛰고, 페이지 전체가 삭제됐으면 다음 구간을 읽는다
+            page = [
+                (position, rows[pk])
+                for position, pk in zip(positions, page_ids)
+                if pk in rows
+            ]
+            if page or not has_next:
+                break
+            start = positions[-1] + 1
+
+        if has_next:
+            position, last = page[-1]
+            self.next_cursor = self.encode_cursor(
+                field.value_to_string(last), last.pk, position
+            )
+        else:
+            self.next_cursor = None
+        return [row for _, row in page]
+
+    @staticmethod
+    def scan_positions(ids, start, count, include=None):
+        """ids[start:] 에서 include 에 있는 id 의 위치를 앞에서부터 count 개까지"""
+        if include is None:
+            return list(range(start, min(start + count, len(ids))))
+        positions = []
+        for position in range(start, len(ids)):
+            if ids[position] in include:
+                positions.append(position)
+                if len(positions) == count:
+                    break
+        return positions
+
+    def get_cursor_filter(self, value, pk):
+        lookup = "lt" if self.descending else "gt"
+        return Q(**{f"{self.field_name}__{lookup}": value}) | Q(
+            **{self.field_name: value, f"id__{lookup}": pk}
+        )
+
+    def encode_cursor(self, value, pk, position=None):
+        # position: 랭킹 스냅샷에서의 위치 (paginate_ids)
+        cursor = [value, pk] if position is None else [value, pk, position]
+        raw = json.dumps(cursor, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode()
+
+    def decode_cursor(self, request, field):
+        """(정렬값, id, 스냅샷 위치 또는 None), 잘못된 커서면 400"""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if not isinstance(cursor, list) or len(cursor) not in (2, 3):
+                raise ValueError
+            value, pk, position = (cursor + [None])[:3]
+            value, pk = field.to_python(value), int(pk)
+            position = None if position is None else int(position)
+            # 정렬값 null, DB 정수 범위를 넘는 id 는 쿼리에서 오류가 난다
+            if value is None or not 0 < pk <= MAX_ID:
+                raise ValueError
+            if position is not None and position < 0:
+                raise ValueError
+            return value, pk, position
+        except (binascii.Error, TypeError, ValueError, ValidationError):
+            raise ParseError(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.next_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
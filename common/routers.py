@@ -0,0 +1,121 @@
+"""
+읽기 전용 replica 라우팅.
+
+ReplicaReadMixin 을 쓰는 조회 뷰(웹툰 목록/검색, 북마크 목록)의 안전한(GET 등) 요청만
+DATABASE_REPLICAS 중 하나에서 읽고, 나머지 쿼리는 모두 primary(default) 로 보낸다.
+replica 는 primary 보다 늦을 수 있으므로 다음 경우에는 primary 에서 읽는다.
+
+- 같은 요청에서 이미 쓰기를 했을 때 (select_for_update 포함)
+- primary 트랜잭션 안일 때
+- 최근 REPLICA_PIN_SECONDS 안에 쓰기 요청을 보낸 사용자일 때 (북마크 토글 후 목록 등)
+- 버전이 REPLICA_PIN_SECONDS 안에 오른 공유 캐시(응답 캐시, 랭킹 스냅샷, 태그 비트맵 등)를
+  채울 때 (common.cache.fill_reads)
+
+캐시 키의 버전은 primary 에 커밋된 뒤 오르므로, 그 직후 지연된 replica 에서 읽은 데이터로
+캐시를 채우면 예전 데이터가 새 버전 키에 TTL 동안 남는다. 그 밖의 캐시 채우기는 replica 에서
+읽는다 (replica 지연은 REPLICA_PIN_SECONDS 보다 짧다고 본다).
+
+요청 단위 상태는 ReplicaRoutingMiddleware 가 contextvar 로 만든다.
+"""
+
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connections
+from rest_framework.permissions import SAFE_METHODS
+
+PIN_KEY = "replica_pin:{user_id}"
+
+
+class RoutingState:
+    def __init__(self):
+        self.use_replica = False
+        self.wrote = False
+        self.replica = None
+
+
+_state = ContextVar("db_routing_state", default=None)
+
+
+@contextmanager
+def routing_scope():
+    state = RoutingState()
+    token = _state.set(state)
+    try:
+        yield state
+    finally:
+        _state.reset(token)
+
+
+@contextmanager
+def primary_reads():
+    """이 블록 안의 조회는 replica 로 보내지 않는다"""
+    state = _state.get()
+    if state is None or not state.use_replica:
+        yield
+        return
+    state.use_replica = False
+    try:
+        yield
+    finally:
+        state.use_replica = True
+
+
+def pin_to_primary(user):
+    cache.set(
+        PIN_KEY.format(user_id=user.pk), True, timeout=settings.REPLICA_PIN_SECONDS
+    )
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and bool(cache.get(PIN_KEY.format(user_id=user.pk)))
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        state = _state.get()
+        if (
+            state is None
+            or not state.use_replica
+            or state.wrote
+            or not settings.DATABASE_REPLICAS
+            or connections[DEFAULT_DB_ALIAS].in_atomic_block
+        ):
+            return DEFAULT_DB_ALIAS
+        # 한 요청 안에서는 같은 replica 에서 읽는다
+        if state.replica is None:
+            state.replica = random.choice(settings.DATABASE_REPLICAS)
+        return state.replica
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            state.wrote = True
+        # replica 에서 읽은 객체도 primary 에 저장한다
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica 는 primary 와 같은 데이터
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
+
+
+class ReplicaReadMixin:
+    """안전한 요청의 조회를 replica 로 보내는 APIView mixin (인증 후 사용자별 고정 확인)"""
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        state = _state.get()
+        if (
+            state is not None
+            and request.method in SAFE_METHODS
+            and not is_pinned_to_primary(request.user)
+        ):
+            state.use_replica = True
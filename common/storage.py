@@ -0,0 +1,291 @@
+"""
+오브젝트 스토리지 업로드.
+
+썸네일/프로필 이미지 업로드가 함께 쓰는 모듈. boto3 클라이언트는 접속 정보별로
+하나만 만들어 커넥션 풀을 공유하고, upload_async 는 업로드할 내용을 임시 파일로
+옮긴 뒤 최종 URL 을 바로 반환한다. 실제 업로드는 작업 스레드 풀에서 재시도/백오프와
+함께 진행된다.
+"""
+
+import functools
+import logging
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import boto3
+from botocore.config import Config
+from django.conf import settings
+from django.core.files import File
+
+logger = logging.getLogger(__name__)
+
+_client_lock = threading.Lock()
+_executor = None
+_executor_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=None)
+def _create_client(endpoint_url, access_key, secret_key, region_name):
+    config = Config(
+        max_pool_connections=settings.OBJECT_STORAGE_MAX_POOL_CONNECTIONS,
+        connect_timeout=settings.OBJECT_STORAGE_CONNECT_TIMEOUT,
+        read_timeout=settings.OBJECT_STORAGE_READ_TIMEOUT,
+        retries={"max_attempts": 0},  # 재시도는 ObjectStorage.upload 에서 처리
+    )
+    return boto3.session.Session().client(
+        "s3",
+        endpoint_url=endpoint_url,
+        aws_access_key_id=access_key,
+        aws_secret_access_key=secret_key,
+        region_name=region_name,
+        config=config,
+    )
+
+
+def get_client(endpoint_url, access_key, secret_key, region_name=None):
+    """접속 정보가 같으면 같은 클라이언트(커넥션 풀)를 반환"""
+    # boto3 클라이언트 생성 자체는 thread-safe 하지 않다
+    with _client_lock:
+        return _create_client(endpoint_url, access_key, secret_key, region_name)
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.OBJECT_STORAGE_UPLOAD_WORKERS,
+                    thread_name_prefix="object-storage-upload",
+                )
+    return _executor
+
+
+def _iter_parts(file, part_size):
+    """
+    file.chunks() 를 part_size 바이트 이상씩 모아 반환 (마지막 part 는 더 작을 수 있다).
+    chunk 경계에서 자르므로 part 는 part_size 보다 chunk 하나만큼 클 수 있다.
+    """
+    pending, pending_size = [], 0
+    for chunk in file.chunks(settings.OBJECT_STORAGE_CHUNK_SIZE):
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= part_size:
+            part = b"".join(pending)
+            pending, pending_size = [], 0
+            yield part
+    if pending:
+        yield b"".join(pending)
+
+
+class PrefixRegistry:
+    """존재를 확인한 (엔드포인트, 버킷, prefix) 를 TTL 동안 기억하는 프로세스 단위 목록"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._expires = {}
+
+    def is_known(self, key):
+        with self._lock:
+            expires = self._expires.get(key)
+        return expires is not None and expires > time.monotonic()
+
+    def add(self, key, ttl):
+        with self._lock:
+            self._expires[key] = time.monotonic() + ttl
+
+    def clear(self):
+        with self._lock:
+            self._expires.clear()
+
+
+prefix_registry = PrefixRegistry()
+
+
+class ObjectStorage:
+    def __init__(
+        self,
+        bucket,
+        endpoint_url,
+        access_key=None,
+        secret_key=None,
+        region_name=None,
+        acl=None,
+    ):
+        self.bucket = bucket
+        self.endpoint_url = endpoint_url.rstrip("/") if endpoint_url else endpoint_url
+        self.access_key = access_key
+        self.secret_key = secret_key
+        self.region_name = region_name
+        self.acl = acl
+
+    @property
+    def client(self):
+        return get_client(
+            self.endpoint_url, self.access_key, self.secret_key, self.region_name
+        )
+
+    def url(self, key):
+        return f"{self.endpoint_url}/{self.bucket}/{key}"
+
+    def prefix_exists(self, prefix):
+        """Object Storage에 prefix가 존재하는지 확인"""
+        try:
+            response = self.client.list_objects_v2(
+                Bucket=self.bucket, Prefix=prefix, MaxKeys=1
+            )
+            return "Contents" in response
+        except Exception:
+            logger.exception("prefix 확인 실패: %s", prefix)
+            return False
+
+    def ensure_prefix(self, prefix):
+        """
+        prefix 가 없으면 빈 marker 객체를 만든다.
+        한 번 확인한 prefix 는 OBJECT_STORAGE_PREFIX_TTL 동안 다시 확인하지 않는다.
+        """
+        registry_key = (self.endpoint_url, self.bucket, prefix)
+        if prefix_registry.is_known(registry_key):
+            return
+        if not self.prefix_exists(prefix):
+            self.client.put_object(Bucket=self.bucket, Key=f"{prefix}/")
+        prefix_registry.add(registry_key, settings.OBJECT_STORAGE_PREFIX_TTL)
+
+    def _extra_args(self, content_type=None):
+        extra = {}
+        if self.acl:
+            extra["ACL"] = self.acl
+        if content_type:
+            extra["ContentType"] = content_type
+        return extra
+
+    def _retry(self, func, key):
+        """func 를 OBJECT_STORAGE_UPLOAD_ATTEMPTS 번까지 지수 백오프로 재시도"""
+        attempts = settings.OBJECT_STORAGE_UPLOAD_ATTEMPTS
+        for attempt in range(1, attempts + 1):
+            try:
+                return func()
+            except Exception:
+                if attempt == attempts:
+                    raise
+                delay = settings.OBJECT_STORAGE_RETRY_BACKOFF * 2 ** (attempt - 1)
+                logger.warning(
+                    "업로드 실패, %s초 후 다시 시도합니다 (%s/%s): %s",
+                    delay,
+                    attempt,
+                    attempts,
+                    key,
+                )
+                time.sleep(delay)
+
+    def upload(self, fileobj, key, content_type=None):
+        """업로드가 끝날 때까지 기다린 뒤 URL 반환, 실패하면 재시도 후 마지막 예외를 던진다"""
+        file = fileobj if isinstance(fileobj, File) else File(fileobj)
+        if file.size > settings.OBJECT_STORAGE_MULTIPART_PART_SIZE:
+            return self.upload_stream(file, key, content_type)
+
+        def put():
+            file.seek(0)
+            self.client.put_object(
+                Bucket=self.bucket,
+                Key=key,
+                # 이름 없는 File 은 bool 값이 False 라 botocore 가 빈 본문으로 보낸다
+                Body=file.file,
+                **self._extra_args(content_type),
+            )
+
+        self._retry(put, key)
+        return self.url(key)
+
+    def upload_stream(self, file, key, content_type=None):
+        """
+        file.chunks() 를 part 크기 단위로 모아 multipart upload 로 보낸다.
+        메모리에는 part 버퍼 하나만 두므로 파일 크기와 관계없이 사용량이 일정하다.
+        """
+        if file.size <= settings.OBJECT_STORAGE_MULTIPART_PART_SIZE:
+            # part 하나 크기 이하면 multipart 없이 한 번에
+            return self.upload(file, key, content_type)
+
+        upload_id = self._retry(
+            lambda: self.client.create_multipart_upload(
+                Bucket=self.bucket, Key=key, **self._extra_args(content_type)
+            )["UploadId"],
+            key,
+        )
+        try:
+            uploaded = []
+            parts = _iter_parts(file, settings.OBJECT_STORAGE_MULTIPART_PART_SIZE)
+            for number, body in enumerate(parts, start=1):
+                response = self._retry(
+                    lambda: self.client.upload_part(
+                        Bucket=self.bucket,
+                        Key=key,
+                        UploadId=upload_id,
+                        PartNumber=number,
+                        Body=body,
+                    ),
+                    key,
+                )
+                uploaded.append({"ETag": response["ETag"], "PartNumber": number})
+            self._retry(
+                lambda: self.client.complete_multipart_upload(
+                    Bucket=self.bucket,
+                    Key=key,
+                    UploadId=upload_id,
+                    MultipartUpload={"Parts": uploaded},
+                ),
+                key,
+            )
+        except Exception:
+            # 올라간 part 가 스토리지 용량을 차지하지 않도록 업로드를 취소
+            try:
+                self.client.abort_multipart_upload(
+                    Bucket=self.bucket, Key=key, UploadId=upload_id
+                )
+            except Exception:
+                logger.exception("multipart 업로드 취소 실패: %s", key)
+            raise
+        return self.url(key)
+
+    def upload_async(self, file, key, content_type=None):
+        """
+        최종 URL 과 업로드 Future 를 바로 반환.
+        요청이 끝나면 업로드 파일이 닫히므로 내용은 먼저 임시 파일로 옮겨 둔다.
+        """
+        spooled = tempfile.SpooledTemporaryFile(
+            max_size=settings.OBJECT_STORAGE_SPOOL_MAX_SIZE
+        )
+        if hasattr(file, "chunks"):
+            for chunk in file.chunks():
+                spooled.write(chunk)
+        else:
+            shutil.copyfileobj(file, spooled)
+
+        def run():
+            try:
+                return self.upload(spooled, key, content_type)
+            except Exception:
+                logger.exception("업로드 최종 실패: %s", self.url(key))
+                raise
+            finally:
+                spooled.close()
+
+        if not settings.OBJECT_STORAGE_UPLOAD_WORKERS:
+            # 작업 스레드 없이 바로 업로드 (테스트, 관리 명령 등)
+            future = Future()
+            try:
+                future.set_result(run())
+            except Exception as e:
+                future.set_exception(e)
+        else:
+            future = _get_executor().submit(run)
+        return self.url(key), future
+
+
+@functools.lru_cache(maxsize=None)
+def get_storage(name):
+    """settings.OBJECT_STORAGES 에 정의된 스토리지"""
+    return ObjectStorage(**settings.OBJECT_STORAGES[name])
@@ -0,0 +1,88 @@
+"""
+테스트 공용 헬퍼: 모델 factory 와 로컬 provider 대역(stub) HTTP 서버.
+
+벤치마크 stub 서버 프로세스에서도 import 하므로 모델은 함수 안에서 import 한다.
+"""
+
+import datetime
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+def create_webtoon(**kwargs):
+    from webtoons.models import Webtoon
+
+    defaults = {
+        "title": "테스트 웹툰",
+        "author": "테스트 작가",
+        "thumbnail": "https://example.com/thumbnail.jpg",
+        "age_rating": "all",
+        "publication_day": datetime.date(2025, 2, 10),
+        "webtoon_url": "https://example.com/webtoon",
+        "platform": "naver",
+        "serialization_cycle": "1weeks",
+        "serial_day": ["mon"],
+    }
+    defaults.update(kwargs)
+    return Webtoon.objects.create(**defaults)
+
+
+def create_user(i, **kwargs):
+    from users.models import CustomUser
+
+    return CustomUser.objects.create_user(
+        email=f"user{i}@example.com", nick_name=f"유저{i}", **kwargs
+    )
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """로컬 provider 대역 서버의 요청 핸들러 기반 클래스 (JSON 응답)"""
+
+    protocol_version = "HTTP/1.1"
+    # 헤더와 본문을 따로 쓰므로 Nagle 때문에 응답마다 40ms 씩 늦어지지 않도록
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def read_form(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return {
+            key: values[0]
+            for key, values in parse_qs(self.rfile.read(length).decode()).items()
+        }
+
+    def reply(self, data, status=200):
+        body = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # 동시 접속이 많아도 연결이 거절되지 않도록
+    request_queue_size = 1024
+
+    def handle_error(self, request, client_address):
+        # timeout 으로 클라이언트가 먼저 끊은 경우의 BrokenPipe 는 무시
+        pass
+
+    @property
+    def base_url(self):
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+
+def start_stub_server(testcase, handler_class):
+    """백그라운드 스레드에서 stub 서버를 띄우고 테스트가 끝나면 닫는다"""
+    server = StubServer(("127.0.0.1", 0), handler_class)
+    server.requests = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    testcase.addCleanup(server.server_close)
+    testcase.addCleanup(server.shutdown)
+    return server
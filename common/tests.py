@@ -0,0 +1,408 @@
+import io
+import os
+import re
+import tempfile
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from botocore.exceptions import ClientError, EndpointConnectionError
+from django.core.cache import cache
+from django.core.files import File
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.db.backends.sqlite3 import base as sqlite3_base
+from django.test import (
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.test.utils import CaptureQueriesContext
+from moto import mock_aws
+from PIL import Image
+from rest_framework.test import APIClient
+
+from common.backends.pool import PooledDatabaseWrapperMixin, get_pool
+from common.images import read_image, render_variants, upload_image_variants
+from common.middleware import QueryBudgetMiddleware
+from common.routers import ReplicaRouter, routing_scope
+from common.storage import ObjectStorage, get_storage
+from common.testing import create_webtoon
+from users.models import CustomUser
+from webtoons.models import Webtoon
+
+
+def make_image(size=(1000, 500), image_format="JPEG", **save_kwargs):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, image_format, **save_kwargs)
+    return buffer.getvalue()
+
+
+class S3StandInMixin:
+    """moto 의 S3 구현을 로컬 스토리지 대역으로 띄우고 storage.test 엔드포인트를 연결"""
+
+    def setUp(self):
+        super().setUp()
+        environ = mock.patch.dict(
+            os.environ, {"MOTO_S3_CUSTOM_ENDPOINTS": "http://storage.test"}
+        )
+        environ.start()
+        self.addCleanup(environ.stop)
+        aws = mock_aws()
+        aws.start()
+        self.addCleanup(aws.stop)
+
+        # 테스트마다 다른 접속 정보로 새 클라이언트를 받는다
+        self.storage = ObjectStorage(
+            bucket="toonchu",
+            endpoint_url="http://storage.test/",
+            access_key=self.id(),
+            secret_key="secret",
+            region_name="kr-standard",
+            acl="public-read",
+        )
+        self.client = self.storage.client
+        self.client.create_bucket(
+            Bucket="toonchu",
+            CreateBucketConfiguration={"LocationConstraint": "kr-standard"},
+        )
+
+    def read_object(self, key):
+        return self.client.get_object(Bucket="toonchu", Key=key)
+
+    def assert_no_object(self, key):
+        with self.assertRaises(ClientError):
+            self.client.head_object(Bucket="toonchu", Key=key)
+
+    def fail_requests(self, operation, count):
+        """operation 요청 count 개를 스토리지에 닿기 전에 연결 오류로 실패시킨다"""
+        remaining = [count]
+
+        def before_send(request, **kwargs):
+            if remaining[0]:
+                remaining[0] -= 1
+                raise EndpointConnectionError(endpoint_url=request.url)
+
+        self.client.meta.events.register_first(
+            f"before-send.s3.{operation}", before_send
+        )
+
+
+@override_settings(OBJECT_STORAGE_RETRY_BACKOFF=0)
+class ObjectStorageTestCase(S3StandInMixin, SimpleTestCase):
+    """공유 클라이언트, 비동기 업로드, 재시도, multipart 업로드 확인"""
+
+    def setUp(self):
+        super().setUp()
+        self.file = SimpleUploadedFile("a.png", b"png", content_type="image/png")
+
+    def test_shared_client(self):
+        other = ObjectStorage(
+            "other", "http://storage.test", self.id(), "secret", "kr-standard"
+        )
+        self.assertIs(other.client, self.storage.client)
+        self.assertIs(get_storage("webtoons"), get_storage("webtoons"))
+
+    @override_settings(OBJECT_STORAGE_UPLOAD_WORKERS=2)
+    def test_upload_async_returns_url(self):
+        url, future = self.storage.upload_async(
+            self.file, "thumbnails/a.png", content_type="image/png"
+        )
+        self.assertEqual(url, "http://storage.test/toonchu/thumbnails/a.png")
+        # 요청이 끝나 업로드 파일이 닫혀도 업로드는 계속된다
+        self.file.close()
+        self.assertEqual(future.result(timeout=5), url)
+
+        uploaded = self.read_object("thumbnails/a.png")
+        self.assertEqual(uploaded["Body"].read(), b"png")
+        self.assertEqual(uploaded["ContentType"], "image/png")
+        grants = self.client.get_object_acl(Bucket="toonchu", Key="thumbnails/a.png")
+        self.assertIn("READ", [grant["Permission"] for grant in grants["Grants"]])
+
+    @override_settings(OBJECT_STORAGE_UPLOAD_WORKERS=0)
+    def test_retry_with_backoff(self):
+        self.fail_requests("PutObject", 2)
+        with self.assertLogs("common.storage", "WARNING") as logs:
+            url, future = self.storage.upload_async(
+                self.file, "a.png", content_type="image/png"
+            )
+        self.assertEqual(len(logs.output), 2)
+        self.assertEqual(future.result(), url)
+        self.assertEqual(self.read_object("a.png")["Body"].read(), b"png")
+
+    @override_settings(
+        OBJECT_STORAGE_UPLOAD_WORKERS=0, OBJECT_STORAGE_UPLOAD_ATTEMPTS=2
+    )
+    def test_give_up_after_attempts(self):
+        self.fail_requests("PutObject", 2)
+        with self.assertLogs("common.storage", "ERROR"):
+            _, future = self.storage.upload_async(self.file, "a.png")
+        self.assertIsNotNone(future.exception())
+        self.assert_no_object("a.png")
+
+
+# S3 는 마지막을 뺀 part 가 5MiB 이상이어야 multipart 업로드를 완료한다
+MIB = 1024 * 1024
+
+
+@override_settings(
+    OBJECT_STORAGE_RETRY_BACKOFF=0,
+    OBJECT_STORAGE_MULTIPART_PART_SIZE=5 * MIB,
+    OBJECT_STORAGE_CHUNK_SIZE=MIB,
+)
+class MultipartUploadTestCase(S3StandInMixin, SimpleTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = bytes(range(256)) * (11 * MIB // 256)
+
+    def upload(self):
+        return self.storage.upload_stream(
+            File(io.BytesIO(self.content), name="a.bin"), "form/a.bin"
+        )
+
+    def test_upload_stream_in_parts(self):
+        self.assertEqual(self.upload(), "http://storage.test/toonchu/form/a.bin")
+        uploaded = self.read_object("form/a.bin")
+        self.assertEqual(uploaded["Body"].read(), self.content)
+        # 1MiB chunk 를 5MiB 이상이 될 때까지 모아 5, 5, 1MiB 세 part
+        self.assertTrue(uploaded["ETag"].endswith('-3"'))
+
+    def test_retry_part(self):
+        self.fail_requests("UploadPart", 1)
+        with self.assertLogs("common.storage", "WARNING"):
+            self.upload()
+        self.assertEqual(self.read_object("form/a.bin")["Body"].read(), self.content)
+
+    @override_settings(OBJECT_STORAGE_UPLOAD_ATTEMPTS=1)
+    def test_upload_stream_aborts_on_failure(self):
+        self.fail_requests("CompleteMultipartUpload", 1)
+        with self.assertRaises(EndpointConnectionError):
+            self.upload()
+        # 올라간 part 는 업로드 취소로 정리된다
+        uploads = self.client.list_multipart_uploads(Bucket="toonchu")
+        self.assertEqual(uploads.get("Uploads", []), [])
+        self.assert_no_object("form/a.bin")
+
+
+@override_settings(
+    IMAGE_PROCESS_WORKERS=0,
+    OBJECT_STORAGE_UPLOAD_WORKERS=0,
+    IMAGE_VARIANT_FORMATS=["WEBP", "JPEG"],
+)
+class ImagePipelineTestCase(S3StandInMixin, SimpleTestCase):
+    """업로드 이미지 리사이즈/재인코딩/메타데이터 제거 확인"""
+
+    def test_render_variants(self):
+        exif = Image.Exif()
+        exif[0x010F] = "camera"  # Make
+        data = make_image(exif=exif.tobytes())
+
+        variants = render_variants(data, [160, 2000], "WEBP", 80)
+        with Image.open(io.BytesIO(variants[160])) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (160, 80)))
+            self.assertNotIn("exif", image.info)
+        # 원본보다 큰 너비는 확대하지 않는다
+        with Image.open(io.BytesIO(variants[2000])) as image:
+            self.assertEqual(image.size, (1000, 500))
+
+    def test_rejects_non_image(self):
+        with self.assertRaises(ValueError):
+            read_image(SimpleUploadedFile("a.png", b"not an image"))
+
+    def test_upload_variants(self):
+        urls = upload_image_variants(
+            self.storage,
+            SimpleUploadedFile("a.png", make_image(image_format="PNG")),
+            "thumbnails/a",
+            [160, 320],
+        )
+        self.assertEqual(
+            urls,
+            {
+                "160": "http://storage.test/toonchu/thumbnails/a/160.webp",
+                "320": "http://storage.test/toonchu/thumbnails/a/320.webp",
+            },
+        )
+        for width in [160, 320]:
+            uploaded = self.read_object(f"thumbnails/a/{width}.webp")
+            self.assertEqual(uploaded["ContentType"], "image/webp")
+            with Image.open(io.BytesIO(uploaded["Body"].read())) as image:
+                self.assertEqual((image.format, image.width), ("WEBP", width))
+
+
+class QueryBudgetMiddlewareTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    @override_settings(QUERY_BUDGET_SERVER_TIMING=True)
+    def test_server_timing(self):
+        response = self.client.get("/api/webtoons/list")
+        self.assertRegex(
+            response["Server-Timing"], r'^db;dur=[\d.]+;desc="\d+ queries"$'
+        )
+
+    def test_no_server_timing_by_default(self):
+        response = self.client.get("/api/webtoons/list")
+        self.assertNotIn("Server-Timing", response)
+
+    @override_settings(QUERY_BUDGET_MAX_QUERIES=1)
+    def test_warn_over_budget(self):
+        # 웹툰이 있으면 태그 prefetch 등으로 쿼리가 여러 개
+        create_webtoon(title="웹툰")
+        with self.assertLogs("common.middleware", "WARNING") as logs:
+            self.client.get("/api/webtoons/list")
+        self.assertIn("쿼리 예산 초과: GET /api/webtoons/list", logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MAX_QUERIES=1, QUERY_BUDGET_SERVER_TIMING=True)
+    async def test_async_request(self):
+        # ASGI 에서는 async 로 실행되고, 뷰 스레드의 쿼리도 센다
+        await sync_to_async(create_webtoon)(title="웹툰")
+        with self.assertLogs("common.middleware", "WARNING"):
+            response = await self.async_client.get("/api/webtoons/list")
+        self.assertEqual(response.status_code, 200)
+        count = int(re.search(r'desc="(\d+) queries"', response["Server-Timing"])[1])
+        self.assertGreater(count, 1)
+
+    def test_async_capable(self):
+        async def get_response(request):
+            pass
+
+        middleware = QueryBudgetMiddleware(get_response)
+        self.assertTrue(iscoroutinefunction(middleware))
+        self.assertFalse(iscoroutinefunction(QueryBudgetMiddleware(lambda r: None)))
+
+
+class PooledDatabaseWrapper(PooledDatabaseWrapperMixin, sqlite3_base.DatabaseWrapper):
+    pass
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    """sqlite 파일 DB 로 연결 반납/재사용 확인"""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.settings_dict = {
+            **connections.settings["default"],
+            "NAME": os.path.join(directory.name, "pool.sqlite3"),
+            "POOL_SIZE": 1,
+            "POOL_CHECK_AFTER": 30,
+        }
+        self.alias = self.id()
+        self.addCleanup(lambda: get_pool(self.alias, self.settings_dict).close_all())
+
+    def connect(self):
+        wrapper = PooledDatabaseWrapper(self.settings_dict, self.alias)
+        wrapper.ensure_connection()
+        return wrapper
+
+    def test_reuse_closed_connection(self):
+        first = self.connect()
+        raw = first.connection
+        first.close()
+
+        second = self.connect()
+        self.assertIs(second.connection, raw)
+        # 풀 크기(1)를 넘는 연결은 실제로 닫는다
+        third = self.connect()
+        self.assertIsNot(third.connection, raw)
+        second.close()
+        third.close()
+        self.assertEqual(len(get_pool(self.alias, self.settings_dict).idle), 1)
+
+    def test_discard_in_transaction(self):
+        wrapper = self.connect()
+        raw = wrapper.connection
+        wrapper.set_autocommit(False)
+        wrapper.close()
+        self.assertIsNot(self.connect().connection, raw)
+
+    def test_check_idle_connection(self):
+        self.settings_dict["POOL_CHECK_AFTER"] = 0
+        wrapper = self.connect()
+        raw = wrapper.connection
+        wrapper.close()
+        raw.close()  # 서버가 끊은 연결
+
+        self.assertIsNot(self.connect().connection, raw)
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaRouterTestCase(SimpleTestCase):
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_read_from_replica_until_write(self):
+        # 요청 밖이나 replica 를 쓰지 않는 뷰는 primary
+        self.assertEqual(self.router.db_for_read(Webtoon), "default")
+        with routing_scope() as state:
+            self.assertEqual(self.router.db_for_read(Webtoon), "default")
+            state.use_replica = True
+            self.assertEqual(self.router.db_for_read(Webtoon), "replica1")
+            self.assertEqual(self.router.db_for_write(Webtoon), "default")
+            self.assertEqual(self.router.db_for_read(Webtoon), "default")
+
+    def test_no_migrate_on_replica(self):
+        self.assertFalse(self.router.allow_migrate("replica1", "webtoons"))
+        self.assertIsNone(self.router.allow_migrate("default", "webtoons"))
+
+
+@override_settings(DATABASE_REPLICAS=["replica1"])
+class ReplicaRoutingTestCase(TransactionTestCase):
+    """replica1 은 테스트에서 default 를 mirror 하는 별도 연결"""
+
+    databases = {"default", "replica1"}
+
+    def setUp(self):
+        cache.clear()
+        self.webtoon = create_webtoon(title="웹툰")
+        self.user = CustomUser.objects.create_user("user@example.com", nick_name="유저")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(
+            connections["default"]
+        ) as primary, CaptureQueriesContext(connections["replica1"]) as replica:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    def test_bookmark_list_read_from_replica(self):
+        primary, replica = self.count_queries("/api/bookmark/")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
+
+    def test_catalog_read_from_replica(self):
+        # 버전을 올린 지 REPLICA_PIN_SECONDS 가 지난 상태
+        cache.clear()
+        self.client.force_authenticate(None)
+        for url in ["/api/webtoons/list", "/api/webtoons/search?term=웹툰"]:
+            primary, replica = self.count_queries(url)
+            self.assertEqual(primary, 0, url)
+            self.assertGreater(replica, 0, url)
+
+    def test_cache_fill_after_write_from_primary(self):
+        # setUp 에서 웹툰을 만들어 버전이 막 올랐으므로 응답 캐시와 랭킹 스냅샷은 primary 에서
+        self.client.force_authenticate(None)
+        primary, replica = self.count_queries("/api/webtoons/list")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+    def test_read_your_writes(self):
+        with CaptureQueriesContext(connections["replica1"]) as replica:
+            response = self.client.post("/api/bookmark/", {"webtoon": self.webtoon.pk})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(replica), 0)
+
+        # 토글 직후 같은 사용자의 북마크 목록은 primary 에서
+        primary, replica = self.count_queries("/api/bookmark/")
+        self.assertGreater(primary, 0)
+        self.assertEqual(replica, 0)
+
+        # 다른 사용자는 계속 replica
+        other = CustomUser.objects.create_user("other@example.com", nick_name="다른")
+        self.client.force_authenticate(other)
+        primary, replica = self.count_queries("/api/bookmark/")
+        self.assertEqual(primary, 0)
+        self.assertGreater(replica, 0)
@@ -72,6 +72,8 @@ INSTALLED_APPS = CUSTOM_APPS + SYSTEM_APPS + THIRD_PARTY_APPS  # + ['corsheaders
 
 MIDDLEWARE = [
     "corsheaders.middleware.CorsMiddleware",
+    "common.middleware.QueryBudgetMiddleware",
+    "common.middleware.ReplicaRoutingMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -112,9 +114,32 @@ DATABASES = {
         "PASSWORD": ENV.get("DB_PASSWORD"),
         "HOST": ENV.get("DB_HOST"),
         "PORT": ENV.get("DB_PORT"),
+        # 요청마다 새로 연결(TLS/인증)하지 않도록 연결을 유지하고, 재사용 전에 살아 있는지 확인.
+        # ASGI 배포는 DB_ENGINE=common.backends.mysql_pool, DB_CONN_MAX_AGE=0 으로 연결 풀 사용
+        "CONN_MAX_AGE": int(ENV.get("DB_CONN_MAX_AGE") or 60),
+        "CONN_HEALTH_CHECKS": True,
+        # 연결 풀(common.backends.pool): 풀에 남겨 둘 연결 수, 이 시간(초) 넘게 쉰 연결은 확인 후 사용
+        "POOL_SIZE": int(ENV.get("DB_POOL_SIZE") or 10),
+        "POOL_CHECK_AFTER": 30,
     }
 }
 
+# 읽기 전용 replica (common.routers): DB_REPLICAS 에 쉼표로 구분한 replica 위치(MySQL 은 HOST,
+# sqlite 는 파일 경로)를 주면 replica1, replica2, ... 로 추가한다
+DATABASE_REPLICAS = []
+for index, location in enumerate(ENV.get("DB_REPLICAS", "").split(","), start=1):
+    if location.strip():
+        key = "NAME" if "sqlite3" in (DATABASES["default"]["ENGINE"] or "") else "HOST"
+        DATABASES[f"replica{index}"] = {
+            **DATABASES["default"],
+            key: location.strip(),
+            "TEST": {"MIRROR": "default"},
+        }
+        DATABASE_REPLICAS.append(f"replica{index}")
+DATABASE_ROUTERS = ["common.routers.ReplicaRouter"]
+# 쓰기 요청 후 같은 사용자의 조회를 primary 에서 하는 시간 (초, replica 지연보다 길게)
+REPLICA_PIN_SECONDS = 5
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -137,12 +162,56 @@ AUTH_PASSWORD_VALIDATORS = [
 REST_FRAMEWORK = {
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     # # JWT 토큰 활성화 후 적용
-    "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
-    ),
+    "DEFAULT_AUTHENTICATION_CLASSES": ("users.authentication.CachedJWTAuthentication",),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.IsAuthenticated",),
+    # 앞단 프록시 수, X-Forwarded-For 끝에서 이만큼만 신뢰 (0 이면 REMOTE_ADDR)
+    "NUM_PROXIES": int(ENV.get("NUM_PROXIES") or 0),
 }
 
+# 요청별 쿼리 수/DB 시간 경고 기준 (common.middleware), 0 이면 확인하지 않음
+QUERY_BUDGET_MAX_QUERIES = int(ENV.get("QUERY_BUDGET_MAX_QUERIES") or 30)
+QUERY_BUDGET_MAX_DB_TIME_MS = int(ENV.get("QUERY_BUDGET_MAX_DB_TIME_MS") or 500)
+# DEBUG 가 아니어도 응답에 Server-Timing 헤더(쿼리 수/DB 시간)를 붙일지
+QUERY_BUDGET_SERVER_TIMING = ENV.get("QUERY_BUDGET_SERVER_TIMING") == "true"
+
+# 키셋(커서) 페이지네이션 기본/최대 페이지 크기
+KEYSET_PAGE_SIZE = int(ENV.get("KEYSET_PAGE_SIZE") or 20)
+KEYSET_MAX_PAGE_SIZE = int(ENV.get("KEYSET_MAX_PAGE_SIZE") or 100)
+# 태그 필터 결과가 랭킹 스냅샷의 1/KEYSET_SNAPSHOT_SCAN_RATIO 보다 적으면 스냅샷을 훑지 않고
+# DB 에서 정렬 (페이지를 채우려고 스냅샷을 길게 훑지 않도록)
+KEYSET_SNAPSHOT_SCAN_RATIO = 50
+
+# 태그 → 웹툰 역색인 비트맵 캐시 유지 시간(초)
+TAG_INDEX_TIMEOUT = 60 * 60 * 24
+
+# Cache (운영 환경은 prod.py 에서 Redis 로 교체)
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# 익명 조회 API 응답 캐시 유지 시간(초), 데이터 변경 시에는 버전 키로 즉시 무효화
+RESPONSE_CACHE_TIMEOUT = 60
+
+# 조회수 버퍼 반영 주기(초, 0 이면 캐시에 쌓고 flush_view_counts 명령으로 반영)와
+# 같은 사용자 중복 조회 제외 시간(초)
+VIEW_COUNT_FLUSH_INTERVAL = int(ENV.get("VIEW_COUNT_FLUSH_INTERVAL") or 10)
+VIEW_COUNT_DEDUP_WINDOW = 60 * 30
+# 반영된 조회수로 조회순 스냅샷/응답 캐시를 갱신하는 최소 간격(초, 모든 프로세스 합쳐서)
+VIEW_COUNT_RANKING_INTERVAL = 60
+
+# 웹툰별 좋아요 카운터 shard 수
+LIKE_COUNTER_SHARDS = 8
+
+# 같은 웹툰 북마크를 다시 토글할 수 있기까지의 시간 (초, 연속 클릭 방지)
+BOOKMARK_TOGGLE_DEBOUNCE_SECONDS = 5
+# 사용자별 북마크한 웹툰 id 집합 캐시 유지 시간 (초, 토글 시에는 캐시된 집합을 바로 고침)
+BOOKMARKED_IDS_CACHE_TIMEOUT = 60 * 60
+
+# ListView 랭킹 스냅샷 유지 시간 (변경 시에는 버전 키로 바로 무효화)
+RANKING_SNAPSHOT_TIMEOUT = 60 * 10
+
 # Swagger settings
 SPECTACULAR_SETTINGS = {
     "TITLE": "toonchu",
@@ -243,7 +312,7 @@ CSRF_TRUSTED_ORIGINS = [
 CORS_ALLOW_CREDENTIALS = True  # 인증정보 포함 허용
 
 
-GOOGLE_OAUTH2_SCOPE = ["email", "profile"]  # 새로운 설정 추가
+GOOGLE_OAUTH2_SCOPE = ["openid", "email", "profile"]  # openid: ID 토큰 발급
 
 
 # FRONTEND_URL = "https://toonchu-fe.vercel.app/"
@@ -337,3 +406,113 @@ NCP_ACCESS_KEY = ENV.get("NCP_ACCESS_KEY")
 NCP_SECRET_KEY = ENV.get("NCP_SECRET_KEY")
 NCP_OBJECT_STORAGE_ENDPOINT = ENV.get("IMAGE_BUCKET_ENDPOINT")
 BUCKET_NAME = ENV.get("BUCKET_NAME")
+NCP_BUCKET_NAME = ENV.get("NCP_BUCKET_NAME")
+
+# 오브젝트 스토리지 업로드 (common.storage)
+OBJECT_STORAGES = {
+    # 웹툰 썸네일
+    "webtoons": {
+        "bucket": BUCKET_NAME,
+        "endpoint_url": NCP_OBJECT_STORAGE_ENDPOINT,
+        "access_key": NCP_ACCESS_KEY,
+        "secret_key": NCP_SECRET_KEY,
+        "acl": "public-read",
+    },
+    # 사용자 프로필 이미지
+    "users": {
+        "bucket": NCP_STORAGE_BUCKET_NAME,
+        "endpoint_url": NCP_S3_ENDPOINT_URL,
+        "access_key": NCP_ACCESS_KEY_ID,
+        "secret_key": NCP_SECRET_ACCESS_KEY,
+        "acl": "public-read",
+    },
+    # ncp 파일 업로드
+    "ncp": {
+        "bucket": NCP_BUCKET_NAME,
+        "endpoint_url": "https://kr.object.ncloudstorage.com",
+        "access_key": NCP_ACCESS_KEY,
+        "secret_key": NCP_SECRET_KEY,
+        "region_name": "kr-standard",
+    },
+}
+OBJECT_STORAGE_MAX_POOL_CONNECTIONS = 20
+OBJECT_STORAGE_CONNECT_TIMEOUT = 5
+OBJECT_STORAGE_READ_TIMEOUT = 30
+# 0 이면 요청 스레드에서 바로 업로드
+OBJECT_STORAGE_UPLOAD_WORKERS = int(ENV.get("OBJECT_STORAGE_UPLOAD_WORKERS", 4))
+OBJECT_STORAGE_UPLOAD_ATTEMPTS = 3
+OBJECT_STORAGE_RETRY_BACKOFF = 0.5  # 초, 시도마다 2배
+# 이보다 큰 업로드는 메모리 대신 디스크 임시 파일에 둔다
+OBJECT_STORAGE_SPOOL_MAX_SIZE = 5 * 1024 * 1024
+# 이보다 큰 파일은 이 크기 part 로 나눠 multipart upload (S3 최소 5MB)
+OBJECT_STORAGE_MULTIPART_PART_SIZE = 8 * 1024 * 1024
+OBJECT_STORAGE_CHUNK_SIZE = 256 * 1024
+# 존재를 확인한 prefix 를 다시 확인하지 않는 시간 (초)
+OBJECT_STORAGE_PREFIX_TTL = 60 * 60
+
+# 업로드 이미지 변형본 (common.images)
+# 0 이면 요청 스레드에서 바로 처리
+IMAGE_PROCESS_WORKERS = int(ENV.get("IMAGE_PROCESS_WORKERS", 2))
+# 앞에서부터 Pillow 가 인코딩할 수 있는 첫 형식 사용
+IMAGE_VARIANT_FORMATS = ["WEBP", "JPEG"]
+IMAGE_VARIANT_QUALITY = 80
+WEBTOON_THUMBNAIL_WIDTHS = [160, 320, 640]
+PROFILE_IMAGE_WIDTHS = [320]
+
+# 랜덤 닉네임 순번을 프로세스별로 한 번에 예약하는 수 (users.nicknames)
+NICKNAME_BLOCK_SIZE = 100
+
+# 탈퇴 사용자 삭제 (users.delete_users): 보관 기간 (일), 트랜잭션 하나에서 지울 사용자 수,
+# 청크 사이에 쉬는 시간 (초)
+WITHDRAWN_USER_RETENTION_DAYS = 50
+WITHDRAWN_USER_PURGE_CHUNK_SIZE = 500
+WITHDRAWN_USER_PURGE_PAUSE = 0.1
+
+# JWT 인증 사용자 캐시 유지 시간 (초, users.authentication)
+USER_SNAPSHOT_CACHE_TIMEOUT = 5 * 60
+
+# 리프레시 토큰 블랙리스트 (users.tokens)
+# Bloom filter 최소 크기와 false positive 비율, 다시 만드는 주기 (초)
+TOKEN_BLACKLIST_FILTER_CAPACITY = 10000
+TOKEN_BLACKLIST_FILTER_ERROR_RATE = 0.01
+TOKEN_BLACKLIST_FILTER_REBUILD_INTERVAL = 60 * 60
+# 다른 프로세스의 블랙리스트를 가져올 때 겹쳐 읽는 시간 (초, 트랜잭션 길이보다 길게)
+TOKEN_BLACKLIST_SYNC_MARGIN = 60
+# 만료 토큰 정리 (compact_token_blacklist): 트랜잭션 하나에서 지울 토큰 수, 쉬는 시간 (초)
+TOKEN_BLACKLIST_COMPACTION_BATCH_SIZE = 1000
+TOKEN_BLACKLIST_COMPACTION_PAUSE = 0.1
+
+# 소셜 로그인 provider HTTP 호출 (users.oauth_client)
+OAUTH_HTTP_CONNECT_TIMEOUT = 3
+OAUTH_HTTP_READ_TIMEOUT = 5
+OAUTH_HTTP_RETRIES = 2
+OAUTH_HTTP_RETRY_BACKOFF = 0.2
+OAUTH_HTTP_POOL_SIZE = 10
+# ASGI 로그인 뷰는 한 프로세스에서 수백 건을 동시에 처리하므로 풀을 크게 두고,
+# httpx 풀 관리 비용이 커지지 않도록 SHARD_SIZE 개씩 나눈 풀을 쓴다
+OAUTH_HTTP_ASYNC_POOL_SIZE = 100
+OAUTH_HTTP_ASYNC_SHARD_SIZE = 20
+# 응답 시간 히스토그램 버킷 경계 (ms)
+OAUTH_LATENCY_BUCKETS = [50, 100, 250, 500, 1000, 2500, 5000]
+# provider 별 토큰/프로필 API 주소
+OAUTH_PROVIDER_ENDPOINTS = {
+    "kakao": {
+        "token_url": "https://kauth.kakao.com/oauth/token",
+        "profile_url": "https://kapi.kakao.com/v2/user/me",
+    },
+    "naver": {
+        "token_url": "https://nid.naver.com/oauth2.0/token",
+        "profile_url": "https://openapi.naver.com/v1/nid/me",
+    },
+    "google": {
+        "token_url": "https://oauth2.googleapis.com/token",
+        "profile_url": "https://www.googleapis.com/oauth2/v3/userinfo",
+        "jwks_url": "https://www.googleapis.com/oauth2/v3/certs",
+    },
+}
+# 같은 access token 의 provider 사용자 정보를 재사용하는 시간 (초)
+OAUTH_USERINFO_CACHE_TIMEOUT = 60
+# 구글 ID 토큰 검증 키(JWKS) 캐시 시간, kid 가 없을 때 다시 받는 최소 간격 (초)
+OAUTH_JWKS_CACHE_TIMEOUT = 6 * 60 * 60
+OAUTH_JWKS_MIN_REFRESH = 60
+OAUTH_ID_TOKEN_LEEWAY = 30
@@ -16,6 +16,11 @@ ALLOWED_HOSTS = [
 
 CORS_ALLOW_ALL_ORIGINS = True  # 개발 환경에서만 사용
 
+# replica 를 따로 두지 않으면 같은 DB 를 가리키는 replica 를 두어 라우팅을 로컬/테스트에서도 확인
+if not DATABASE_REPLICAS:
+    DATABASES["replica1"] = {**DATABASES["default"], "TEST": {"MIRROR": "default"}}
+    DATABASE_REPLICAS = ["replica1"]
+
 # 테스트 환경에서는 실행하지 않음
 if ENV.get("DJANGO_ENV") != "test":
     bucket_name = ENV.get("NCP_STORAGE_BUCKET_NAME")
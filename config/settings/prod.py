@@ -25,6 +25,14 @@ CORS_ALLOWED_ORIGINS = [
 CORS_ALLOW_METHODS = ["GET", "POST", "PUT", "DELETE", "PATCH", "OPTIONS"]
 CORS_ALLOW_HEADERS = ["*"]
 
+# 응답 캐시/태그 역색인 등을 여러 워커가 공유하도록 Redis 사용
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": ENV.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+    }
+}
+
 
 #
 # # # 보안 설정 추가
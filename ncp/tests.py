@@ -1,3 +1,79 @@
-from django.test import TestCase
+from botocore.stub import ANY, Stubber
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
 
-# Create your tests here.
+from common.storage import get_storage, prefix_registry
+from ncp.views import upload_image_to_ncp
+
+
+@override_settings(
+    OBJECT_STORAGES={
+        "ncp": {
+            "bucket": "toonchu",
+            "endpoint_url": "https://kr.object.ncloudstorage.com",
+            "access_key": "ncp-test",
+            "secret_key": "secret",
+            "region_name": "kr-standard",
+        }
+    },
+    OBJECT_STORAGE_UPLOAD_WORKERS=0,
+)
+class UploadImageToNcpTestCase(SimpleTestCase):
+    """프로필 업로드당 스토리지 호출 수 확인 (prefix 확인은 처음 한 번만)"""
+
+    def setUp(self):
+        get_storage.cache_clear()
+        self.addCleanup(get_storage.cache_clear)
+        prefix_registry.clear()
+        self.addCleanup(prefix_registry.clear)
+
+        client = get_storage("ncp").client
+        self.stubber = Stubber(client)
+        self.stubber.activate()
+        self.addCleanup(self.stubber.deactivate)
+
+        self.calls = []
+        client.meta.events.register_first("before-parameter-build.s3", self.count_call)
+        self.addCleanup(
+            client.meta.events.unregister, "before-parameter-build.s3", self.count_call
+        )
+
+    def count_call(self, model, **kwargs):
+        self.calls.append(model.name)
+
+    def upload(self, name):
+        self.calls.clear()
+        self.stubber.add_response(
+            "put_object",
+            {},
+            {"Bucket": "toonchu", "Key": f"profile/user/{name}", "Body": ANY},
+        )
+        upload_image_to_ncp(SimpleUploadedFile(name, b"png"), "user")
+        self.stubber.assert_no_pending_responses()
+        return self.calls
+
+    def expect_prefix_check(self, exists):
+        response = {"Contents": [{"Key": "profile/"}]} if exists else {}
+        self.stubber.add_response(
+            "list_objects_v2",
+            response,
+            {"Bucket": "toonchu", "Prefix": "profile", "MaxKeys": 1},
+        )
+
+    def test_prefix_checked_once(self):
+        self.expect_prefix_check(exists=False)
+        self.stubber.add_response(
+            "put_object", {}, {"Bucket": "toonchu", "Key": "profile/"}
+        )
+        self.assertEqual(
+            self.upload("a.png"), ["ListObjectsV2", "PutObject", "PutObject"]
+        )
+        # 이후 업로드는 스토리지 호출 한 번
+        self.assertEqual(self.upload("b.png"), ["PutObject"])
+        self.assertEqual(self.upload("c.png"), ["PutObject"])
+
+    @override_settings(OBJECT_STORAGE_PREFIX_TTL=0)
+    def test_prefix_checked_again_after_ttl(self):
+        for name in ["a.png", "b.png"]:
+            self.expect_prefix_check(exists=True)
+            self.assertEqual(self.upload(name), ["ListObjectsV2", "PutObject"])
@@ -1,14 +1,13 @@
 # from users.views import logger  # Remove this line
 import logging
 
-import boto3
-from boto3.s3.inject import upload_file
-from django.conf import settings
 from drf_spectacular.utils import extend_schema
 from rest_framework import status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from common.storage import get_storage
+
 logger = logging.getLogger(__name__)  # Initialize the logger in this module instead.
 
 from .serializers import InputFileSerializer
@@ -16,29 +15,16 @@ from .serializers import InputFileSerializer
 
 def upload_image_to_ncp(image_file, user_uuid):
     """이미지를 NCP Object Storage에 업로드하고 URL을 반환"""
-    region_name = "kr-standard"
-    bucket_name = settings.NCP_BUCKET_NAME
-
-    s3_client = boto3.client(
-        "s3",
-        endpoint_url="https://kr.object.ncloudstorage.com",
-        aws_access_key_id=settings.NCP_ACCESS_KEY,
-        aws_secret_access_key=settings.NCP_SECRET_KEY,
-        region_name=region_name,
-    )
+    storage = get_storage("ncp")
 
     # 파일 경로 지정 (사용자별로 구분)
     S3_key = f"profile/{user_uuid}/{image_file.name}"
 
-    # 업로드 (prefix가 없으면 생성)
-    if not prefix_exists(s3_client, bucket_name, "profile"):
-        s3_client.put_object(Bucket=bucket_name, Key="profile/")
+    # 업로드 (prefix가 없으면 생성, 확인 결과는 프로세스 단위로 캐시)
+    storage.ensure_prefix("profile")
 
-    # 파일 업로드
-    s3_client.put_object(Bucket=bucket_name, Key=S3_key, Body=image_file.read())
-
-    # URL 반환
-    file_url = f"https://kr.object.ncloudstorage.com/{bucket_name}/{S3_key}"
+    # 파일 업로드 (작업 스레드에서 진행, URL 은 바로 반환)
+    file_url, _ = storage.upload_async(image_file, S3_key)
 
     # Log the URL after upload
     logger.info(f"Profile image uploaded to NCP: {file_url}")
@@ -46,18 +32,6 @@ def upload_image_to_ncp(image_file, user_uuid):
     return file_url
 
 
-def prefix_exists(s3_client, bucket_name, prefix):
-    """Object Storage에 prefix가 존재하는지 확인"""
-    try:
-        response = s3_client.list_objects_v2(
-            Bucket=bucket_name, Prefix=prefix, MaxKeys=1
-        )
-        return "Contents" in response
-    except Exception as e:
-        print(f"Error: {str(e)}")
-        return False
-
-
 class InputFile(APIView):
     @extend_schema(
         summary="Upload file to NCP Object Storage",
@@ -73,17 +47,7 @@ class InputFile(APIView):
             file = serializer.validated_data["file"]
             user = str(request.user.uuid)
 
-            region_name = "kr-standard"
-            bucket_name = settings.NCP_BUCKET_NAME
-            S3_key = ""
-
-            s3_client = boto3.client(
-                "s3",
-                endpoint_url="https://kr.object.ncloudstorage.com",
-                aws_access_key_id=settings.NCP_ACCESS_KEY,
-                aws_secret_access_key=settings.NCP_SECRET_KEY,
-                region_name=region_name,
-            )
+            storage = get_storage("ncp")
 
             if input_source == "profile":
                 # 프로필 이미지 업로드
@@ -93,17 +57,14 @@ class InputFile(APIView):
                 question = serializer.validated_data["question_order"]
                 option = serializer.validated_data["option_number"]
                 S3_key = f"{input_source}/{form}/{question}/{option}/{user}/{file.name}"
-                file_url = upload_file(
-                    s3_client, bucket_name, input_source, S3_key, file
-                )
+                # chunks() 를 multipart upload 로 흘려보내 파일 전체를 메모리에 올리지 않는다
+                file_url = storage.upload_stream(file, S3_key)
             elif input_source == "form":
                 form = serializer.validated_data["form_title"]
                 question = serializer.validated_data["question_order"]
                 option = serializer.validated_data["option_number"]
                 S3_key = f"{input_source}/{form}/{question}/{option}/{file.name}"
-                file_url = upload_file(
-                    s3_client, bucket_name, input_source, S3_key, file
-                )
+                file_url = storage.upload_stream(file, S3_key)
 
             return Response(
                 {
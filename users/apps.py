@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "users"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        from .oauth_providers import get_providers
+
+        # provider 정보는 시작할 때 한 번 만든다
+        get_providers()
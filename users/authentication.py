@@ -0,0 +1,71 @@
+"""
+JWT 인증 사용자 캐시.
+
+simplejwt 의 JWTAuthentication 은 요청마다 사용자 행을 읽는다. 인증과 권한 확인에 필요한
+필드(SNAPSHOT_FIELDS)만 캐시에 두고, 나머지 필드는 deferred 로 남긴 CustomUser 를 만들어
+요청에 붙인다. 다른 필드를 쓰는 뷰는 접근할 때 DB 에서 읽으므로 결과는 같다.
+사용자가 저장/삭제되면 커밋 후 캐시를 지운다 (users.signals).
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import router
+from django.utils.translation import gettext_lazy as _
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+USER_SNAPSHOT_KEY = "user_snapshot:{user_id}"
+SNAPSHOT_FIELDS = ("id", "nick_name", "is_active", "is_staff", "withdraw_at")
+
+
+def user_snapshot_key(user_id):
+    return USER_SNAPSHOT_KEY.format(user_id=user_id)
+
+
+def get_cached_user(user_id):
+    """캐시된 필드만 읽어 둔 사용자, 캐시에 없으면 DB 에서 읽어 채운다. 없는 사용자면 None"""
+    User = get_user_model()
+    key = user_snapshot_key(user_id)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        snapshot = User.objects.filter(id=user_id).values(*SNAPSHOT_FIELDS).first()
+        if snapshot is None:
+            return None
+        cache.set(key, snapshot, timeout=settings.USER_SNAPSHOT_CACHE_TIMEOUT)
+    # from_db 는 모델 필드 순서대로 값을 받는다
+    field_names = [
+        field.attname
+        for field in User._meta.concrete_fields
+        if field.attname in snapshot
+    ]
+    values = [snapshot[name] for name in field_names]
+    return User.from_db(router.db_for_read(User), field_names, values)
+
+
+def invalidate_cached_user(user_id):
+    cache.delete(user_snapshot_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            ) from e
+
+        user = get_cached_user(user_id)
+        if user is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    # API 문서에 JWTAuthentication 과 같은 Bearer 인증으로 표시
+    target_class = "users.authentication.CachedJWTAuthentication"
@@ -1,22 +1,122 @@
+"""
+탈퇴 후 보관 기간이 지난 사용자 삭제.
+
+한 번의 delete() 는 연관된 북마크/토큰을 모두 메모리에 올리고 긴 트랜잭션 하나로
+테이블을 잡고 있으므로, id 순서로 WITHDRAWN_USER_PURGE_CHUNK_SIZE 명씩 나눠
+청크마다 트랜잭션을 따로 연다. 연관 테이블은 CustomUser._meta 의 관계에서 찾아
+Collector 를 거치지 않고 user_id 조건의 DELETE 한 번으로 지운다 (CASCADE 가 아닌 관계는
+RELATION_HANDLERS 에 처리 방법이 있어야 한다). 청크 사이에는 WITHDRAWN_USER_PURGE_PAUSE 초
+쉬어 다른 요청이 락을 잡을 틈을 주고, 마지막으로 끝낸 id 를 청크와 같은 트랜잭션에서
+PurgeCheckpoint 에 남겨 중단되면 이어서 지운다.
+"""
+
+import time
 from datetime import timedelta
 
-from django.core.management.base import BaseCommand
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import models, transaction
 from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from common.db import delete_ids
+from users.models import CustomUser, PurgeCheckpoint
+from webtoons.like_counter import delete_likes
+
+CHECKPOINT_NAME = "delete_withdrawn_users"
+
+
+def _delete_tokens(tokens):
+    # 토큰은 SET_NULL 이지만 사용자 없이는 쓸 수 없으므로 블랙리스트와 함께 지운다
+    token_ids = list(tokens.values_list("id", flat=True))
+    BlacklistedToken.objects.filter(token_id__in=token_ids).delete()
+    delete_ids(OutstandingToken, token_ids)
+
+
+# CASCADE 가 아니거나 함께 처리할 것이 있는 관계: 모델 label → 사용자의 행 queryset 처리 함수
+RELATION_HANDLERS = {
+    # 좋아요는 웹툰별 좋아요 수(shard)에서도 빼야 한다
+    "webtoons.WebtoonLike": delete_likes,
+    "token_blacklist.OutstandingToken": _delete_tokens,
+}
+
+
+def _through_rows(through, field_name, user_ids):
+    return through._base_manager.filter(**{f"{field_name}__in": user_ids})
+
+
+def purge_users(user_ids):
+    """사용자와 연관 데이터를 지우고 지운 사용자 수를 반환 (호출하는 쪽 트랜잭션 안에서)"""
+    for relation in CustomUser._meta.related_objects:
+        model = relation.related_model
+        if relation.many_to_many:
+            # 다른 모델의 M2M 은 중간 테이블 행만 지운다
+            field_name = relation.field.m2m_reverse_field_name()
+            _through_rows(relation.through, field_name, user_ids).delete()
+            continue
+
+        rows = model._base_manager.filter(**{f"{relation.field.name}__in": user_ids})
+        handler = RELATION_HANDLERS.get(model._meta.label)
+        if handler is not None:
+            handler(rows)
+        # 하위 관계가 있으면 DELETE 한 번으로 지울 수 없다
+        elif relation.on_delete is models.CASCADE and not model._meta.related_objects:
+            rows.delete()
+        else:
+            raise ImproperlyConfigured(
+                f"{model._meta.label}: RELATION_HANDLERS 에 사용자 행 삭제 방법이 없습니다"
+            )
 
-from users.models import CustomUser
+    # groups, user_permissions
+    for field in CustomUser._meta.many_to_many:
+        through = field.remote_field.through
+        _through_rows(through, field.m2m_field_name(), user_ids).delete()
+    # 연관 행을 모두 지웠으므로 Collector 로 사용자 행을 다시 읽지 않는다
+    return delete_ids(CustomUser, user_ids)
 
 
-def delete_withdrawn_users():
-    deletion_date = timezone.now() - timedelta(days=50)
-    users_to_delete = CustomUser.objects.filter(withdraw_at__lte=deletion_date)
-    deleted_count = users_to_delete.count()
-    users_to_delete.delete()
-    print(f"{deleted_count} users have been deleted.")
+def delete_withdrawn_users(chunk_size=None, pause=None, resume=True, progress=None):
+    """
+    보관 기간이 지난 탈퇴 사용자를 청크 단위로 삭제하고 삭제한 수를 반환.
+    progress(deleted, last_id) 는 청크가 커밋될 때마다 호출된다.
+    """
+    chunk_size = chunk_size or settings.WITHDRAWN_USER_PURGE_CHUNK_SIZE
+    pause = settings.WITHDRAWN_USER_PURGE_PAUSE if pause is None else pause
 
+    # 중단된 작업은 같은 기준 시각으로 마지막 id 다음부터 이어서
+    checkpoint = (
+        PurgeCheckpoint.objects.filter(name=CHECKPOINT_NAME).first() if resume else None
+    )
+    if checkpoint is None:
+        retention = timedelta(days=settings.WITHDRAWN_USER_RETENTION_DAYS)
+        checkpoint = PurgeCheckpoint(
+            name=CHECKPOINT_NAME, cutoff=timezone.now() - retention
+        )
+    cutoff, last_id = checkpoint.cutoff, checkpoint.last_id
 
-class Command(BaseCommand):
-    help = "50일 전에 탈퇴를 요청한 사용자 삭제"
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            # 청크를 지우는 동안 탈퇴가 취소되지 않도록 사용자 행을 잠근다
+            user_ids = list(
+                CustomUser.objects.select_for_update()
+                .filter(withdraw_at__lte=cutoff, id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not user_ids:
+                break
+            deleted += purge_users(user_ids)
+            last_id = checkpoint.last_id = user_ids[-1]
+            checkpoint.save()
+        if progress is not None:
+            progress(deleted, last_id)
+        if len(user_ids) < chunk_size:
+            break
+        time.sleep(pause)
 
-    def handle(self, *args, **options):
-        delete_withdrawn_users()
-        self.stdout.write(self.style.SUCCESS("유저정보 삭제가 완료되었습니다"))
+    PurgeCheckpoint.objects.filter(name=CHECKPOINT_NAME).delete()
+    return deleted
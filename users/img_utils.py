@@ -1,37 +1,21 @@
 import uuid
 
-import boto3
 from django.conf import settings
 
-ACCESS_KEY = settings.NCP_ACCESS_KEY_ID
-SECRET_KEY = settings.NCP_SECRET_ACCESS_KEY
-ENDPOINT_URL = settings.NCP_S3_ENDPOINT_URL
-BUCKET_NAME = settings.NCP_STORAGE_BUCKET_NAME
-
-s3_client = boto3.client(
-    "s3",
-    aws_access_key_id=ACCESS_KEY,
-    aws_secret_access_key=SECRET_KEY,
-    endpoint_url=ENDPOINT_URL,
-)
+from common.images import upload_image_variants
+from common.storage import get_storage
 
 
 def upload_file_to_s3(request):
     if request.FILES.get("profile_img"):
         file_obj = request.FILES["profile_img"]
 
-        # 파일명 중복 방지를 위해 UUID 추가
-        file_name = f"users/profile/{uuid.uuid4()}_{file_obj.name}"
-
-        try:
-            # 파일을 Object Storage에 업로드
-            s3_client.upload_fileobj(
-                file_obj, BUCKET_NAME, file_name, ExtraArgs={"ACL": "public-read"}
-            )
+        # 파일명 중복 방지를 위해 UUID 경로 사용
+        key_prefix = f"users/profile/{uuid.uuid4()}"
 
-            # 업로드된 파일의 URL 생성
-            file_url = f"{ENDPOINT_URL}/{BUCKET_NAME}/{file_name}"
-        except Exception as e:
-            raise ValueError(str(e))
-        return file_url
+        # 리사이즈/업로드는 백그라운드에서 진행되고 URL 은 바로 반환된다
+        variants = upload_image_variants(
+            get_storage("users"), file_obj, key_prefix, settings.PROFILE_IMAGE_WIDTHS
+        )
+        return variants[str(max(settings.PROFILE_IMAGE_WIDTHS))]
     raise ValueError("프로필 이미지가 없습니다")
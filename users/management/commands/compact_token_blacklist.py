@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from users.tokens import compact_token_blacklist
+
+
+class Command(BaseCommand):
+    help = "만료된 리프레시 토큰과 블랙리스트를 나눠서 삭제 (주기적으로 실행)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, help="트랜잭션 하나에서 지울 토큰 수"
+        )
+        parser.add_argument("--pause", type=float, help="배치 사이에 쉬는 시간 (초)")
+
+    def handle(self, *args, **options):
+        deleted = compact_token_blacklist(
+            batch_size=options["batch_size"], pause=options["pause"]
+        )
+        self.stdout.write(self.style.SUCCESS(f"만료된 토큰 {deleted}개를 삭제했습니다"))
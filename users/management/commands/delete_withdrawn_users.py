@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+
+from users.delete_users import delete_withdrawn_users
+
+
+class Command(BaseCommand):
+    help = "탈퇴 요청 후 보관 기간(50일)이 지난 사용자 삭제 (중단되면 이어서 삭제)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size", type=int, help="트랜잭션 하나에서 지울 사용자 수"
+        )
+        parser.add_argument("--pause", type=float, help="청크 사이에 쉬는 시간 (초)")
+        parser.add_argument(
+            "--restart", action="store_true", help="이전 진행 상황을 무시하고 처음부터"
+        )
+
+    def handle(self, *args, **options):
+        def progress(deleted, last_id):
+            self.stdout.write(f"{deleted}명 삭제 (id {last_id} 까지)")
+
+        deleted = delete_withdrawn_users(
+            chunk_size=options["chunk_size"],
+            pause=options["pause"],
+            resume=not options["restart"],
+            progress=progress,
+        )
+        self.stdout.write(
+            self.style.SUCCESS(f"유저정보 삭제가 완료되었습니다 ({deleted}명)")
+        )
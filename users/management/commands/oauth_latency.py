@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from users.oauth_client import LatencyHistogram
+
+PROVIDERS = ["kakao", "naver", "google"]
+
+
+class Command(BaseCommand):
+    help = "소셜 로그인 provider 별 응답 시간 히스토그램 출력"
+
+    def handle(self, *args, **options):
+        for provider in PROVIDERS:
+            snapshot = LatencyHistogram(provider).snapshot()
+            count = snapshot["count"]
+            average = snapshot["sum_ms"] / count if count else 0
+            self.stdout.write(f"{provider}: {count}회, 평균 {average:.1f}ms")
+            for bucket, value in snapshot["buckets"].items():
+                label = f"<= {bucket}ms" if bucket != "inf" else "> 마지막 버킷"
+                self.stdout.write(f"  {label:>12}: {value}")
@@ -0,0 +1,26 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_customuser_profile_img"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NicknameSequence",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=20, primary_key=True, serialize=False),
+                ),
+                ("next_value", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "users_nickname_sequence",
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_nickname_sequence"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PurgeCheckpoint",
+            fields=[
+                (
+                    "name",
+                    models.CharField(max_length=50, primary_key=True, serialize=False),
+                ),
+                ("cutoff", models.DateTimeField()),
+                ("last_id", models.BigIntegerField(default=0)),
+            ],
+            options={
+                "db_table": "users_purge_checkpoint",
+            },
+        ),
+    ]
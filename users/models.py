@@ -68,3 +68,24 @@ class CustomUser(AbstractBaseUser, PermissionsMixin):
 
     def __str__(self):
         return self.email
+
+
+class NicknameSequence(models.Model):
+    """랜덤 닉네임 조합 공간에서 다음에 나눠줄 순번 (일반/히든 닉네임별 한 행)"""
+
+    name = models.CharField(max_length=20, primary_key=True)
+    next_value = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "users_nickname_sequence"
+
+
+class PurgeCheckpoint(models.Model):
+    """중단된 삭제 작업을 이어서 하기 위한 기준 시각과 마지막으로 지운 id (작업별 한 행)"""
+
+    name = models.CharField(max_length=50, primary_key=True)
+    cutoff = models.DateTimeField()
+    last_id = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = "users_purge_checkpoint"
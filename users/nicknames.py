@@ -0,0 +1,87 @@
+"""
+랜덤 닉네임 할당.
+
+단어 목록의 조합 공간에 번호를 매기고, 순번을 고정된 순열로 섞어 닉네임으로 바꾼다.
+번호마다 이름이 하나씩 대응하므로 순번이 겹치지 않으면 닉네임도 겹치지 않는다.
+조합을 다 쓰면 " 2", " 3" 처럼 회차를 붙인다.
+순번은 NicknameSequence 에서 프로세스별로 블록 단위로 예약하므로, 할당 한 번은
+메모리 연산이고 DB 는 블록마다 한 번만 쓴다.
+"""
+
+import math
+import threading
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+
+from .models import NicknameSequence
+
+
+class NicknameSpace:
+    """순번 → 닉네임, 이웃한 순번이 비슷한 이름이 되지 않도록 곱셈 순열로 섞는다"""
+
+    def __init__(self, *parts):
+        # 중복 단어는 같은 이름을 두 번 만들므로 제거
+        self.parts = [list(dict.fromkeys(part)) for part in parts]
+        self.size = math.prod(len(part) for part in self.parts)
+        self.multiplier = next(
+            value
+            for value in range(int(self.size * 0.618) or 1, self.size * 2 + 1)
+            if math.gcd(value, self.size) == 1
+        )
+        self.offset = self.size // 3
+
+    def name(self, number):
+        rounds, position = divmod(number, self.size)
+        index = (position * self.multiplier + self.offset) % self.size
+        words = []
+        for part in reversed(self.parts):
+            index, word_index = divmod(index, len(part))
+            words.append(part[word_index])
+        name = " ".join(reversed(words))
+        return f"{name} {rounds + 1}" if rounds else name
+
+
+def reserve_block(sequence, size):
+    """sequence 에서 size 개의 순번을 예약하고 (시작, 끝) 을 반환"""
+    NicknameSequence.objects.bulk_create(
+        [NicknameSequence(name=sequence)], ignore_conflicts=True
+    )
+    with transaction.atomic():
+        row = NicknameSequence.objects.select_for_update().get(name=sequence)
+        start = row.next_value
+        row.next_value = start + size
+        row.save(update_fields=["next_value"])
+    return start, start + size
+
+
+class NicknameAllocator:
+    """
+    예약한 블록에서 순번을 하나씩 꺼내 닉네임으로 바꾼다.
+    프로세스가 끝나면 남은 순번은 버려진다 (이름이 비어 있을 뿐 겹치지는 않는다).
+    """
+
+    def __init__(self, sequence, space):
+        self.sequence = sequence
+        self.space = space
+        self._lock = threading.Lock()
+        self._next = self._end = 0
+
+    def next_name(self):
+        with self._lock:
+            if self._next >= self._end:
+                self._next, self._end = reserve_block(
+                    self.sequence, settings.NICKNAME_BLOCK_SIZE
+                )
+            number = self._next
+            self._next += 1
+        return self.space.name(number)
+
+    def allocate(self):
+        """사용 중이지 않은 닉네임 (사용자가 직접 바꾼 닉네임과 겹치면 다음 이름)"""
+        users = get_user_model().objects
+        while True:
+            name = self.next_name()
+            if not users.filter(nick_name=name).exists():
+                return name
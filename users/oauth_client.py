@@ -0,0 +1,218 @@
+"""
+소셜 로그인 provider HTTP 클라이언트.
+
+provider 마다 requests.Session 하나를 두어 커넥션을 재사용하고(keep-alive, TLS 재협상 없음),
+모든 호출에 connect/read timeout 과 제한된 재시도를 적용한다. 느린 provider 가 워커를
+붙잡지 않도록 read timeout 이후에는 다시 보내지 않는다. 502/503/504 응답은 GET 만
+다시 보낸다 (토큰 요청 POST 의 인가 코드는 1회용이라 provider 가 이미 썼을 수 있다). provider 별 응답 시간은
+캐시 카운터 히스토그램으로 모으므로 여러 워커 프로세스의 값이 함께 집계된다.
+AsyncProviderClient 는 ASGI 로그인 뷰에서 쓰는 httpx 기반 클라이언트로, 같은 timeout,
+재시도 정책과 히스토그램을 사용한다.
+"""
+
+import asyncio
+import threading
+import time
+import weakref
+
+import httpx
+import requests
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+LATENCY_KEY = "oauth_latency:{provider}:{bucket}"
+RETRY_STATUSES = (502, 503, 504)
+# 응답 상태 코드로 재시도하는 메서드 (연결 실패는 요청이 전달되지 않았으므로 모든 메서드)
+RETRY_STATUS_METHODS = frozenset({"GET"})
+
+_clients = {}
+_clients_lock = threading.Lock()
+# 이벤트 루프별 {provider: AsyncProviderClient}, 커넥션은 만든 루프에서만 쓸 수 있다
+_async_clients = weakref.WeakKeyDictionary()
+
+
+class LatencyHistogram:
+    """응답 시간(ms) 누적 히스토그램, 버킷 경계는 OAUTH_LATENCY_BUCKETS"""
+
+    def __init__(self, provider):
+        self.provider = provider
+
+    def _key(self, bucket):
+        return LATENCY_KEY.format(provider=self.provider, bucket=bucket)
+
+    def _incr(self, key, delta=1):
+        try:
+            cache.incr(key, delta)
+        except ValueError:
+            # 키가 없으면 만든다 (동시에 만들었으면 add 가 실패하므로 다시 더한다)
+            if not cache.add(key, delta, timeout=None):
+                cache.incr(key, delta)
+
+    def observe(self, seconds):
+        elapsed_ms = seconds * 1000
+        bucket = next(
+            (
+                str(bound)
+                for bound in settings.OAUTH_LATENCY_BUCKETS
+                if elapsed_ms <= bound
+            ),
+            "inf",
+        )
+        self._incr(self._key(bucket))
+        self._incr(self._key("count"))
+        self._incr(self._key("sum_ms"), round(elapsed_ms))
+
+    async def aobserve(self, seconds):
+        # 캐시 호출이 이벤트 루프를 막지 않도록 스레드에서 실행
+        await sync_to_async(self.observe, thread_sensitive=False)(seconds)
+
+    def snapshot(self):
+        buckets = [str(bound) for bound in settings.OAUTH_LATENCY_BUCKETS] + ["inf"]
+        values = cache.get_many(
+            [self._key(bucket) for bucket in buckets + ["count", "sum_ms"]]
+        )
+        return {
+            "count": values.get(self._key("count"), 0),
+            "sum_ms": values.get(self._key("sum_ms"), 0),
+            "buckets": {bucket: values.get(self._key(bucket), 0) for bucket in buckets},
+        }
+
+
+class ProviderClient:
+    def __init__(self, provider):
+        self.provider = provider
+        self.histogram = LatencyHistogram(provider)
+        self.session = requests.Session()
+        retry = Retry(
+            total=settings.OAUTH_HTTP_RETRIES,
+            connect=settings.OAUTH_HTTP_RETRIES,
+            # 요청이 이미 전달됐을 수 있으므로(인가 코드는 1회용) 읽기 실패는 재시도하지 않는다
+            read=False,
+            status=settings.OAUTH_HTTP_RETRIES,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=RETRY_STATUS_METHODS,
+            backoff_factor=settings.OAUTH_HTTP_RETRY_BACKOFF,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=settings.OAUTH_HTTP_POOL_SIZE,
+            max_retries=retry,
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault(
+            "timeout",
+            (settings.OAUTH_HTTP_CONNECT_TIMEOUT, settings.OAUTH_HTTP_READ_TIMEOUT),
+        )
+        started = time.perf_counter()
+        try:
+            return self.session.request(method, url, **kwargs)
+        finally:
+            # 실패(timeout 등)도 걸린 시간만큼 기록한다
+            self.histogram.observe(time.perf_counter() - started)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+
+def get_provider_client(provider):
+    """provider 별 클라이언트(커넥션 풀)를 프로세스에서 하나만 만든다"""
+    client = _clients.get(provider)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(provider)
+            if client is None:
+                client = _clients[provider] = ProviderClient(provider)
+    return client
+
+
+class AsyncProviderClient:
+    """
+    httpx 커넥션 풀은 요청이 오갈 때마다 풀의 모든 커넥션을 여러 번 훑으므로(커넥션 수의
+    제곱) 풀이 커지면 이벤트 루프가 풀 관리에 묶인다. OAUTH_HTTP_ASYNC_POOL_SIZE 개의
+    커넥션을 OAUTH_HTTP_ASYNC_SHARD_SIZE 크기의 풀 여러 개로 나누고, 요청은 가장 한가한
+    풀로 보낸다. 풀 크기를 넘는 요청은 httpx 대기열 대신 semaphore 에서 기다린다.
+    """
+
+    def __init__(self, provider):
+        self.provider = provider
+        self.histogram = LatencyHistogram(provider)
+        pool_size = settings.OAUTH_HTTP_ASYNC_POOL_SIZE
+        shard_size = min(settings.OAUTH_HTTP_ASYNC_SHARD_SIZE, pool_size)
+        self.clients = [
+            self._create_client(min(shard_size, pool_size - start))
+            for start in range(0, pool_size, shard_size)
+        ]
+        self.in_flight = [0] * len(self.clients)
+        self.slots = asyncio.Semaphore(pool_size)
+
+    def _create_client(self, max_connections):
+        # 연결 실패만 transport 에서 재시도한다 (읽기 실패는 다시 보내지 않음)
+        transport = httpx.AsyncHTTPTransport(
+            retries=settings.OAUTH_HTTP_RETRIES,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+        return httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(
+                settings.OAUTH_HTTP_READ_TIMEOUT,
+                connect=settings.OAUTH_HTTP_CONNECT_TIMEOUT,
+            ),
+        )
+
+    async def _send(self, method, url, **kwargs):
+        async with self.slots:
+            # 전체 semaphore 가 풀 크기 합과 같으므로 가장 한가한 풀에는 항상 빈 커넥션이 있다
+            index = min(range(len(self.clients)), key=self.in_flight.__getitem__)
+            self.in_flight[index] += 1
+            try:
+                return await self.clients[index].request(method, url, **kwargs)
+            finally:
+                self.in_flight[index] -= 1
+
+    async def request(self, method, url, **kwargs):
+        started = time.perf_counter()
+        try:
+            retries = settings.OAUTH_HTTP_RETRIES
+            for attempt in range(retries + 1):
+                response = await self._send(method, url, **kwargs)
+                if (
+                    method not in RETRY_STATUS_METHODS
+                    or response.status_code not in RETRY_STATUSES
+                    or attempt == retries
+                ):
+                    return response
+                await asyncio.sleep(settings.OAUTH_HTTP_RETRY_BACKOFF * 2**attempt)
+        finally:
+            await self.histogram.aobserve(time.perf_counter() - started)
+
+    async def get(self, url, **kwargs):
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        return await self.request("POST", url, **kwargs)
+
+    async def aclose(self):
+        for client in self.clients:
+            await client.aclose()
+
+
+def get_async_provider_client(provider):
+    """현재 이벤트 루프에서 provider 별 비동기 클라이언트를 하나만 만든다"""
+    clients = _async_clients.setdefault(asyncio.get_running_loop(), {})
+    client = clients.get(provider)
+    if client is None:
+        client = clients[provider] = AsyncProviderClient(provider)
+    return client
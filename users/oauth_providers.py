@@ -0,0 +1,186 @@
+"""
+소셜 로그인 provider 정보와 사용자 정보 캐시.
+
+provider 정보(클라이언트 키, API 주소, 필드 이름)는 앱 시작 시 settings 에서 한 번
+만들어 두고, 설정이 바뀌면(override_settings 등) 다시 만든다.
+같은 access token 으로 다시 로그인하면 짧은 시간 동안 캐시된 사용자 정보를 쓴다.
+캐시 키에는 토큰 대신 SHA-256 해시를 넣는다.
+구글은 토큰 응답의 ID 토큰을 캐시된 JWKS 로 직접 검증해 사용자 정보 API 호출을 생략한다.
+서명(RS256, cryptography)과 클레임은 PyJWT 로 검증한다.
+"""
+
+import functools
+import hashlib
+import time
+
+import jwt
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from .oauth_client import get_async_provider_client, get_provider_client
+
+USERINFO_KEY = "oauth_userinfo:{provider}:{token_hash}"
+JWKS_KEY = "oauth_jwks:{provider}"
+
+GOOGLE_ISSUERS = ["accounts.google.com", "https://accounts.google.com"]
+
+
+@functools.lru_cache(maxsize=None)
+def get_providers():
+    """provider 이름별 정보, 프로세스에서 한 번만 만든다"""
+    endpoints = settings.OAUTH_PROVIDER_ENDPOINTS
+    return {
+        "kakao": {
+            "name": "카카오",
+            "callback_url": settings.KAKAO_CALLBACK_URL,
+            "client_id": settings.KAKAO_CLIENT_ID,
+            "client_secret": settings.KAKAO_CLIENT_SECRET,
+            "email_field": "email",
+            "nickname_field": "nickname",
+            "profile_image_field": "profile_image_url",
+            "authorization_url": "https://kauth.kakao.com/oauth/authorize?response_type=code",
+            **endpoints.get("kakao", {}),
+        },
+        "google": {
+            "name": "구글",
+            "callback_url": settings.GOOGLE_CALLBACK_URL,
+            "client_id": settings.GOOGLE_CLIENT_ID,
+            "client_secret": settings.GOOGLE_CLIENT_SECRET,
+            "email_field": "email",
+            "nickname_field": "name",
+            "profile_image_field": "picture",
+            "authorization_url": "https://accounts.google.com/o/oauth2/v2/auth",
+            **endpoints.get("google", {}),
+        },
+        "naver": {
+            "name": "네이버",
+            "callback_url": settings.NAVER_CALLBACK_URL,
+            "client_id": settings.NAVER_CLIENT_ID,
+            "client_secret": settings.NAVER_CLIENT_SECRET,
+            "email_field": "email",
+            "nickname_field": "nickname",
+            "profile_image_field": "profile_image",
+            "authorization_url": "https://nid.naver.com/oauth2.0/authorize?response_type=code",
+            **endpoints.get("naver", {}),
+        },
+    }
+
+
+def get_provider(provider):
+    """provider 정보, 지원하지 않는 provider 면 None"""
+    return get_providers().get(provider)
+
+
+@receiver(setting_changed)
+def reset_providers(*, setting, **kwargs):
+    if setting.startswith(("OAUTH_", "KAKAO_", "GOOGLE_", "NAVER_")):
+        get_providers.cache_clear()
+
+
+# 사용자 정보 캐시
+
+
+def userinfo_cache_key(provider, access_token):
+    token_hash = hashlib.sha256(access_token.encode()).hexdigest()
+    return USERINFO_KEY.format(provider=provider, token_hash=token_hash)
+
+
+def get_cached_userinfo(provider, access_token):
+    return cache.get(userinfo_cache_key(provider, access_token))
+
+
+def set_cached_userinfo(provider, access_token, user_info):
+    cache.set(
+        userinfo_cache_key(provider, access_token),
+        user_info,
+        timeout=settings.OAUTH_USERINFO_CACHE_TIMEOUT,
+    )
+
+
+async def aget_cached_userinfo(provider, access_token):
+    return await cache.aget(userinfo_cache_key(provider, access_token))
+
+
+async def aset_cached_userinfo(provider, access_token, user_info):
+    await cache.aset(
+        userinfo_cache_key(provider, access_token),
+        user_info,
+        timeout=settings.OAUTH_USERINFO_CACHE_TIMEOUT,
+    )
+
+
+# 구글 ID 토큰
+
+
+def find_jwk(jwks, kid):
+    return next((key for key in jwks["keys"] if key.get("kid") == kid), None)
+
+
+def decode_google_id_token(id_token, jwks):
+    """
+    서명과 클레임(iss, aud, exp)을 확인한 ID 토큰 payload, 실패하거나 이메일이 인증되지
+    않았으면 jwt.InvalidTokenError
+    """
+    jwk = find_jwk(jwks, jwt.get_unverified_header(id_token).get("kid"))
+    if jwk is None:
+        raise jwt.InvalidKeyError("JWKS 에 없는 kid")
+
+    claims = jwt.decode(
+        id_token,
+        jwt.PyJWK(jwk, algorithm="RS256").key,
+        algorithms=["RS256"],
+        options={"require": ["exp", "iss", "aud"]},
+        audience=get_provider("google")["client_id"],
+        issuer=GOOGLE_ISSUERS,
+        leeway=settings.OAUTH_ID_TOKEN_LEEWAY,
+    )
+    if claims.get("email_verified") not in (True, "true"):
+        raise jwt.InvalidTokenError("인증되지 않은 이메일")
+    return claims
+
+
+def _jwks_is_stale(cached, kid):
+    # 모르는 kid 는 키 교체일 수 있으므로 다시 받되, 잘못된 토큰이 매번 다시 받게 하지 않는다
+    if cached is None:
+        return True
+    if find_jwk(cached["jwks"], kid) is not None:
+        return False
+    return time.time() - cached["fetched_at"] > settings.OAUTH_JWKS_MIN_REFRESH
+
+
+def _fetched_jwks(response):
+    response.raise_for_status()
+    return {"jwks": response.json(), "fetched_at": time.time()}
+
+
+def get_google_jwks(kid=None):
+    """캐시된 구글 JWKS, 없거나 kid 가 없으면(키 교체) 다시 받는다"""
+    key = JWKS_KEY.format(provider="google")
+    cached = cache.get(key)
+    if _jwks_is_stale(cached, kid):
+        url = get_provider("google")["jwks_url"]
+        cached = _fetched_jwks(get_provider_client("google").get(url))
+        cache.set(key, cached, timeout=settings.OAUTH_JWKS_CACHE_TIMEOUT)
+    return cached["jwks"]
+
+
+async def aget_google_jwks(kid=None):
+    key = JWKS_KEY.format(provider="google")
+    cached = await cache.aget(key)
+    if _jwks_is_stale(cached, kid):
+        url = get_provider("google")["jwks_url"]
+        cached = _fetched_jwks(await get_async_provider_client("google").get(url))
+        await cache.aset(key, cached, timeout=settings.OAUTH_JWKS_CACHE_TIMEOUT)
+    return cached["jwks"]
+
+
+def verify_google_id_token(id_token):
+    kid = jwt.get_unverified_header(id_token).get("kid")
+    return decode_google_id_token(id_token, get_google_jwks(kid))
+
+
+async def averify_google_id_token(id_token):
+    kid = jwt.get_unverified_header(id_token).get("kid")
+    return decode_google_id_token(id_token, await aget_google_jwks(kid))
@@ -2,7 +2,9 @@ from django.contrib.auth import get_user_model
 from django.core.validators import MaxLengthValidator, MinLengthValidator
 from rest_framework import serializers
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
-from rest_framework_simplejwt.tokens import RefreshToken, UntypedToken
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .tokens import RefreshToken
 
 User = get_user_model()
 
@@ -87,9 +89,8 @@ class TokenRefreshSerializer(serializers.Serializer):
         try:
             # 토큰 구조 검증
             UntypedToken(refresh_token)
-            # RefreshToken 인스턴스 생성 및 유효성 검증
+            # RefreshToken 인스턴스 생성 시 서명, 만료, 블랙리스트까지 검증
             refresh = RefreshToken(refresh_token)
-            refresh.verify()  # 서명 및 만료 검증
 
             # 새로운 액세스 토큰 생성
             new_access_token = str(refresh.access_token)
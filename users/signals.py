@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
+
+from common.cache import bump_versions
+
+from .authentication import invalidate_cached_user
+from .tokens import BLACKLIST_NAMESPACE
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def invalidate_user_snapshot(sender, instance, **kwargs):
+    # 프로필 수정, 탈퇴(is_active), 관리자 변경 모두 저장 시그널로 들어온다.
+    # 커밋된 뒤에 지워야 다른 요청이 커밋 전 값으로 다시 캐시하지 않는다
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk))
+
+
+@receiver(post_save, sender=BlacklistedToken)
+def sync_blacklist_filter(sender, **kwargs):
+    # 어느 경로로 블랙리스트에 올라가도 다른 프로세스의 Bloom filter 가 새 항목을 더한다
+    transaction.on_commit(lambda: bump_versions(BLACKLIST_NAMESPACE))
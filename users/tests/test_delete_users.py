@@ -0,0 +1,125 @@
+import datetime
+import io
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from bookmark.models import Bookmark
+from common.testing import create_webtoon
+from users import delete_users
+from users.delete_users import CHECKPOINT_NAME, delete_withdrawn_users
+from users.models import PurgeCheckpoint
+from webtoons.like_counter import like_webtoon
+from webtoons.models import WebtoonLikeShard
+
+User = get_user_model()
+
+
+@override_settings(WITHDRAWN_USER_PURGE_PAUSE=0)
+class DeleteWithdrawnUsersTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.webtoon = create_webtoon()
+        self.group = Group.objects.create(name="test")
+        long_ago = timezone.now() - datetime.timedelta(days=51)
+        recently = timezone.now() - datetime.timedelta(days=10)
+
+        self.withdrawn = [self.create_user(i, long_ago) for i in range(5)]
+        self.kept = [self.create_user(5, recently), self.create_user(6, None)]
+
+    def create_user(self, i, withdraw_at):
+        user = User.objects.create_user(
+            f"user{i}@example.com", nick_name=f"유저{i}", withdraw_at=withdraw_at
+        )
+        Bookmark.objects.create(user=user, webtoon=self.webtoon)
+        like_webtoon(user, self.webtoon.id)
+        RefreshToken.for_user(user).blacklist()
+        user.groups.add(self.group)
+        return user
+
+    def like_count(self):
+        return WebtoonLikeShard.objects.aggregate(total=Sum("count"))["total"]
+
+    def test_delete_in_chunks(self):
+        chunks = []
+        deleted = delete_withdrawn_users(
+            chunk_size=2, progress=lambda *args: chunks.append(args)
+        )
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(
+            chunks,
+            [
+                (2, self.withdrawn[1].id),
+                (4, self.withdrawn[3].id),
+                (5, self.withdrawn[4].id),
+            ],
+        )
+        self.assertQuerySetEqual(User.objects.order_by("id"), self.kept)
+        self.assertEqual(Bookmark.objects.count(), 2)
+        self.assertEqual(self.like_count(), 2)
+        self.assertEqual(OutstandingToken.objects.count(), 2)
+        self.assertEqual(BlacklistedToken.objects.count(), 2)
+        self.assertEqual(self.group.user_set.count(), 2)
+        self.assertFalse(PurgeCheckpoint.objects.exists())
+
+        # 사용자를 참조하는 모든 관계에서 지운 사용자의 행이 남지 않는다
+        user_ids = [user.id for user in self.withdrawn]
+        for relation in User._meta.related_objects:
+            rows = relation.related_model._base_manager.filter(
+                **{f"{relation.field.name}__in": user_ids}
+            )
+            self.assertFalse(rows.exists(), relation.related_model._meta.label)
+
+    def test_delete_without_loading_rows(self):
+        user_ids = [user.id for user in self.withdrawn]
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(delete_users.purge_users(user_ids), 5)
+        # 읽는 것은 웹툰별 좋아요 수와 토큰 id 뿐, 나머지는 조건 DELETE
+        selects = [q["sql"] for q in queries if q["sql"].startswith("SELECT")]
+        self.assertEqual(len(selects), 2)
+        self.assertIn("COUNT", selects[0])
+
+    def test_resume_after_failure(self):
+        def fail(deleted, last_id):
+            raise RuntimeError
+
+        with self.assertRaises(RuntimeError):
+            delete_withdrawn_users(chunk_size=2, progress=fail)
+        checkpoint = PurgeCheckpoint.objects.get(name=CHECKPOINT_NAME)
+        self.assertEqual(checkpoint.last_id, self.withdrawn[1].id)
+
+        # 커밋된 첫 청크 다음 id 부터 이어서 지운다
+        out = io.StringIO()
+        call_command("delete_withdrawn_users", "--chunk-size=2", stdout=out)
+        self.assertIn(f"2명 삭제 (id {self.withdrawn[3].id} 까지)", out.getvalue())
+        self.assertIn("(3명)", out.getvalue())
+        self.assertQuerySetEqual(User.objects.order_by("id"), self.kept)
+
+    def test_unhandled_relation(self):
+        # CASCADE 가 아닌 관계(OutstandingToken 은 SET_NULL)는 처리 방법이 없으면 지우지 않는다
+        handlers = {
+            label: handler
+            for label, handler in delete_users.RELATION_HANDLERS.items()
+            if label != "token_blacklist.OutstandingToken"
+        }
+        with mock.patch.object(delete_users, "RELATION_HANDLERS", handlers):
+            with self.assertRaisesMessage(
+                ImproperlyConfigured, "token_blacklist.OutstandingToken"
+            ):
+                delete_withdrawn_users()
+        self.assertEqual(User.objects.count(), 7)
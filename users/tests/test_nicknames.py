@@ -0,0 +1,42 @@
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+
+from users.models import NicknameSequence
+from users.nicknames import NicknameAllocator, NicknameSpace
+from users.utils import FIRST_NAMES, LAST_NAMES
+
+User = get_user_model()
+
+
+@override_settings(NICKNAME_BLOCK_SIZE=10)
+class NicknameAllocatorTestCase(TestCase):
+    def test_space_covers_every_combination_once(self):
+        space = NicknameSpace(FIRST_NAMES, LAST_NAMES)
+        names = {space.name(number) for number in range(space.size)}
+        # 중복 단어를 뺀 조합 수만큼 서로 다른 이름
+        self.assertEqual(len(names), len(set(FIRST_NAMES)) * len(set(LAST_NAMES)))
+        self.assertEqual(space.name(space.size), f"{space.name(0)} 2")
+
+    def test_allocate_unique_with_suffix(self):
+        allocator = NicknameAllocator("test", NicknameSpace(["a", "b"], ["c", "d"]))
+        names = [allocator.allocate() for _ in range(25)]
+
+        self.assertEqual(len(set(names)), 25)
+        self.assertTrue(names[-1].endswith(" 7"))  # 4개 조합을 6번 돌고 7회차
+        # 블록(10개) 단위로 예약
+        self.assertEqual(NicknameSequence.objects.get(name="test").next_value, 30)
+
+    def test_skip_names_in_use(self):
+        space = NicknameSpace(["a", "b"], ["c", "d"])
+        User.objects.create_user("taken@example.com", nick_name=space.name(0))
+
+        allocator = NicknameAllocator("test", space)
+        self.assertEqual(allocator.allocate(), space.name(1))
+
+    def test_blocks_shared_between_allocators(self):
+        # 프로세스마다 allocator 가 따로 있어도 블록이 겹치지 않는다
+        space = NicknameSpace(["a", "b"], ["c", "d"])
+        first = NicknameAllocator("test", space)
+        second = NicknameAllocator("test", space)
+        names = [allocator.allocate() for allocator in (first, second) * 15]
+        self.assertEqual(len(set(names)), 30)
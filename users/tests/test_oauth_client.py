@@ -0,0 +1,118 @@
+import time
+from unittest import mock
+
+import requests
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from urllib3.util.retry import Retry
+
+from common.testing import StubHandler, start_stub_server
+from users.oauth_client import AsyncProviderClient, ProviderClient
+
+
+class ProviderStubHandler(StubHandler):
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == "/slow":
+            time.sleep(0.5)
+        if self.path == "/flaky" and self.server.requests.count("/flaky") <= 2:
+            self.reply({"error": "unavailable"}, status=503)
+            return
+        self.reply({"access_token": "token"})
+
+    def do_POST(self):
+        self.read_form()
+        self.server.requests.append(self.path)
+        self.reply({"error": "unavailable"}, status=503)
+
+
+@override_settings(
+    OAUTH_HTTP_CONNECT_TIMEOUT=1,
+    OAUTH_HTTP_READ_TIMEOUT=0.2,
+    OAUTH_HTTP_RETRIES=2,
+    OAUTH_HTTP_RETRY_BACKOFF=0,
+)
+class ProviderClientTestCase(SimpleTestCase):
+    """로컬 stub 서버로 커넥션 재사용, timeout, 재시도, 응답 시간 히스토그램 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.server = start_stub_server(self, ProviderStubHandler)
+        self.server.connections = 0
+
+        self.client = ProviderClient("kakao")
+        self.addCleanup(self.client.session.close)
+        self.base_url = self.server.base_url
+
+    def test_connection_reused(self):
+        for _ in range(3):
+            response = self.client.get(f"{self.base_url}/token")
+            self.assertEqual(response.json(), {"access_token": "token"})
+        self.assertEqual(self.server.connections, 1)
+
+    def test_read_timeout_not_retried(self):
+        started = time.perf_counter()
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.client.get(f"{self.base_url}/slow")
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(self.server.requests, ["/slow"])
+
+    def test_retry_on_unavailable(self):
+        response = self.client.get(f"{self.base_url}/flaky")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, ["/flaky"] * 3)
+
+    def test_post_not_retried_on_status(self):
+        # 인가 코드는 1회용이므로 provider 가 처리했을 수 있는 POST 는 다시 보내지 않는다
+        response = self.client.post(f"{self.base_url}/token", data={"code": "a"})
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.server.requests, ["/token"])
+
+    def test_post_retried_on_connect_error(self):
+        # 연결하지 못했으면 요청이 전달되지 않았으므로 POST 도 다시 시도한다
+        self.server.shutdown()
+        self.server.server_close()
+        with mock.patch.object(
+            Retry, "increment", autospec=True, side_effect=Retry.increment
+        ) as increment:
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.client.post(f"{self.base_url}/token", data={"code": "a"})
+        self.assertEqual(increment.call_count, 3)
+
+    @override_settings(OAUTH_LATENCY_BUCKETS=[100, 1000])
+    def test_latency_histogram(self):
+        self.client.get(f"{self.base_url}/token")
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.client.get(f"{self.base_url}/slow")
+
+        snapshot = self.client.histogram.snapshot()
+        self.assertEqual(snapshot["count"], 2)
+        self.assertEqual(snapshot["buckets"], {"100": 1, "1000": 1, "inf": 0})
+
+    @override_settings(OAUTH_HTTP_ASYNC_POOL_SIZE=5, OAUTH_HTTP_ASYNC_SHARD_SIZE=2)
+    async def test_async_client(self):
+        client = AsyncProviderClient("kakao")
+        # 5개 커넥션을 2, 2, 1 개짜리 풀로 나눈다
+        self.assertEqual(len(client.clients), 3)
+
+        try:
+            response = await client.get(f"{self.base_url}/flaky")
+        finally:
+            await client.aclose()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.requests, ["/flaky"] * 3)
+        self.assertEqual(client.in_flight, [0, 0, 0])
+        self.assertEqual(client.histogram.snapshot()["count"], 1)
+
+    async def test_async_post_not_retried_on_status(self):
+        client = AsyncProviderClient("kakao")
+        try:
+            response = await client.post(f"{self.base_url}/token", data={"code": "a"})
+        finally:
+            await client.aclose()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.server.requests, ["/token"])
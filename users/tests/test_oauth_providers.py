@@ -0,0 +1,188 @@
+import hashlib
+import json
+import time
+
+import jwt
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from common.testing import StubHandler, start_stub_server
+from users.oauth_providers import decode_google_id_token, get_provider
+from users.views import SocialLoginView
+
+# 테스트 전용 1024bit RSA 키
+TEST_N = int(
+    "e2992ab7e5cd5396af376d18f513ba3b8fd68d72c4838696ea29d1a125e0fe04d1577a3a4f71600f"
+    "ca681daea0b066d89862a6c92ec4c4216295ecedb4486a97fe04cc7607cff68f52e5a03ebb662254"
+    "6585ff1e488f19dc312fc394e1063461ae1a1152e23fd5b2ebaf7a91331dadfbf033090973a8f44c"
+    "4f1e2dfa56bd0f67",
+    16,
+)
+TEST_D = int(
+    "13791632b78ceda2056cbdf3671c4ae4d3779cb040330d5deac1ad422bff29d540284458be7affc6"
+    "5b9e96ee6ae0bdf5df229b32aed23a08a4703dec2f920996dcd7b3ae5072d610be7a8d723c517b3c"
+    "9d683f64305aaac10810b5476610f63c2730d5b59e6880c40d10efbbf23c18c5e99a90bb8e27ed4c"
+    "edf494b730d7b001",
+    16,
+)
+JWKS = {
+    "keys": [
+        {
+            "kty": "RSA",
+            "alg": "RS256",
+            "use": "sig",
+            "kid": "test-key",
+            "n": jwt.utils.base64url_encode(TEST_N.to_bytes(128, "big")).decode(),
+            "e": "AQAB",
+        }
+    ]
+}
+
+
+def sign_id_token(claims, kid="test-key"):
+    """PKCS#1 v1.5 + SHA-256 으로 서명한 ID 토큰"""
+    header = {"alg": "RS256", "kid": kid, "typ": "JWT"}
+    signing_input = b".".join(
+        jwt.utils.base64url_encode(json.dumps(part).encode())
+        for part in (header, claims)
+    )
+    digest_info = (
+        bytes.fromhex("3031300d060960864801650304020105000420")
+        + hashlib.sha256(signing_input).digest()
+    )
+    encoded = b"\x00\x01" + b"\xff" * (128 - len(digest_info) - 3) + b"\x00"
+    signature = pow(int.from_bytes(encoded + digest_info, "big"), TEST_D, TEST_N)
+    return (
+        signing_input
+        + b"."
+        + jwt.utils.base64url_encode(signature.to_bytes(128, "big"))
+    ).decode()
+
+
+def google_claims(code, **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": "https://accounts.google.com",
+        "aud": "google-client",
+        "iat": now,
+        "exp": now + 300,
+        "email": f"{code}@example.com",
+        "email_verified": True,
+        "name": f"user-{code}",
+    }
+    claims.update(overrides)
+    return claims
+
+
+class GoogleStubHandler(StubHandler):
+    def do_POST(self):
+        self.server.requests.append(self.path)
+        code = self.read_form()["code"]
+        id_token = sign_id_token(google_claims(code))
+        if code == "tampered":
+            header, payload, signature = id_token.split(".")
+            forged = google_claims("admin")
+            payload = jwt.utils.base64url_encode(json.dumps(forged).encode()).decode()
+            id_token = ".".join([header, payload, signature])
+        self.reply({"access_token": f"token-{code}", "id_token": id_token})
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.path == "/certs":
+            self.reply(JWKS)
+        else:
+            self.reply({"email": "userinfo@example.com", "name": "userinfo"})
+
+
+class GoogleIdTokenTestCase(TestCase):
+    """ID 토큰 검증, JWKS/사용자 정보 캐시로 provider 호출이 줄어드는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.server = start_stub_server(self, GoogleStubHandler)
+        base_url = self.server.base_url
+        overrides = override_settings(
+            GOOGLE_CLIENT_ID="google-client",
+            OAUTH_PROVIDER_ENDPOINTS={
+                "google": {
+                    "token_url": f"{base_url}/token",
+                    "profile_url": f"{base_url}/me",
+                    "jwks_url": f"{base_url}/certs",
+                }
+            },
+        )
+        overrides.enable()
+        self.addCleanup(overrides.disable)
+
+    def login(self, code):
+        return self.client.post(
+            "/api/users/login/google/", {"code": code}, content_type="application/json"
+        )
+
+    def test_provider_registry(self):
+        provider = get_provider("google")
+        self.assertEqual(provider["client_id"], "google-client")
+        self.assertTrue(provider["jwks_url"].endswith("/certs"))
+        self.assertIs(get_provider("google"), provider)
+        self.assertIsNone(get_provider("unknown"))
+
+    def test_decode_id_token(self):
+        claims = decode_google_id_token(sign_id_token(google_claims("a")), JWKS)
+        self.assertEqual(claims["email"], "a@example.com")
+
+        with self.assertRaises(jwt.InvalidAudienceError):
+            decode_google_id_token(
+                sign_id_token(google_claims("a", aud="other-client")), JWKS
+            )
+        with self.assertRaises(jwt.ExpiredSignatureError):
+            decode_google_id_token(
+                sign_id_token(google_claims("a", exp=int(time.time()) - 600)), JWKS
+            )
+        with self.assertRaisesMessage(jwt.InvalidTokenError, "인증되지 않은 이메일"):
+            decode_google_id_token(
+                sign_id_token(google_claims("a", email_verified=False)), JWKS
+            )
+        with self.assertRaises(jwt.InvalidKeyError):
+            decode_google_id_token(
+                sign_id_token(google_claims("a"), kid="unknown"), JWKS
+            )
+        header, _, signature = sign_id_token(google_claims("a")).split(".")
+        forged = jwt.utils.base64url_encode(
+            json.dumps(google_claims("admin")).encode()
+        ).decode()
+        with self.assertRaises(jwt.InvalidSignatureError):
+            decode_google_id_token(".".join([header, forged, signature]), JWKS)
+
+    def test_login_skips_userinfo(self):
+        response = self.login("a")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"]["email"], "a@example.com")
+
+        # JWKS 는 캐시되므로 두 번째 로그인은 토큰 요청만 한다
+        self.assertEqual(self.login("b").status_code, 200)
+        self.assertEqual(self.server.requests, ["/token", "/certs", "/token"])
+
+    def test_invalid_id_token_uses_userinfo(self):
+        response = self.login("tampered")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"]["email"], "userinfo@example.com")
+        self.assertEqual(self.server.requests, ["/token", "/certs", "/me"])
+
+    def test_userinfo_cached_per_access_token(self):
+        view = SocialLoginView()
+        first = view.get_social_user_info("google", {"access_token": "same"})
+        second = view.get_social_user_info("google", {"access_token": "same"})
+        view.get_social_user_info("google", {"access_token": "other"})
+
+        self.assertEqual(first, second)
+        self.assertEqual(self.server.requests, ["/me", "/me"])
+
+    async def test_async_login_skips_userinfo(self):
+        response = await self.async_client.post(
+            "/api/users/login/google/async/",
+            {"code": "async"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["user"]["email"], "async@example.com")
+        self.assertEqual(self.server.requests, ["/token", "/certs"])
@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+
+from common.testing import StubHandler, start_stub_server
+
+User = get_user_model()
+
+
+class KakaoStubHandler(StubHandler):
+    """인가 코드 "bad" 는 거절하고, 나머지는 코드별 사용자 정보를 돌려주는 카카오 대역"""
+
+    def do_POST(self):
+        code = self.read_form()["code"]
+        if code == "bad":
+            self.reply({"error": "invalid_grant"}, status=401)
+            return
+        self.reply({"access_token": f"token-{code}"})
+
+    def do_GET(self):
+        code = self.headers["Authorization"].removeprefix("Bearer token-")
+        self.reply(
+            {
+                "kakao_account": {"email": f"{code}@example.com"},
+                "properties": {
+                    "nick_name": f"user-{code}",
+                    "profile_image": f"https://example.com/{code}.png",
+                },
+            }
+        )
+
+
+class SocialLoginTestCase(TestCase):
+    """동기 뷰와 ASGI 뷰가 stub provider 로 같은 결과를 내는지 확인"""
+
+    def setUp(self):
+        cache.clear()
+        base_url = start_stub_server(self, KakaoStubHandler).base_url
+        endpoints = override_settings(
+            OAUTH_PROVIDER_ENDPOINTS={
+                "kakao": {
+                    "token_url": f"{base_url}/token",
+                    "profile_url": f"{base_url}/me",
+                }
+            },
+            OAUTH_HTTP_RETRY_BACKOFF=0,
+        )
+        endpoints.enable()
+        self.addCleanup(endpoints.disable)
+
+    def test_sync_login(self):
+        response = self.client.post(
+            "/api/users/login/kakao/", {"code": "sync"}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["user"]["email"], "sync@example.com")
+        self.assertEqual(data["user"]["profile_image"], "https://example.com/sync.png")
+        self.assertTrue(User.objects.filter(email="sync@example.com").exists())
+
+    async def test_async_login(self):
+        response = await self.async_client.post(
+            "/api/users/login/kakao/async/",
+            {"code": "async"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        user = await User.objects.aget(email="async@example.com", provider="kakao")
+        self.assertEqual(data["user"]["id"], user.id)
+        self.assertEqual(data["user"]["nick_name"], "user-async")
+        self.assertTrue(data["access_token"])
+
+        # 두 번째 로그인은 같은 사용자
+        response = await self.async_client.post(
+            "/api/users/login/kakao/async/",
+            {"code": "async"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["user"]["id"], user.id)
+        self.assertEqual(await User.objects.acount(), 1)
+
+    async def test_async_login_rejected(self):
+        response = await self.async_client.post(
+            "/api/users/login/kakao/async/",
+            {"code": "bad"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {"error": "Failed to retrieve access token"})
+
+        response = await self.async_client.post(
+            "/api/users/login/unknown/async/",
+            {"code": "code"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(await User.objects.acount(), 0)
@@ -0,0 +1,115 @@
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from common.cache import bump_versions
+from users.tokens import (
+    BLACKLIST_NAMESPACE,
+    BloomFilter,
+    RefreshToken,
+    blacklist_filter,
+)
+
+User = get_user_model()
+
+
+class BloomFilterTestCase(TestCase):
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"jti-{i}")
+
+        self.assertTrue(all(f"jti-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"other-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+class RefreshTokenBlacklistTestCase(TestCase):
+    def setUp(self):
+        cache.clear()
+        blacklist_filter.reset()
+        self.addCleanup(blacklist_filter.reset)
+        self.user = User.objects.create_user("user@example.com", nick_name="유저")
+
+    def refresh(self, token):
+        return self.client.post(
+            "/api/users/token/refresh/",
+            {"refresh": str(token)},
+            content_type="application/json",
+        )
+
+    def blacklist_queries(self, func):
+        with CaptureQueriesContext(connection) as queries:
+            func()
+        return [
+            query for query in queries if "blacklistedtoken" in query["sql"].lower()
+        ]
+
+    def test_refresh_skips_blacklist_query(self):
+        token = RefreshToken.for_user(self.user)
+        self.refresh(token)  # 첫 확인에서 filter 를 만든다
+
+        queries = self.blacklist_queries(
+            lambda: self.assertEqual(self.refresh(token).status_code, 200)
+        )
+        self.assertEqual(queries, [])
+
+    def test_logout_revokes_token(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                "/api/users/me/logout/",
+                {"refresh_token": str(token)},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_blacklist_from_other_process(self):
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+
+        # 다른 프로세스가 블랙리스트에 올리고 버전만 올린 경우
+        tokens.RefreshToken(str(token)).blacklist()
+        bump_versions(BLACKLIST_NAMESPACE)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_blacklist_outside_subclass(self):
+        # 관리자나 simplejwt 의 RefreshToken 으로 올려도 커밋 후 filter 에 반영된다
+        token = RefreshToken.for_user(self.user)
+        self.assertEqual(self.refresh(token).status_code, 200)
+
+        outstanding = OutstandingToken.objects.get(jti=token["jti"])
+        with self.captureOnCommitCallbacks(execute=True):
+            BlacklistedToken.objects.create(token=outstanding)
+        self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_compact_expired_tokens(self):
+        expired = timezone.now() - datetime.timedelta(days=1)
+        for i in range(5):
+            token = OutstandingToken.objects.create(
+                jti=f"expired-{i}", token="token", expires_at=expired
+            )
+            BlacklistedToken.objects.create(token=token)
+        RefreshToken.for_user(self.user).blacklist()
+
+        out = io.StringIO()
+        call_command("compact_token_blacklist", "--batch-size=2", stdout=out)
+
+        self.assertIn("5개", out.getvalue())
+        self.assertEqual(OutstandingToken.objects.count(), 1)
+        self.assertEqual(BlacklistedToken.objects.count(), 1)
@@ -0,0 +1,152 @@
+"""
+리프레시 토큰 블랙리스트 확인.
+
+simplejwt 는 리프레시 토큰을 검증할 때마다 BlacklistedToken 을 조회한다. 프로세스마다
+블랙리스트 jti 의 Bloom filter 를 두고, filter 에 없는 토큰(대부분)은 조회 없이 통과시킨다.
+filter 에 있다고 나오면(실제 블랙리스트 또는 false positive) DB 로 확인한다.
+
+BlacklistedToken 이 저장되면(로그아웃, 관리자, simplejwt 의 blacklist 뷰 등 경로와 관계없이)
+users.signals 가 커밋 후 캐시의 "token_blacklist" 버전을 올리고, 다른 프로세스는 다음 확인 때
+버전이 바뀐 것을 보고 최근 블랙리스트만 filter 에 더한다. 만료된 토큰은 filter 에 넣지
+않으며(만료 검증에서 거절됨), 지워진 항목을 반영하도록 filter 는 주기적으로 다시 만든다.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.token_blacklist.models import (
+    BlacklistedToken,
+    OutstandingToken,
+)
+
+from common.cache import get_versions
+from common.db import delete_ids
+
+BLACKLIST_NAMESPACE = "token_blacklist"
+
+
+class BloomFilter:
+    """false positive 는 있어도 false negative 는 없는 문자열 집합"""
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(64, round(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, value):
+        # 해시 두 개로 k 개의 위치를 만든다 (Kirsch-Mitzenmacher)
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "big")
+        second = int.from_bytes(digest[8:], "big") | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, value):
+        for position in self._positions(value):
+            self.bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+
+class BlacklistFilter:
+    """프로세스별 블랙리스트 Bloom filter, 캐시 버전이 바뀌면 최근 항목을 더한다"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.filter = None
+
+    def _rebuild(self, version):
+        now = timezone.now()
+        jtis = list(
+            BlacklistedToken.objects.filter(token__expires_at__gt=now).values_list(
+                "token__jti", flat=True
+            )
+        )
+        # 늘어날 여유를 두고 만들고, 가득 차면 다시 만든다
+        capacity = max(settings.TOKEN_BLACKLIST_FILTER_CAPACITY, len(jtis) * 2)
+        self.filter = BloomFilter(capacity, settings.TOKEN_BLACKLIST_FILTER_ERROR_RATE)
+        for jti in jtis:
+            self.filter.add(jti)
+        self.version, self.synced_at, self.built_at = version, now, time.monotonic()
+
+    def _sync(self, version):
+        # 블랙리스트 시각은 커밋 전에 정해지므로 여유를 두고 겹치게 읽는다
+        now = timezone.now()
+        margin = timedelta(seconds=settings.TOKEN_BLACKLIST_SYNC_MARGIN)
+        jtis = BlacklistedToken.objects.filter(
+            blacklisted_at__gte=self.synced_at - margin
+        ).values_list("token__jti", flat=True)
+        for jti in jtis:
+            self.filter.add(jti)
+        self.version, self.synced_at = version, now
+
+    def might_contain(self, jti):
+        (version,) = get_versions([BLACKLIST_NAMESPACE])
+        with self.lock:
+            if (
+                self.filter is None
+                or self.filter.count > self.filter.capacity
+                or time.monotonic() - self.built_at
+                > settings.TOKEN_BLACKLIST_FILTER_REBUILD_INTERVAL
+            ):
+                self._rebuild(version)
+            elif version != self.version:
+                self._sync(version)
+            return jti in self.filter
+
+    def reset(self):
+        with self.lock:
+            self.filter = None
+
+
+blacklist_filter = BlacklistFilter()
+
+
+class RefreshToken(tokens.RefreshToken):
+    """블랙리스트 확인 앞에 Bloom filter 를 둔 RefreshToken"""
+
+    def check_blacklist(self):
+        jti = self.payload[tokens.api_settings.JTI_CLAIM]
+        if blacklist_filter.might_contain(jti):
+            super().check_blacklist()
+
+
+def compact_token_blacklist(batch_size=None, pause=None):
+    """
+    만료된 토큰(블랙리스트 포함)을 batch_size 개씩 지우고 지운 토큰 수를 반환.
+    만료된 토큰은 블랙리스트와 관계없이 검증에서 거절되므로 지워도 된다.
+    """
+    batch_size = batch_size or settings.TOKEN_BLACKLIST_COMPACTION_BATCH_SIZE
+    pause = settings.TOKEN_BLACKLIST_COMPACTION_PAUSE if pause is None else pause
+    now = timezone.now()
+
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            token_ids = list(
+                OutstandingToken.objects.filter(expires_at__lte=now)
+                .order_by("id")
+                .values_list("id", flat=True)[:batch_size]
+            )
+            if not token_ids:
+                break
+            BlacklistedToken.objects.filter(token_id__in=token_ids).delete()
+            # 블랙리스트를 먼저 지웠으므로 Collector 로 토큰 행을 읽지 않는다
+            deleted += delete_ids(OutstandingToken, token_ids)
+        if len(token_ids) < batch_size:
+            break
+        time.sleep(pause)
+    return deleted
@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    AsyncSocialLoginView,
     LogoutView,
     SocialLoginView,
     TokenRefreshView,
@@ -11,6 +12,11 @@ from .views import (
 urlpatterns = [
     # Social Login URLs
     path("login/<str:provider>/", SocialLoginView.as_view(), name="social_login"),
+    path(
+        "login/<str:provider>/async/",
+        AsyncSocialLoginView.as_view(),
+        name="social_login_async",
+    ),
     # Token refresh URL (Access Token 갱신 API)
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     # User Management URLs
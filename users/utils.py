@@ -1,5 +1,7 @@
 import random
 
+from .nicknames import NicknameAllocator, NicknameSpace
+
 # from users.views import CustomUser
 
 
@@ -227,16 +229,17 @@ HIDDEN_NICKNAMES = [
 ]
 
 
-def RendomNickName():
-    """랜덤 닉네임 생성 함수: 98% 일반 닉네임, 2% 히든 닉네임."""
-    # 2% 확률로 히든 닉네임 생성
-    if random.random() < 0.02:
-        return (
-            random.choice(HIDDEN_NICKNAMES),
-            True,
-        )  # 히든 닉네임일 경우 is_hidden = True
+nickname_allocators = {
+    False: NicknameAllocator("regular", NicknameSpace(FIRST_NAMES, LAST_NAMES)),
+    True: NicknameAllocator("hidden", NicknameSpace(HIDDEN_NICKNAMES)),
+}
+
+
+def is_hidden_nickname():
+    # 2% 확률로 히든 닉네임
+    return random.random() < 0.02
+
 
-    # 일반 닉네임 생성 (98%)
-    first_name = random.choice(FIRST_NAMES)
-    last_name = random.choice(LAST_NAMES)
-    return f"{first_name} {last_name}", False  # 일반 닉네임일 경우 is_hidden = False
+def allocate_nickname(is_hidden=False):
+    """아직 쓰이지 않은 랜덤 닉네임"""
+    return nickname_allocators[is_hidden].allocate()
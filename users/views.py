@@ -1,16 +1,22 @@
 import datetime
+import functools
+import json
 import logging
 import uuid
 
 import boto3
-import requests
+from asgiref.sync import sync_to_async
 from botocore.exceptions import ClientError
 from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.files.uploadedfile import InMemoryUploadedFile, UploadedFile
 from django.db import IntegrityError  # connection 제거
+from django.http import JsonResponse
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.decorators import method_decorator
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import generics, permissions, serializers, status
@@ -22,7 +28,7 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
 from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken
-from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+from rest_framework_simplejwt.tokens import AccessToken
 
 from ncp.views import upload_image_to_ncp
 from users.serializers import (
@@ -34,7 +40,18 @@ from users.serializers import (
 )
 
 from .img_utils import upload_file_to_s3
-from .utils import RendomNickName
+from .oauth_client import get_async_provider_client, get_provider_client
+from .oauth_providers import (
+    aget_cached_userinfo,
+    aset_cached_userinfo,
+    averify_google_id_token,
+    get_cached_userinfo,
+    get_provider,
+    set_cached_userinfo,
+    verify_google_id_token,
+)
+from .tokens import RefreshToken
+from .utils import allocate_nickname, is_hidden_nickname
 
 User = get_user_model()
 
@@ -42,7 +59,133 @@ User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
-class SocialLoginView(GenericAPIView):
+class SocialLoginMixin:
+    """동기/비동기 소셜 로그인 뷰가 함께 쓰는 provider 요청 구성과 응답 처리"""
+
+    def get_token_request(self, provider, auth_code):
+        # 인가 코드 → 토큰 요청의 (method, url, kwargs), 지원하지 않는 provider 면 None
+        provider_info = get_provider(provider)
+        if provider_info is None:
+            return None
+        url = provider_info["token_url"]
+        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+
+        if provider == "kakao":
+            data = {
+                "grant_type": "authorization_code",
+                "client_id": provider_info["client_id"],
+                "redirect_uri": provider_info["callback_url"],
+                "code": auth_code,
+                "client_secret": provider_info["client_secret"],
+            }
+            return "POST", url, {"data": data, "headers": headers}
+        elif provider == "naver":
+            params = {
+                "grant_type": "authorization_code",
+                "client_id": provider_info["client_id"],
+                "client_secret": provider_info["client_secret"],
+                "code": auth_code,
+                "state": "random_state_string",  # 보안 강화를 위해 사용
+            }
+            return "GET", url, {"params": params}
+        elif provider == "google":
+            data = {
+                "grant_type": "authorization_code",
+                "client_id": provider_info["client_id"],
+                "client_secret": provider_info["client_secret"],
+                "redirect_uri": provider_info["callback_url"],
+                "code": auth_code,
+            }
+            return "POST", url, {"data": data, "headers": headers}
+        return None
+
+    def get_profile_request(self, provider, access_token):
+        # access_token → 사용자 정보 요청의 (url, kwargs)
+        url = get_provider(provider)["profile_url"]
+        return url, {"headers": {"Authorization": f"Bearer {access_token}"}}
+
+    def parse_token_response(self, provider, response):
+        # access_token (구글은 id_token 포함) 이 담긴 토큰 응답
+        logger.debug(
+            f"{provider} access token response: {response.status_code} {response.text}"
+        )
+        if response.status_code == 200:
+            return response.json()
+        logger.error(
+            f"{provider} access token failed: {response.status_code} - {response.text}"
+        )
+        return None
+
+    def parse_social_user_info(self, provider, response):
+        logger.debug(f"{provider} API response: {response.status_code} {response.text}")
+        if response.status_code != 200:
+            return None
+
+        if provider == "kakao":
+            data = response.json()
+            return {
+                "email": data["kakao_account"].get("email"),
+                "nick_name": data["properties"].get("nick_name"),
+                "profile_image": data["properties"].get("profile_image"),
+            }
+        elif provider == "naver":
+            data = response.json()["response"]
+            return {
+                "email": data.get("email"),
+                "nick_name": data.get("nick_name"),
+                "profile_image": data.get("profile_image"),
+            }
+        elif provider == "google":
+            data = response.json()
+            return {
+                "email": data.get("email"),
+                "nick_name": data.get("name"),
+                "profile_image": data.get("picture"),
+            }
+        return None
+
+    def parse_id_token_claims(self, claims):
+        # 검증한 구글 ID 토큰 → 사용자 정보 (userinfo 응답과 같은 형식)
+        return {
+            "email": claims.get("email"),
+            "nick_name": claims.get("name"),
+            "profile_image": claims.get("picture"),
+        }
+
+    def get_user_defaults(self, user_info):
+        # 닉네임이 없는 경우 랜덤 닉네임 생성
+        nick_name = user_info.get("nick_name")
+        is_hidden = False
+        if not nick_name:  # 닉네임이 None 또는 빈 값이면
+            is_hidden = is_hidden_nickname()
+            # get_or_create 는 사용자를 새로 만들 때만 callable 을 호출하므로
+            # 이미 가입한 사용자의 로그인은 닉네임 순번을 쓰지 않는다
+            nick_name = functools.partial(allocate_nickname, is_hidden)
+        return {
+            "nick_name": nick_name,  # 닉네임 저장
+            "profile_img": user_info.get("profile_image"),
+            "is_hidden": is_hidden,  # 히든 여부 저장
+        }
+
+    def get_login_data(self, user):
+        # JWT 토큰 생성
+        token = RefreshToken.for_user(user)
+        return {
+            "access_token": str(token.access_token),
+            "refresh_token": str(token),
+            "user": {
+                "id": user.id,
+                "nick_name": user.nick_name,
+                "email": user.email,
+                # profile_img 는 URL 문자열
+                "profile_image": user.profile_img or "",
+                "provider": user.provider,
+                "is_hidden": user.is_hidden,
+            },
+        }
+
+
+class SocialLoginView(SocialLoginMixin, GenericAPIView):
     permission_classes = (permissions.AllowAny,)
     serializer_class = SocialLoginSerializer
 
@@ -76,16 +219,16 @@ class SocialLoginView(GenericAPIView):
         logger.debug(f"프론트에서 전달한 인가코드: {auth_code}")
 
         # 인가 코드를 access_token으로 변환
-        access_token = self.get_access_token(provider, auth_code)
-        if not access_token:
+        tokens = self.get_tokens(provider, auth_code)
+        if not tokens or not tokens.get("access_token"):
             return Response(
                 {"error": "Failed to retrieve access token"},
                 status=status.HTTP_400_BAD_REQUEST,
             )
-        logger.debug(f"소셜로그인 API로 받은 액세스토큰: {access_token}")
+        logger.debug(f"소셜로그인 API로 받은 액세스토큰: {tokens['access_token']}")
 
         # access_token을 사용하여 사용자 정보 가져오기
-        user_info = self.get_social_user_info(provider, access_token)
+        user_info = self.get_social_user_info(provider, tokens)
         if not user_info:
             return Response(
                 {"error": "Invalid social token"},
@@ -94,22 +237,12 @@ class SocialLoginView(GenericAPIView):
 
         logger.debug(f"액세스토큰 이용 사용자 정보: {user_info}")
 
-        # 닉네임이 없는 경우 랜덤 닉네임 생성
-        nick_name = user_info.get("nick_name")
-        is_hidden = False
-        if not nick_name:  # 닉네임이 None 또는 빈 값이면
-            nick_name, is_hidden = RendomNickName()  # 랜덤 닉네임과 히든 여부 반환
-
         # 사용자 정보로 DB 조회 및 저장
         try:
             user, created = User.objects.get_or_create(
                 email=user_info["email"],
                 provider=provider,
-                defaults={
-                    "nick_name": nick_name,  # 닉네임 저장
-                    "profile_img": user_info.get("profile_image"),
-                    "is_hidden": is_hidden,  # 히든 여부 저장
-                },
+                defaults=self.get_user_defaults(user_info),
             )
             #
             # # 닉네임 변경 시 기존 닉네임이 히든이면 is_hidden을 False로 변경
@@ -131,162 +264,148 @@ class SocialLoginView(GenericAPIView):
                 status=status.HTTP_400_BAD_REQUEST,  # 403 상태 코드 반환
             )
 
-        # JWT 토큰 생성
-        token = RefreshToken.for_user(user)
-
         # Access Token만 반환
-        return Response(
-            {
-                "access_token": str(token.access_token),
-                "refresh_token": str(token),
-                "user": {
-                    "id": user.id,
-                    "nick_name": user.nick_name,
-                    "email": user.email,
-                    "profile_image": user.profile_img.url if user.profile_img else "",
-                    "provider": user.provider,
-                    "is_hidden": user.is_hidden,
-                },
-            },
-            status=status.HTTP_200_OK,
-        )
+        return Response(self.get_login_data(user), status=status.HTTP_200_OK)
 
-    def get_access_token(self, provider, auth_code):
+    def get_tokens(self, provider, auth_code):
         # 인가 코드로 access token 요청
-        if provider == "kakao":
-            return self.get_kakao_access_token(auth_code)
-        elif provider == "naver":
-            return self.get_naver_access_token(auth_code)
-        elif provider == "google":
-            return self.get_google_access_token(auth_code)
+        token_request = self.get_token_request(provider, auth_code)
+        if token_request is None:
+            return None
+        method, url, kwargs = token_request
+        try:
+            response = get_provider_client(provider).request(method, url, **kwargs)
+            return self.parse_token_response(provider, response)
+        except Exception as e:
+            logger.error(
+                f"Error occurred while getting {provider} access token: {str(e)}"
+            )
         return None
 
-    def get_kakao_access_token(self, auth_code):
-        # 카카오 인가 코드 → Access Token 변환
-        url = "https://kauth.kakao.com/oauth/token"
-        data = {
-            "grant_type": "authorization_code",
-            "client_id": settings.KAKAO_CLIENT_ID,
-            "redirect_uri": settings.KAKAO_CALLBACK_URL,
-            "code": auth_code,
-            "client_secret": settings.KAKAO_CLIENT_SECRET,
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    def get_social_user_info(self, provider, tokens):
+        logger.debug(f"Getting user info for provider: {provider}")
+
+        # 구글은 ID 토큰을 직접 검증해 사용자 정보 API 호출을 생략
+        if provider == "google" and tokens.get("id_token"):
+            try:
+                claims = verify_google_id_token(tokens["id_token"])
+                return self.parse_id_token_claims(claims)
+            except Exception as e:
+                logger.warning(f"Google ID token verification failed: {str(e)}")
 
+        # access_token -> 소셜 사용자 정보 가져오기
+        access_token = tokens["access_token"]
+        user_info = get_cached_userinfo(provider, access_token)
+        if user_info:
+            return user_info
+        url, kwargs = self.get_profile_request(provider, access_token)
         try:
-            logger.debug(f"Kakao Token Request: {data}")  # 요청 데이터 로그
-            response = requests.post(url, data=data, headers=headers)
-            logger.debug(
-                f"Kakao access token response: {response.status_code} {response.text}"
-            )
-            if response.status_code == 200:
-                return response.json().get("access_token")
-            else:
-                logger.error(
-                    f"Kakao access token failed: {response.status_code} - {response.text}"
-                )
+            response = get_provider_client(provider).get(url, **kwargs)
+            user_info = self.parse_social_user_info(provider, response)
         except Exception as e:
-            logger.error(f"Error occurred while getting Kakao access token: {str(e)}")
-        return None
+            logger.error(
+                f"Error occurred while fetching user info from {provider}: {str(e)}"
+            )
+            return None
+        if user_info:
+            set_cached_userinfo(provider, access_token, user_info)
+        return user_info
 
-    def get_naver_access_token(self, auth_code):
-        # 네이버 인가 코드 → Access Token 변환
-        url = "https://nid.naver.com/oauth2.0/token"
-        params = {
-            "grant_type": "authorization_code",
-            "client_id": settings.NAVER_CLIENT_ID,
-            "client_secret": settings.NAVER_CLIENT_SECRET,
-            "code": auth_code,
-            "state": "random_state_string",  # 보안 강화를 위해 사용
-        }
-        try:
-            response = requests.get(url, params=params)
-            logger.debug(
-                f"Naver access token response: {response.status_code} {response.text}"
+
+@method_decorator(csrf_exempt, name="dispatch")
+class AsyncSocialLoginView(SocialLoginMixin, View):
+    """
+    SocialLoginView 의 ASGI 버전.
+    provider 호출과 DB 조회를 기다리는 동안 워커 스레드를 잡지 않으므로 한 프로세스가
+    여러 로그인을 동시에 처리한다. DRF 뷰는 async 를 지원하지 않아 Django View 로 만든다.
+    """
+
+    async def post(self, request, provider):
+        logger.debug(f"소셜로그인(async) 요청 시 로그: {provider}")
+
+        auth_code = self.get_auth_code(request)
+        if not auth_code:
+            return JsonResponse({"error": "Authorization code is required"}, status=400)
+
+        tokens = await self.get_tokens(provider, auth_code)
+        if not tokens or not tokens.get("access_token"):
+            return JsonResponse(
+                {"error": "Failed to retrieve access token"}, status=400
             )
-            if response.status_code == 200:
-                return response.json().get("access_token")
-        except Exception as e:
-            logger.error(f"Error occurred while getting Naver access token: {str(e)}")
-        return None
 
-    def get_google_access_token(self, auth_code):
-        # 구글 인가 코드 → Access Token 변환
-        url = "https://oauth2.googleapis.com/token"
-        data = {
-            "grant_type": "authorization_code",
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "client_secret": settings.GOOGLE_CLIENT_SECRET,
-            "redirect_uri": settings.GOOGLE_CALLBACK_URL,
-            "code": auth_code,
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
+        user_info = await self.get_social_user_info(provider, tokens)
+        if not user_info:
+            return JsonResponse({"error": "Invalid social token"}, status=400)
 
         try:
-            response = requests.post(url, data=data, headers=headers)
-            logger.debug(
-                f"Google access token response: {response.status_code} {response.text}"
+            user, created = await User.objects.aget_or_create(
+                email=user_info["email"],
+                provider=provider,
+                defaults=self.get_user_defaults(user_info),
             )
-            if response.status_code == 200:
-                return response.json().get("access_token")
+        except IntegrityError as e:
+            logger.error(f"IntegrityError occurred: {str(e)}")
+            return JsonResponse(
+                {"error": "User already exists or database constraint violated"},
+                status=400,
+            )
+
+        if not user.is_active:
+            return JsonResponse(
+                {"error": "Your account is inactive. Please contact support."},
+                status=400,
+            )
+
+        # 토큰 발급 시 OutstandingToken 을 저장하므로 동기 ORM 호출이다
+        return JsonResponse(await sync_to_async(self.get_login_data)(user))
+
+    def get_auth_code(self, request):
+        if request.content_type == "application/json":
+            try:
+                return json.loads(request.body or b"{}").get("code")
+            except (ValueError, AttributeError):
+                return None
+        return request.POST.get("code")
+
+    async def get_tokens(self, provider, auth_code):
+        token_request = self.get_token_request(provider, auth_code)
+        if token_request is None:
+            return None
+        method, url, kwargs = token_request
+        try:
+            client = get_async_provider_client(provider)
+            response = await client.request(method, url, **kwargs)
+            return self.parse_token_response(provider, response)
         except Exception as e:
-            logger.error(f"Error occurred while getting Google access token: {str(e)}")
+            logger.error(
+                f"Error occurred while getting {provider} access token: {str(e)}"
+            )
         return None
 
-    def get_social_user_info(self, provider, access_token):
-        logger.debug(f"Getting user info for provider: {provider}")
-
-        # access_token -> 소셜 사용자 정보 가져오기
+    async def get_social_user_info(self, provider, tokens):
+        if provider == "google" and tokens.get("id_token"):
+            try:
+                claims = await averify_google_id_token(tokens["id_token"])
+                return self.parse_id_token_claims(claims)
+            except Exception as e:
+                logger.warning(f"Google ID token verification failed: {str(e)}")
+
+        access_token = tokens["access_token"]
+        user_info = await aget_cached_userinfo(provider, access_token)
+        if user_info:
+            return user_info
+        url, kwargs = self.get_profile_request(provider, access_token)
         try:
-            if provider == "kakao":
-                url = "https://kapi.kakao.com/v2/user/me"
-                headers = {"Authorization": f"Bearer {access_token}"}
-                response = requests.get(url, headers=headers)
-                logger.debug(
-                    f"Kakao API response: {response.status_code} {response.text}"
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "email": data["kakao_account"].get("email"),
-                        "nick_name": data["properties"].get("nick_name"),
-                        "profile_image": data["properties"].get("profile_image"),
-                    }
-
-            elif provider == "naver":
-                url = "https://openapi.naver.com/v1/nid/me"
-                headers = {"Authorization": f"Bearer {access_token}"}
-                response = requests.get(url, headers=headers)
-                logger.debug(
-                    f"Naver API response: {response.status_code} {response.text}"
-                )
-                if response.status_code == 200:
-                    data = response.json()["response"]
-                    return {
-                        "email": data.get("email"),
-                        "nick_name": data.get("nick_name"),
-                        "profile_image": data.get("profile_image"),
-                    }
-            elif provider == "google":
-                url = "https://www.googleapis.com/oauth2/v3/userinfo"
-                headers = {"Authorization": f"Bearer {access_token}"}
-                response = requests.get(url, headers=headers)
-                logger.debug(
-                    f"Google API response: {response.status_code} {response.text}"
-                )
-                if response.status_code == 200:
-                    data = response.json()
-                    return {
-                        "email": data.get("email"),
-                        "nick_name": data.get("name"),
-                        "profile_image": data.get("picture"),
-                    }
+            response = await get_async_provider_client(provider).get(url, **kwargs)
+            user_info = self.parse_social_user_info(provider, response)
         except Exception as e:
             logger.error(
                 f"Error occurred while fetching user info from {provider}: {str(e)}"
             )
-
-        return None
+            return None
+        if user_info:
+            await aset_cached_userinfo(provider, access_token, user_info)
+        return user_info
 
 
 class TokenRefreshView(GenericAPIView):
@@ -305,7 +424,7 @@ class TokenRefreshView(GenericAPIView):
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
         try:
-            serializer.is_valid()
+            serializer.is_valid(raise_exception=True)
             return Response(serializer.validated_data, status=status.HTTP_200_OK)
         except serializers.ValidationError as e:
             return Response(e.detail, status=status.HTTP_401_UNAUTHORIZED)
@@ -372,7 +491,8 @@ class UserProfileUpdateView(APIView):
     parser_classes = [MultiPartParser, FormParser]  # Add parser classes
 
     def get_object(self):
-        return self.request.user
+        # request.user 는 인증에 필요한 필드만 캐시에서 읽은 객체이므로 전체를 다시 읽는다
+        return User.objects.get(pk=self.request.user.pk)
 
     def get_serializer(self, *args, **kwargs):
         return self.serializer_class(*args, **kwargs)
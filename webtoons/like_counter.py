@@ -0,0 +1,95 @@
+"""
+웹툰 좋아요.
+
+좋아요/취소는 WebtoonLike 로 사용자별 중복을 막고, 수는 WebtoonLikeShard 의 임의의
+shard 하나에만 더한다. rollup_like_counts 가 shard 합계를 Webtoon.like_count 로
+반영하므로 목록 조회/정렬은 like_count 한 컬럼만 읽는다.
+"""
+
+import random
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+
+from common.cache import bump_versions
+
+from .models import Webtoon, WebtoonLike, WebtoonLikeShard
+from .ranking import invalidate_rankings
+from .signals import WEBTOONS_CACHE_NAMESPACE
+
+
+def _add_to_shard(webtoon_id, delta):
+    shard = random.randrange(settings.LIKE_COUNTER_SHARDS)
+    shards = WebtoonLikeShard.objects.filter(webtoon_id=webtoon_id, shard=shard)
+    if not shards.update(count=F("count") + delta):
+        # 처음 쓰는 shard 면 만들고 다시 더한다 (동시에 만들어도 하나만 생성)
+        WebtoonLikeShard.objects.bulk_create(
+            [WebtoonLikeShard(webtoon_id=webtoon_id, shard=shard)],
+            ignore_conflicts=True,
+        )
+        shards.update(count=F("count") + delta)
+
+
+def like_webtoon(user, webtoon_id):
+    """좋아요, 이미 좋아요한 웹툰이면 False"""
+    try:
+        with transaction.atomic():
+            WebtoonLike.objects.create(user=user, webtoon_id=webtoon_id)
+            _add_to_shard(webtoon_id, 1)
+    except IntegrityError:
+        return False
+    return True
+
+
+def unlike_webtoon(user, webtoon_id):
+    """좋아요 취소, 좋아요하지 않은 웹툰이면 False"""
+    with transaction.atomic():
+        deleted, _ = WebtoonLike.objects.filter(
+            user=user, webtoon_id=webtoon_id
+        ).delete()
+        if deleted:
+            _add_to_shard(webtoon_id, -1)
+    return bool(deleted)
+
+
+def delete_likes(likes):
+    """
+    좋아요 queryset 을 한 번에 지우고 웹툰별 지운 수만큼 shard 에서 뺀다.
+    WebtoonLike 는 참조하는 모델과 삭제 시그널이 없어 delete() 가 행을 읽지 않는다.
+    """
+    deleted = 0
+    with transaction.atomic():
+        counts = likes.values_list("webtoon_id").annotate(count=Count("id"))
+        for webtoon_id, count in counts:
+            _add_to_shard(webtoon_id, -count)
+            deleted += count
+        likes.delete()
+    return deleted
+
+
+def rollup_like_counts():
+    """shard 합계를 Webtoon.like_count 로 반영하고 값이 바뀐 웹툰 수를 반환"""
+    totals = dict(
+        WebtoonLikeShard.objects.values_list("webtoon_id").annotate(total=Sum("count"))
+    )
+    current = dict(
+        Webtoon.objects.filter(id__in=totals).values_list("id", "like_count")
+    )
+
+    # 값이 바뀐 웹툰만, 같은 합계끼리 묶어 UPDATE
+    changed = defaultdict(list)
+    for webtoon_id, total in totals.items():
+        # 취소가 먼저 반영된 음수 합계는 0 으로 저장하므로 비교도 0 으로
+        total = max(total, 0)
+        if webtoon_id in current and current[webtoon_id] != total:
+            changed[total].append(webtoon_id)
+
+    for total, webtoon_ids in changed.items():
+        Webtoon.objects.filter(id__in=webtoon_ids).update(like_count=total)
+    if changed:
+        # update() 는 시그널이 없으므로 인기순 목록 캐시는 직접 무효화
+        bump_versions(WEBTOONS_CACHE_NAMESPACE)
+        invalidate_rankings("like_count")
+    return sum(len(webtoon_ids) for webtoon_ids in changed.values())
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from webtoons.view_counter import flush_pending_views, refresh_view_rankings
+
+
+class Command(BaseCommand):
+    help = (
+        "캐시에 쌓인 조회수를 Webtoon.view_count 에 반영 "
+        "(VIEW_COUNT_FLUSH_INTERVAL=0 일 때 주기적으로 실행)"
+    )
+
+    def handle(self, *args, **options):
+        updates = flush_pending_views()
+        if updates:
+            refresh_view_rankings()
+        self.stdout.write(
+            self.style.SUCCESS(f"조회수를 UPDATE {updates}번으로 반영했습니다")
+        )
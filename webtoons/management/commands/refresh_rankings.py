@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from webtoons.ranking import refresh_rankings
+
+
+class Command(BaseCommand):
+    help = "ListView 랭킹 스냅샷을 모두 다시 생성 (주기적으로 실행)"
+
+    def handle(self, *args, **options):
+        count = refresh_rankings()
+        self.stdout.write(self.style.SUCCESS(f"{count}개 랭킹 스냅샷을 갱신했습니다"))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from webtoons.like_counter import rollup_like_counts
+
+
+class Command(BaseCommand):
+    help = "좋아요 shard 합계를 Webtoon.like_count 에 반영 (주기적으로 실행)"
+
+    def handle(self, *args, **options):
+        updated = rollup_like_counts()
+        self.stdout.write(
+            self.style.SUCCESS(f"{updated}개 웹툰의 좋아요 수를 반영했습니다")
+        )
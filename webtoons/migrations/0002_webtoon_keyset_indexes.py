@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webtoons", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="webtoon",
+            index=models.Index(
+                fields=["-like_count", "-id"], name="webtoon_like_count_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="webtoon",
+            index=models.Index(
+                fields=["-view_count", "-id"], name="webtoon_view_count_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="webtoon",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="webtoon_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="webtoon",
+            index=models.Index(
+                fields=["-publication_day", "-id"], name="webtoon_pub_day_id_idx"
+            ),
+        ),
+    ]
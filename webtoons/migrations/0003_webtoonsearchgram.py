@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webtoons", "0002_webtoon_keyset_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebtoonSearchGram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("gram", models.CharField(max_length=2)),
+                (
+                    "webtoon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="search_grams",
+                        to="webtoons.webtoon",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("gram", "webtoon"), name="webtoon_search_gram_unique"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# 마이그레이션은 이후 코드가 바뀌어도 같은 결과를 내야 하므로 webtoons.search 를 import
+# 하지 않고 이 시점의 gram 규칙을 복사해 둔다
+GRAM_SIZE = 2
+
+
+def text_grams(text):
+    text = " ".join((text or "").lower().split())
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def index_existing_webtoons(apps, schema_editor):
+    Webtoon = apps.get_model("webtoons", "Webtoon")
+    WebtoonSearchGram = apps.get_model("webtoons", "WebtoonSearchGram")
+
+    grams = []
+    for webtoon in Webtoon.objects.only("id", "title", "author").iterator():
+        for gram in text_grams(webtoon.title) | text_grams(webtoon.author):
+            grams.append(WebtoonSearchGram(gram=gram, webtoon_id=webtoon.id))
+        if len(grams) >= 1000:
+            WebtoonSearchGram.objects.bulk_create(grams, ignore_conflicts=True)
+            grams = []
+    WebtoonSearchGram.objects.bulk_create(grams, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webtoons", "0003_webtoonsearchgram"),
+    ]
+
+    operations = [
+        migrations.RunPython(index_existing_webtoons, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:14
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+SERIAL_DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+# 행마다 UPDATE 하지 않고 같은 값끼리 모아 이 개수씩 id__in UPDATE
+BATCH_SIZE = 1000
+
+
+def update_grouped(Webtoon, ids_by_value, field):
+    for value, ids in ids_by_value.items():
+        for start in range(0, len(ids), BATCH_SIZE):
+            Webtoon.objects.filter(id__in=ids[start : start + BATCH_SIZE]).update(
+                **{field: value}
+            )
+
+
+def serial_day_to_mask(apps, schema_editor):
+    Webtoon = apps.get_model("webtoons", "Webtoon")
+    ids_by_mask = defaultdict(list)
+    for webtoon in Webtoon.objects.only("id", "serial_day").iterator():
+        days = webtoon.serial_day or []
+        if isinstance(days, str):
+            days = days.split(",")
+        mask = 0
+        for day in days:
+            if day in SERIAL_DAYS:
+                mask |= 1 << SERIAL_DAYS.index(day)
+        # 새 컬럼의 기본값이 0 이다
+        if mask:
+            ids_by_mask[mask].append(webtoon.id)
+    update_grouped(Webtoon, ids_by_mask, "serial_day_mask")
+
+
+def mask_to_serial_day(apps, schema_editor):
+    Webtoon = apps.get_model("webtoons", "Webtoon")
+    ids_by_days = defaultdict(list)
+    for webtoon in Webtoon.objects.only("id", "serial_day_mask").iterator():
+        days = [
+            day
+            for index, day in enumerate(SERIAL_DAYS)
+            if webtoon.serial_day_mask & (1 << index)
+        ]
+        ids_by_days[",".join(days)].append(webtoon.id)
+    update_grouped(Webtoon, ids_by_days, "serial_day")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webtoons", "0004_index_existing_webtoons"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webtoon",
+            name="serial_day_mask",
+            field=models.PositiveSmallIntegerField(db_index=True, default=0),
+        ),
+        migrations.RunPython(serial_day_to_mask, mask_to_serial_day),
+        migrations.RemoveField(
+            model_name="webtoon",
+            name="serial_day",
+        ),
+    ]
@@ -0,0 +1,91 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def seed_like_shards(apps, schema_editor):
+    # rollup 이 shard 합계로 like_count 를 덮어쓰므로 기존 좋아요 수를 shard 0 에 옮긴다
+    Webtoon = apps.get_model("webtoons", "Webtoon")
+    WebtoonLikeShard = apps.get_model("webtoons", "WebtoonLikeShard")
+    shards = (
+        WebtoonLikeShard(webtoon_id=webtoon_id, shard=0, count=like_count)
+        for webtoon_id, like_count in Webtoon.objects.filter(
+            like_count__gt=0
+        ).values_list("id", "like_count")
+    )
+    WebtoonLikeShard.objects.bulk_create(shards, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webtoons", "0005_serial_day_mask"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="WebtoonLike",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="webtoon_likes",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "webtoon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="likes",
+                        to="webtoons.webtoon",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("user", "webtoon")},
+            },
+        ),
+        migrations.CreateModel(
+            name="WebtoonLikeShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shard", models.PositiveSmallIntegerField()),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "webtoon",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="like_shards",
+                        to="webtoons.webtoon",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("webtoon", "shard")},
+            },
+        ),
+        migrations.RunPython(seed_like_shards, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webtoons", "0006_webtoon_like_counters"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webtoon",
+            name="thumbnail_variants",
+            field=models.JSONField(blank=True, default=dict),
+        ),
+    ]
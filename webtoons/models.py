@@ -1,10 +1,32 @@
 from django.db import models
-from multiselectfield import MultiSelectField
 
 from common.models import CommonModel
 from users.models import CustomUser
 
 
+class WebtoonQuerySet(models.QuerySet):
+    def for_listing(self):
+        """목록 응답용 쿼리셋: 웹툰 태그를 한 번의 추가 쿼리로 미리 가져온다"""
+        return self.prefetch_related(
+            models.Prefetch(
+                "webtoon_tags",
+                queryset=WebtoonTag.objects.select_related("tag"),
+            )
+        )
+
+    def on_serial_day(self, day):
+        """day 요일에 연재하는 웹툰 (serial_day_mask 인덱스를 IN 조회로 사용)"""
+        return self.filter(serial_day_mask__in=Webtoon.serial_day_masks(day))
+
+    def with_status(self, status):
+        """신작(new)/완결(completed) 필터, 그 외 값은 전체"""
+        if status == "new":
+            return self.filter(is_new=True)
+        if status == "completed":
+            return self.filter(is_completed=True)
+        return self
+
+
 class Webtoon(CommonModel):
     PLATFORM_CHOICES = [
         ("all", "전체"),
@@ -39,6 +61,8 @@ class Webtoon(CommonModel):
     title = models.CharField(max_length=100, null=False, blank=False)
     author = models.CharField(max_length=50, null=False, blank=False)
     thumbnail = models.URLField(null=False, blank=False)
+    # 업로드 시 생성한 너비별 썸네일 URL ({"160": url, ...})
+    thumbnail_variants = models.JSONField(default=dict, blank=True)
     age_rating = models.CharField(max_length=10)
     publication_day = models.DateField(null=False, blank=False)
     is_completed = models.BooleanField(default=False)
@@ -48,7 +72,8 @@ class Webtoon(CommonModel):
         max_length=20, choices=PLATFORM_CHOICES, null=False, blank=False
     )
     serialization_cycle = models.CharField(max_length=20, choices=CYCLE_CHOICES)
-    serial_day = MultiSelectField(choices=SERIAL_DAY_CHOICES, null=True, blank=True)
+    # 연재 요일 7비트 비트마스크 (월=1, 화=2, ... 일=64), API 에서는 serial_day 로 노출
+    serial_day_mask = models.PositiveSmallIntegerField(default=0, db_index=True)
     view_count = models.PositiveIntegerField(default=0)
     like_count = models.PositiveIntegerField(default=0)
     is_approved = models.CharField(
@@ -56,6 +81,51 @@ class Webtoon(CommonModel):
     )
     # user = models.ForeignKey(CustomUser, on_delete=models.CASCADE)
 
+    objects = WebtoonQuerySet.as_manager()
+
+    SERIAL_DAY_BITS = {
+        day: 1 << index for index, (day, _) in enumerate(SERIAL_DAY_CHOICES)
+    }
+
+    @classmethod
+    def serial_day_masks(cls, day):
+        """day 비트가 켜진 모든 마스크 값 (요일이 7개뿐이라 최대 64개)"""
+        bit = cls.SERIAL_DAY_BITS.get(day)
+        if bit is None:
+            return []
+        return [mask for mask in range(1 << len(cls.SERIAL_DAY_BITS)) if mask & bit]
+
+    @property
+    def serial_day(self):
+        return [
+            day
+            for day, bit in self.SERIAL_DAY_BITS.items()
+            if self.serial_day_mask & bit
+        ]
+
+    @serial_day.setter
+    def serial_day(self, days):
+        self.serial_day_mask = 0
+        for day in days or []:
+            self.serial_day_mask |= self.SERIAL_DAY_BITS[day]
+
+    class Meta:
+        # ListView 정렬(sort)별 키셋 페이지네이션용 (정렬 컬럼, id) 복합 인덱스
+        indexes = [
+            models.Index(
+                fields=["-like_count", "-id"], name="webtoon_like_count_id_idx"
+            ),
+            models.Index(
+                fields=["-view_count", "-id"], name="webtoon_view_count_id_idx"
+            ),
+            models.Index(
+                fields=["-created_at", "-id"], name="webtoon_created_at_id_idx"
+            ),
+            models.Index(
+                fields=["-publication_day", "-id"], name="webtoon_pub_day_id_idx"
+            ),
+        ]
+
 
 class Tag(models.Model):
     CATEGORY_CHOICES = [
@@ -79,3 +149,48 @@ class WebtoonTag(models.Model):
         Webtoon, on_delete=models.CASCADE, related_name="webtoon_tags"
     )
     tag = models.ForeignKey(Tag, on_delete=models.CASCADE)
+
+
+class WebtoonSearchGram(models.Model):
+    """제목/작가 검색용 2-gram 색인 (webtoons.search 에서 관리)"""
+
+    gram = models.CharField(max_length=2)
+    webtoon = models.ForeignKey(
+        Webtoon, on_delete=models.CASCADE, related_name="search_grams"
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["gram", "webtoon"], name="webtoon_search_gram_unique"
+            )
+        ]
+
+
+class WebtoonLike(models.Model):
+    user = models.ForeignKey(
+        CustomUser, on_delete=models.CASCADE, related_name="webtoon_likes"
+    )
+    webtoon = models.ForeignKey(Webtoon, on_delete=models.CASCADE, related_name="likes")
+    created = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = (("user", "webtoon"),)  # 같은 웹툰 중복 좋아요 방지
+
+
+class WebtoonLikeShard(models.Model):
+    """
+    웹툰별 좋아요 수를 여러 행으로 나눈 카운터.
+    동시에 들어오는 좋아요가 한 행의 락을 기다리지 않도록 임의의 shard 에 더하고,
+    rollup_like_counts 가 합계를 Webtoon.like_count 로 반영한다.
+    """
+
+    webtoon = models.ForeignKey(
+        Webtoon, on_delete=models.CASCADE, related_name="like_shards"
+    )
+    shard = models.PositiveSmallIntegerField()
+    # 좋아요 취소는 임의의 shard 에서 빼므로 shard 하나는 음수가 될 수 있다
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (("webtoon", "shard"),)
@@ -0,0 +1,89 @@
+"""
+웹툰 랭킹 스냅샷.
+
+ListView 의 (정렬, 요일, 상태) 조합별로 정렬된 웹툰 id 목록을 캐시에 저장한다.
+목록 조회는 스냅샷에서 페이지 id 만 잘라 해당 행만 가져오므로 ORDER BY 가 없다.
+스냅샷 키에는 전체 버전과 정렬 컬럼별 버전이 들어가서, 웹툰이 바뀌면 전체를,
+조회수/좋아요 수가 반영되면 해당 정렬의 스냅샷만 무효화한다.
+"""
+
+from array import array
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.cache import bump_versions, fill_reads, get_versions
+
+from .models import Webtoon
+
+RANKING_NAMESPACE = "rankings"
+RANKING_KEY = "webtoons:ranking:{ordering}:{day}:{status}:{versions}"
+
+RANKING_ORDERINGS = ["-like_count", "-view_count", "-created_at", "-publication_day"]
+RANKING_STATUSES = ["all", "new", "completed"]
+
+
+def _field_namespace(field_name):
+    return f"{RANKING_NAMESPACE}:{field_name}"
+
+
+def _normalize_status(webtoon_status):
+    return webtoon_status if webtoon_status in RANKING_STATUSES else "all"
+
+
+def _namespaces(ordering):
+    return [RANKING_NAMESPACE, _field_namespace(ordering.lstrip("-"))]
+
+
+def _cache_key(ordering, day, webtoon_status):
+    versions = get_versions(_namespaces(ordering))
+    return RANKING_KEY.format(
+        ordering=ordering,
+        day=day or "all",
+        status=_normalize_status(webtoon_status),
+        versions=".".join(str(version) for version in versions),
+    )
+
+
+def build_ranking(ordering, day="", webtoon_status=""):
+    """정렬된 웹툰 id 목록 (id 는 정렬 컬럼과 같은 방향의 tie-breaker)"""
+    webtoons = Webtoon.objects.with_status(webtoon_status)
+    if day:
+        webtoons = webtoons.on_serial_day(day)
+    prefix = "-" if ordering.startswith("-") else ""
+    ids = webtoons.order_by(ordering, f"{prefix}id").values_list("id", flat=True)
+    # list 보다 작게 저장되고 index() 도 그대로 쓸 수 있다.
+    # "q" 는 플랫폼과 관계없이 8바이트라 BigAutoField 와 범위가 같다
+    return array("q", ids)
+
+
+def get_ranking(ordering, day="", webtoon_status=""):
+    """스냅샷을 반환, 없으면 만들어 캐시에 저장"""
+    key = _cache_key(ordering, day, webtoon_status)
+    ids = cache.get(key)
+    if ids is None:
+        with fill_reads(_namespaces(ordering)):
+            ids = build_ranking(ordering, day, webtoon_status)
+        cache.set(key, ids, timeout=settings.RANKING_SNAPSHOT_TIMEOUT)
+    return ids
+
+
+def refresh_rankings(orderings=RANKING_ORDERINGS):
+    """orderings 정렬의 모든 (요일, 상태) 조합 스냅샷을 다시 만들고 만든 수를 반환"""
+    days = [""] + list(Webtoon.SERIAL_DAY_BITS)
+    snapshots = {}
+    for ordering in orderings:
+        for day in days:
+            for webtoon_status in RANKING_STATUSES:
+                key = _cache_key(ordering, day, webtoon_status)
+                snapshots[key] = build_ranking(ordering, day, webtoon_status)
+    cache.set_many(snapshots, timeout=settings.RANKING_SNAPSHOT_TIMEOUT)
+    return len(snapshots)
+
+
+def invalidate_rankings(*field_names):
+    """field_names 정렬의 스냅샷만 무효화, 지정하지 않으면 전체"""
+    if field_names:
+        bump_versions(*(_field_namespace(field_name) for field_name in field_names))
+    else:
+        bump_versions(RANKING_NAMESPACE)
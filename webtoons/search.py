@@ -0,0 +1,93 @@
+"""
+웹툰 제목/작가 검색.
+
+제목과 작가를 소문자/공백 정규화 후 2-gram 으로 쪼개 WebtoonSearchGram 에 저장하고,
+검색어의 2-gram 을 모두 가진 웹툰만 후보로 뽑은 뒤 실제 포함 여부를 확인한다.
+LIKE '%검색어%' 전체 스캔 대신 gram 인덱스 범위만 읽는다.
+"""
+
+from django.db.models import Case, Count, IntegerField, Q, Value, When
+
+from .models import WebtoonSearchGram
+
+GRAM_SIZE = 2
+
+# 검색 결과 순위: 정확히 일치 > 앞부분 일치 > 부분 일치
+RANK_EXACT = 0
+RANK_PREFIX = 1
+RANK_CONTAINS = 2
+
+
+def normalize(text):
+    return " ".join((text or "").lower().split())
+
+
+def text_grams(text):
+    text = normalize(text)
+    return {text[i : i + GRAM_SIZE] for i in range(len(text) - GRAM_SIZE + 1)}
+
+
+def webtoon_grams(webtoon):
+    return text_grams(webtoon.title) | text_grams(webtoon.author)
+
+
+def index_webtoons(webtoons, batch_size=1000):
+    """웹툰들의 gram 색인을 다시 만든다"""
+    webtoons = list(webtoons)
+    WebtoonSearchGram.objects.filter(webtoon__in=webtoons).delete()
+    WebtoonSearchGram.objects.bulk_create(
+        [
+            WebtoonSearchGram(gram=gram, webtoon=webtoon)
+            for webtoon in webtoons
+            for gram in webtoon_grams(webtoon)
+        ],
+        batch_size=batch_size,
+        # MySQL 콜레이션에서 같은 값으로 취급되는 gram 이 있을 수 있다
+        ignore_conflicts=True,
+    )
+
+
+def candidate_ids(term):
+    """검색어의 gram 을 모두 가진 웹툰 id 서브쿼리"""
+    grams = text_grams(term)
+    return (
+        WebtoonSearchGram.objects.filter(gram__in=grams)
+        .values("webtoon_id")
+        .annotate(matched=Count("id"))
+        .filter(matched=len(grams))
+        .values("webtoon_id")
+    )
+
+
+def search_webtoons(queryset, term):
+    """
+    queryset 을 검색어로 거르고 순위순으로 정렬한다.
+    플랫폼/태그 등 다른 필터가 걸린 queryset 에도 그대로 조합할 수 있다.
+    """
+    term = normalize(term)
+    if not term:
+        return queryset
+
+    # 한 글자 검색어는 gram 으로 거를 수 없고 결과도 많아 포함 여부만 확인한다
+    if len(term) >= GRAM_SIZE:
+        queryset = queryset.filter(id__in=candidate_ids(term))
+
+    return (
+        # 2-gram 이 모두 있어도 연속된 문자열이 아닐 수 있어 실제 포함 여부를 후보에서만 확인
+        queryset.filter(Q(title__icontains=term) | Q(author__icontains=term))
+        .annotate(
+            search_rank=Case(
+                When(
+                    Q(title__iexact=term) | Q(author__iexact=term),
+                    then=Value(RANK_EXACT),
+                ),
+                When(
+                    Q(title__istartswith=term) | Q(author__istartswith=term),
+                    then=Value(RANK_PREFIX),
+                ),
+                default=Value(RANK_CONTAINS),
+                output_field=IntegerField(),
+            )
+        )
+        .order_by("search_rank", "-like_count", "id")
+    )
@@ -1,7 +1,11 @@
+from django.db import transaction
 from drf_spectacular.utils import OpenApiExample, extend_schema_serializer
 from rest_framework import serializers
 
+from common.cache import bump_versions
 from webtoons.models import Tag, Webtoon, WebtoonTag
+from webtoons.signals import TAGS_CACHE_NAMESPACE, WEBTOONS_CACHE_NAMESPACE
+from webtoons.tag_index import invalidate_tags
 
 
 class TagSerializer(serializers.ModelSerializer):
@@ -20,16 +24,22 @@ class WebtoonsSerializer(serializers.ModelSerializer):
     tags = TagSerializer(many=True, required=False)
     like_count = serializers.IntegerField(read_only=True)
     view_count = serializers.IntegerField(read_only=True)
+    # 너비별 썸네일 URL ({"160": url, "320": url, ...}), 목록에서는 작은 것을 사용
+    thumbnail_variants = serializers.JSONField(read_only=True)
     serial_day = serializers.MultipleChoiceField(
         choices=Webtoon.SERIAL_DAY_CHOICES, required=False
     )
+    # 로그인 사용자의 목록/검색 응답에만 포함 (bookmark.bookmarked.BookmarkFlagMixin)
+    is_bookmarked = serializers.BooleanField(read_only=True)
 
     class Meta:
         model = Webtoon
         fields = [
+            "id",
             "title",
             "author",
             "thumbnail",
+            "thumbnail_variants",
             "webtoon_url",
             "publication_day",
             "platform",
@@ -43,6 +53,7 @@ class WebtoonsSerializer(serializers.ModelSerializer):
             "view_count",
             "is_approved",
             "tags",
+            "is_bookmarked",
         ]
 
     @extend_schema_serializer(
@@ -114,6 +125,13 @@ class WebtoonsSerializer(serializers.ModelSerializer):
 
             WebtoonTag.objects.bulk_create(webtoon_tags)
 
+            # bulk_create 는 signal 을 보내지 않으므로 역색인/응답 캐시를 직접 갱신
+            tag_ids = [tag.id for tag in all_tags]
+            transaction.on_commit(lambda: invalidate_tags(tag_ids))
+            transaction.on_commit(
+                lambda: bump_versions(TAGS_CACHE_NAMESPACE, WEBTOONS_CACHE_NAMESPACE)
+            )
+
         return webtoon
 
     # def create(self, validated_data):
@@ -148,6 +166,13 @@ class WebtoonsSerializer(serializers.ModelSerializer):
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
-        tags = [webtoon_tag.tag for webtoon_tag in instance.webtoon_tags.all()]
-        data["tags"] = TagSerializer(tags, many=True).data
+        # 행마다 TagSerializer 를 생성하지 않고 prefetch 된 태그를 바로 dict 로 변환
+        data["tags"] = [
+            {
+                "id": webtoon_tag.tag.id,
+                "tag_name": webtoon_tag.tag.tag_name,
+                "category": webtoon_tag.tag.category,
+            }
+            for webtoon_tag in instance.webtoon_tags.all()
+        ]
         return data
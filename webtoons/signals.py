@@ -0,0 +1,50 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from common.cache import bump_versions
+
+from .models import Tag, Webtoon, WebtoonTag
+from .ranking import invalidate_rankings
+from .search import index_webtoons
+from .tag_index import invalidate_tags
+
+# 응답 캐시 네임스페이스: 웹툰 목록/검색 응답, 태그 목록 응답
+WEBTOONS_CACHE_NAMESPACE = "webtoons"
+TAGS_CACHE_NAMESPACE = "tags"
+
+SEARCH_FIELDS = {"title", "author"}
+
+
+@receiver([post_save, post_delete], sender=WebtoonTag)
+def invalidate_tag_index(sender, instance, **kwargs):
+    # 커밋된 뒤에 버전을 올려야 다른 요청이 커밋 전 상태로 새 버전 비트맵을 만들지 않는다
+    transaction.on_commit(lambda: invalidate_tags([instance.tag_id]))
+
+
+@receiver(post_save, sender=Webtoon)
+def update_search_index(sender, instance, created, update_fields, **kwargs):
+    # 제목/작가가 바뀔 수 있는 저장일 때만 검색 gram 을 다시 만든다
+    if created or update_fields is None or SEARCH_FIELDS & set(update_fields):
+        index_webtoons([instance])
+
+
+@receiver([post_save, post_delete], sender=Webtoon)
+@receiver([post_save, post_delete], sender=WebtoonTag)
+def invalidate_webtoon_responses(sender, **kwargs):
+    # 승인 상태 변경(WebtoonApprovalView)도 Webtoon post_save 로 들어온다
+    transaction.on_commit(lambda: bump_versions(WEBTOONS_CACHE_NAMESPACE))
+
+
+@receiver([post_save, post_delete], sender=Webtoon)
+def invalidate_webtoon_rankings(sender, **kwargs):
+    # 정렬 값이나 요일/상태가 바뀌었을 수 있으므로 모든 스냅샷을 무효화
+    transaction.on_commit(invalidate_rankings)
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tag_responses(sender, **kwargs):
+    # 목록/검색 응답에도 태그 이름이 들어가므로 두 네임스페이스 모두 무효화
+    transaction.on_commit(
+        lambda: bump_versions(TAGS_CACHE_NAMESPACE, WEBTOONS_CACHE_NAMESPACE)
+    )
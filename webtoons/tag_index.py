@@ -0,0 +1,98 @@
+"""
+태그 → 웹툰 역색인.
+
+태그마다 해당 태그가 달린 웹툰 id 를 비트맵(int)으로 캐시에 저장한다.
+여러 태그 AND 검색은 비트맵 교집합으로 처리하고, DB 에서는 결과 id 중 필요한
+페이지만 조회한다. 비트맵 키에는 태그별 버전이 들어가고, WebtoonTag 가 바뀌면 해당
+태그의 버전만 올려 다음 조회 때 그 태그만 다시 만든다. 버전은 DB 를 읽기 전에 정해지므로
+커밋 전 상태로 만든 비트맵은 예전 버전 키에만 저장된다.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from common.cache import bump_versions, fill_reads, get_versions
+
+from .models import WebtoonTag
+
+TAG_INDEX_NAMESPACE = "tag_index:{tag_id}"
+TAG_INDEX_KEY = "webtoons:tag_index:{tag_id}:{version}"
+
+
+def _namespace(tag_id):
+    return TAG_INDEX_NAMESPACE.format(tag_id=tag_id)
+
+
+def _ids_to_bitmap(ids):
+    ids = list(ids)
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for webtoon_id in ids:
+        bits[webtoon_id >> 3] |= 1 << (webtoon_id & 7)
+    return int.from_bytes(bits, "little")
+
+
+def _bitmap_to_ids(bitmap):
+    # 뒤집은 2진 문자열에서 "1" 위치가 곧 웹툰 id (오름차순)
+    bits = bin(bitmap)[:1:-1]
+    ids = []
+    position = bits.find("1")
+    while position != -1:
+        ids.append(position)
+        position = bits.find("1", position + 1)
+    return ids
+
+
+def build_tag_bitmaps(tag_ids):
+    """DB 에서 태그별 비트맵을 한 번의 쿼리로 만든다"""
+    webtoon_ids = {tag_id: [] for tag_id in tag_ids}
+    rows = WebtoonTag.objects.filter(tag_id__in=tag_ids).values_list(
+        "tag_id", "webtoon_id"
+    )
+    for tag_id, webtoon_id in rows:
+        webtoon_ids[tag_id].append(webtoon_id)
+    return {tag_id: _ids_to_bitmap(ids) for tag_id, ids in webtoon_ids.items()}
+
+
+def get_tag_bitmaps(tag_ids):
+    """태그 id 별 비트맵을 반환, 캐시에 없는 태그만 DB 에서 만들어 채운다"""
+    tag_ids = list(tag_ids)
+    versions = get_versions([_namespace(tag_id) for tag_id in tag_ids])
+    keys = {
+        tag_id: TAG_INDEX_KEY.format(tag_id=tag_id, version=version)
+        for tag_id, version in zip(tag_ids, versions)
+    }
+    cached = cache.get_many(keys.values())
+
+    bitmaps = {tag_id: cached[key] for tag_id, key in keys.items() if key in cached}
+    missing = [tag_id for tag_id in keys if tag_id not in bitmaps]
+    if missing:
+        with fill_reads([_namespace(tag_id) for tag_id in missing]):
+            built = build_tag_bitmaps(missing)
+        cache.set_many(
+            {keys[tag_id]: bitmap for tag_id, bitmap in built.items()},
+            timeout=settings.TAG_INDEX_TIMEOUT,
+        )
+        bitmaps.update(built)
+    return bitmaps
+
+
+def match_all_tags(tag_ids):
+    """모든 태그를 가진 웹툰 id 목록(오름차순)"""
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return []
+
+    # 작은 비트맵부터 교집합을 구해 중간 결과를 빨리 줄인다
+    bitmaps = sorted(get_tag_bitmaps(tag_ids).values(), key=int.bit_length)
+    result = bitmaps[0]
+    for bitmap in bitmaps[1:]:
+        if not result:
+            break
+        result &= bitmap
+    return _bitmap_to_ids(result)
+
+
+def invalidate_tags(tag_ids):
+    bump_versions(*(_namespace(tag_id) for tag_id in set(tag_ids)))
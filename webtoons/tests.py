@@ -1,3 +1,686 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.test import (
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+    skipUnlessDBFeature,
+)
+from django.test.utils import CaptureQueriesContext
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from common.pagination import KeysetPagination
+from common.testing import create_user, create_webtoon
+from webtoons import tag_index
+from webtoons.like_counter import delete_likes, like_webtoon, rollup_like_counts
+from webtoons.models import (
+    Tag,
+    Webtoon,
+    WebtoonLike,
+    WebtoonLikeShard,
+    WebtoonTag,
+)
+from webtoons.ranking import build_ranking, invalidate_rankings
+from webtoons.serializers import WebtoonsSerializer
+from webtoons.view_counter import (
+    VIEW_PENDING_KEY,
+    flush_pending_views,
+    refresh_view_rankings,
+    view_count_buffer,
+)
+
+
+class WebtoonListQueryCountTestCase(TestCase):
+    """목록 API 들이 웹툰 수와 관계없이 고정된 쿼리 수로 태그를 가져오는지 확인"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.tags = [
+            Tag.objects.create(tag_name=f"태그{i}", category="genre") for i in range(3)
+        ]
+        cls.webtoons = []
+        for i in range(10):
+            webtoon = create_webtoon(title=f"웹툰{i}")
+            WebtoonTag.objects.bulk_create(
+                [WebtoonTag(webtoon=webtoon, tag=tag) for tag in cls.tags]
+            )
+            cls.webtoons.append(webtoon)
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+
+    def assert_tags_rendered(self, items):
+        self.assertTrue(items)
+        for item in items:
+            self.assertEqual(len(item["tags"]), len(self.tags))
+
+    def test_list_view(self):
+        # 첫 요청에서 랭킹 스냅샷 1 쿼리로 생성 후 캐시
+        with self.assertNumQueries(3):
+            self.client.get("/api/webtoons/list", {"sort": "popular"})
+        # 웹툰 조회 1 + 태그 prefetch 1
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/webtoons/list", {"sort": "popular", "page_size": 5}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assert_tags_rendered(response.data["results"])
+
+    def test_list_view_with_tag_filter(self):
+        params = {"id": [tag.id for tag in self.tags]}
+        # 첫 요청에서 랭킹 스냅샷, 태그 역색인을 각각 1 쿼리로 생성 후 캐시
+        with self.assertNumQueries(4):
+            self.client.get("/api/webtoons/list", params)
+        self.client.get(
+            "/api/webtoons/list", {**params, "sort": "view", "page_size": 1}
+        )
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/webtoons/list", {**params, "sort": "view"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["results"]), len(self.webtoons))
+        self.assert_tags_rendered(response.data["results"])
+
+    def test_search_by_tag_view(self):
+        with self.assertNumQueries(3):
+            self.client.get("/api/webtoons/search/tag", {"id": [self.tags[0].id]})
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/webtoons/search/tag", {"id": [self.tags[0].id, self.tags[0].id]}
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assert_tags_rendered(response.data)
+
+    def test_search_by_integrate_view(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/webtoons/search", {"term": "웹툰"})
+        self.assertEqual(response.status_code, 200)
+        self.assert_tags_rendered(response.data)
+
+    def test_webtoon_create_view_get(self):
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/webtoons/request/")
+        self.assertEqual(response.status_code, 200)
+        self.assert_tags_rendered(response.data)
+
+    def test_webtoon_approval_view_get(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(f"/api/webtoons/{self.webtoons[0].pk}/approve")
+        self.assertEqual(response.status_code, 200)
+        self.assert_tags_rendered([response.data])
+
+    def test_webtoon_approval_view_patch(self):
+        # 승인 상태만 바꾸므로 태그는 읽지 않는다
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                f"/api/webtoons/{self.webtoons[0].pk}/approve",
+                {"action": "approve"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn(
+            "webtoons_webtoontag", " ".join(q["sql"] for q in queries.captured_queries)
+        )
+
+
+class TagIndexTestCase(TestCase):
+    """태그 역색인 AND 검색과 WebtoonTag 변경 시 갱신 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.action = Tag.objects.create(tag_name="액션", category="genre")
+        self.romance = Tag.objects.create(tag_name="로맨스", category="genre")
+        self.both = create_webtoon(title="둘다")
+        self.action_only = create_webtoon(title="액션만")
+        WebtoonTag.objects.create(webtoon=self.both, tag=self.action)
+        WebtoonTag.objects.create(webtoon=self.both, tag=self.romance)
+        WebtoonTag.objects.create(webtoon=self.action_only, tag=self.action)
+
+    def search(self, *tags):
+        response = self.client.get(
+            "/api/webtoons/search/tag", {"id": [tag.id for tag in tags]}
+        )
+        self.assertEqual(response.status_code, 200)
+        return sorted(item["title"] for item in response.data)
+
+    def test_match_all_tags(self):
+        self.assertEqual(self.search(self.action), ["둘다", "액션만"])
+        self.assertEqual(self.search(self.action, self.romance), ["둘다"])
+
+    def test_index_updated_on_webtoon_tag_change(self):
+        self.assertEqual(self.search(self.action, self.romance), ["둘다"])
+        with self.captureOnCommitCallbacks(execute=True):
+            WebtoonTag.objects.create(webtoon=self.action_only, tag=self.romance)
+        self.assertEqual(self.search(self.action, self.romance), ["둘다", "액션만"])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.both.delete()
+        self.assertEqual(self.search(self.action, self.romance), ["액션만"])
+
+    def test_invalidate_during_build(self):
+        """비트맵을 만드는 동안 커밋된 변경은 새 버전 키로 다시 만든다"""
+        build = tag_index.build_tag_bitmaps
+
+        def build_then_commit(tag_ids):
+            bitmaps = build(tag_ids)
+            # DB 를 읽은 뒤, 캐시에 쓰기 전에 다른 요청의 변경이 커밋됨
+            with self.captureOnCommitCallbacks(execute=True):
+                WebtoonTag.objects.create(webtoon=self.action_only, tag=self.romance)
+            return bitmaps
+
+        with mock.patch.object(tag_index, "build_tag_bitmaps", build_then_commit):
+            self.assertEqual(self.search(self.action, self.romance), ["둘다"])
+        self.assertEqual(self.search(self.action, self.romance), ["둘다", "액션만"])
+
+    def test_invalid_tag_id(self):
+        response = self.client.get("/api/webtoons/search/tag", {"id": ["abc"]})
+        self.assertEqual(response.status_code, 400)
+
+
+class SearchByIntegrateTestCase(TestCase):
+    """2-gram 색인 기반 통합 검색과 순위 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.exact = create_webtoon(title="나혼자", like_count=1)
+        self.prefix = create_webtoon(title="나혼자만 레벨업", like_count=2)
+        self.contains = create_webtoon(
+            title="오늘도 나혼자 산다", platform="kakao", like_count=3
+        )
+        self.other = create_webtoon(title="혼자 나간다", author="나혼")
+
+    def search(self, **params):
+        response = self.client.get("/api/webtoons/search", params)
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.data]
+
+    def test_rank_exact_prefix_contains(self):
+        self.assertEqual(
+            self.search(term="나혼자"),
+            ["나혼자", "나혼자만 레벨업", "오늘도 나혼자 산다"],
+        )
+
+    def test_author_and_single_character(self):
+        self.assertEqual(self.search(term="나혼")[-1], "오늘도 나혼자 산다")
+        self.assertIn("혼자 나간다", self.search(term="나혼"))
+        self.assertEqual(len(self.search(term="간")), 1)
+
+    def test_compose_with_provider(self):
+        self.assertEqual(
+            self.search(term="나혼자", provider="kakao"), ["오늘도 나혼자 산다"]
+        )
+
+    def test_reindex_on_title_change(self):
+        self.other.title = "새 제목"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.other.save()
+        self.assertEqual(self.search(term="새 제"), ["새 제목"])
+        self.assertEqual(self.search(term="혼자 나"), [])
+
+
+class SerialDayTestCase(TestCase):
+    """연재 요일 비트마스크 저장과 요일별 목록 필터 확인"""
+
+    def setUp(self):
+        cache.clear()
+
+    def test_serializer_round_trip(self):
+        serializer = WebtoonsSerializer(
+            data={
+                "title": "요일 웹툰",
+                "author": "작가",
+                "thumbnail": "https://example.com/thumbnail.jpg",
+                "webtoon_url": "https://example.com/webtoon",
+                "publication_day": "2025-02-10",
+                "platform": "naver",
+                "serialization_cycle": "1weeks",
+                "serial_day": ["mon", "thu"],
+            }
+        )
+        serializer.is_valid(raise_exception=True)
+        webtoon = serializer.save()
+        webtoon.refresh_from_db()
+        self.assertEqual(webtoon.serial_day, ["mon", "thu"])
+        self.assertEqual(
+            set(WebtoonsSerializer(webtoon).data["serial_day"]), {"mon", "thu"}
+        )
+
+    def test_list_filter_by_day(self):
+        create_webtoon(title="월목", serial_day=["mon", "thu"])
+        create_webtoon(title="일", serial_day=["sun"])
+        response = self.client.get("/api/webtoons/list", {"day": "thu"})
+        self.assertEqual([item["title"] for item in response.data["results"]], ["월목"])
+
+
+class ResponseCacheTestCase(TestCase):
+    """익명 조회 API 응답 캐시와 버전 키 무효화 확인"""
+
+    def setUp(self):
+        self.client = APIClient()
+        cache.clear()
+        self.tag = Tag.objects.create(tag_name="액션", category="genre")
+        self.webtoon = create_webtoon(title="캐시 웹툰")
+        WebtoonTag.objects.create(webtoon=self.webtoon, tag=self.tag)
+
+    def test_cached_regardless_of_param_order(self):
+        other = Tag.objects.create(tag_name="로맨스", category="genre")
+        self.client.get("/api/webtoons/list", {"id": [self.tag.id, other.id]})
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                "/api/webtoons/list", {"id": [other.id, self.tag.id]}
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_distinct_queries_not_shared(self):
+        # 값의 쉼표/& 가 이어 붙인 키에서 다른 쿼리와 겹치지 않는다
+        pairs = [
+            ("term=a,b", "term=a&term=b"),
+            ("term=%EC%BA%90%EC%8B%9C%26z%3D1", "term=%EC%BA%90%EC%8B%9C&z=1"),
+        ]
+        for first, second in pairs:
+            self.client.get(f"/api/webtoons/search?{first}")
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(f"/api/webtoons/search?{second}")
+            self.assertGreater(len(queries), 0, second)
+
+    def test_cached_per_scheme(self):
+        # next 링크의 scheme 이 다르므로 https 요청에 http 응답을 돌려주지 않는다
+        self.client.get("/api/webtoons/list", {"page_size": 1})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/webtoons/list", {"page_size": 1}, secure=True)
+        self.assertGreater(len(queries), 0)
+
+    def test_invalidated_on_webtoon_change(self):
+        self.assertEqual(len(self.client.get("/api/webtoons/list").data["results"]), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            create_webtoon(title="새 웹툰")
+        self.assertEqual(len(self.client.get("/api/webtoons/list").data["results"]), 2)
+
+    def test_invalidated_on_approval_change(self):
+        url = "/api/webtoons/search"
+        self.assertEqual(self.client.get(url).data[0]["is_approved"], "pending")
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                f"/api/webtoons/{self.webtoon.pk}/approve",
+                {"action": "approve"},
+                format="json",
+            )
+        self.assertEqual(self.client.get(url).data[0]["is_approved"], "approved")
+
+    def test_tag_list_invalidated_on_tag_change(self):
+        url = "/api/webtoons/tag"
+        self.assertEqual(len(self.client.get(url, {"category": "genre"}).data), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            Tag.objects.create(tag_name="판타지", category="genre")
+        self.assertEqual(len(self.client.get(url, {"category": "genre"}).data), 2)
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class ViewCountTestCase(TestCase):
+    """조회 이벤트 버퍼링, 중복 제외, 묶음 반영 확인"""
+
+    def setUp(self):
+        cache.clear()
+        view_count_buffer.drain()
+        self.client = APIClient()
+        self.webtoons = [create_webtoon(title=f"웹툰{i}") for i in range(3)]
+
+    def view(self, webtoon, ip):
+        return self.client.post(
+            f"/api/webtoons/{webtoon.pk}/view", REMOTE_ADDR=ip
+        ).data["counted"]
+
+    def view_counts(self):
+        return [
+            Webtoon.objects.get(pk=webtoon.pk).view_count for webtoon in self.webtoons
+        ]
+
+    def test_dedup_per_viewer(self):
+        self.assertTrue(self.view(self.webtoons[0], "10.0.0.1"))
+        self.assertFalse(self.view(self.webtoons[0], "10.0.0.1"))
+        self.assertTrue(self.view(self.webtoons[0], "10.0.0.2"))
+        self.assertTrue(self.view(self.webtoons[1], "10.0.0.1"))
+
+    def test_flush_batches_updates(self):
+        for ip in ["10.0.0.1", "10.0.0.2"]:
+            self.view(self.webtoons[0], ip)
+            self.view(self.webtoons[1], ip)
+        self.view(self.webtoons[2], "10.0.0.1")
+
+        # 웹툰 id 조회 + 증가량 2(웹툰 0, 1) 와 1(웹툰 2) 두 묶음
+        with self.assertNumQueries(3):
+            self.assertEqual(flush_pending_views(), 2)
+        self.assertEqual(self.view_counts(), [2, 2, 1])
+        self.assertEqual(flush_pending_views(), 0)
+
+    def test_flush_command(self):
+        self.view(self.webtoons[1], "10.0.0.1")
+        out = io.StringIO()
+        call_command("flush_view_counts", stdout=out)
+        self.assertIn("UPDATE 1번", out.getvalue())
+        self.assertEqual(self.view_counts(), [0, 1, 0])
+
+    def test_flush_failure_kept(self):
+        self.view(self.webtoons[0], "10.0.0.1")
+        with mock.patch.object(
+            Webtoon.objects, "filter", side_effect=RuntimeError
+        ), self.assertLogs("webtoons.view_counter", "ERROR"):
+            self.assertEqual(flush_pending_views(), 0)
+        # 반영하지 못한 조회수는 캐시 카운터로 돌아가 다음 반영에 들어간다
+        self.assertEqual(flush_pending_views(), 1)
+        self.assertEqual(self.view_counts(), [1, 0, 0])
+
+    def test_unknown_webtoon(self):
+        response = self.client.post("/api/webtoons/0/view", REMOTE_ADDR="10.0.0.1")
+        self.assertEqual(response.status_code, 404)
+        self.assertIsNone(cache.get(VIEW_PENDING_KEY.format(webtoon_id=0)))
+
+    def test_forwarded_for_needs_trusted_proxy(self):
+        def view(forwarded_for):
+            return self.client.post(
+                f"/api/webtoons/{self.webtoons[0].pk}/view",
+                REMOTE_ADDR="10.0.0.1",
+                HTTP_X_FORWARDED_FOR=forwarded_for,
+            ).data["counted"]
+
+        # 프록시가 없으면 클라이언트가 보낸 X-Forwarded-For 는 무시
+        self.assertTrue(view("1.1.1.1"))
+        self.assertFalse(view("2.2.2.2"))
+
+        rest_framework = {**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            # 프록시가 붙인 마지막 주소만 신뢰, 앞쪽은 클라이언트가 바꿀 수 있다
+            self.assertTrue(view("3.3.3.3, 1.1.1.1"))
+            self.assertFalse(view("4.4.4.4, 1.1.1.1"))
+
+    def test_refresh_view_rankings(self):
+        self.client.get("/api/webtoons/list", {"sort": "view"})
+        self.view(self.webtoons[2], "10.0.0.1")
+        flush_pending_views()
+
+        self.assertTrue(refresh_view_rankings())
+        with self.assertNumQueries(2):
+            response = self.client.get("/api/webtoons/list", {"sort": "view"})
+        self.assertEqual(response.data["results"][0]["title"], "웹툰2")
+        # VIEW_COUNT_RANKING_INTERVAL 안에는 다시 만들지 않는다
+        self.assertFalse(refresh_view_rankings())
+
+
+class WebtoonLikeTestCase(TestCase):
+    """좋아요/취소 API 와 shard 합계 반영 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.user = create_user(0)
+        self.client.force_authenticate(self.user)
+        self.webtoon = create_webtoon()
+        self.url = f"/api/webtoons/{self.webtoon.pk}/like"
+
+    def test_like_and_unlike(self):
+        self.assertTrue(self.client.post(self.url).data["created"])
+        self.assertFalse(self.client.post(self.url).data["created"])
+        call_command("rollup_like_counts", stdout=io.StringIO())
+        self.webtoon.refresh_from_db()
+        self.assertEqual(self.webtoon.like_count, 1)
+
+        self.assertTrue(self.client.delete(self.url).data["deleted"])
+        self.assertFalse(self.client.delete(self.url).data["deleted"])
+        self.assertEqual(rollup_like_counts(), 1)
+        self.webtoon.refresh_from_db()
+        self.assertEqual(self.webtoon.like_count, 0)
+
+    @override_settings(LIKE_COUNTER_SHARDS=1)
+    def test_shard_created_concurrently(self):
+        """처음 쓰는 shard 를 다른 요청이 먼저 만들고 더해도 두 요청 모두 반영된다"""
+        other = create_user(1)
+        bulk_create = WebtoonLikeShard.objects.bulk_create
+
+        def other_request_first(*args, **kwargs):
+            # UPDATE 가 0행인 것을 본 뒤 다른 요청이 shard 를 만들고 커밋한 상황
+            WebtoonLikeShard.objects.create(webtoon=self.webtoon, shard=0, count=1)
+            return bulk_create(*args, **kwargs)
+
+        with mock.patch.object(
+            WebtoonLikeShard.objects, "bulk_create", other_request_first
+        ):
+            self.assertTrue(like_webtoon(other, self.webtoon.pk))
+        # 중복 좋아요는 shard 를 고치지 않는다
+        self.assertFalse(like_webtoon(other, self.webtoon.pk))
+
+        shard = WebtoonLikeShard.objects.get()
+        self.assertEqual(shard.count, 2)
+
+    def test_rollup_negative_total(self):
+        # 취소만 먼저 반영된 shard 합계가 음수여도 0 인 like_count 는 다시 쓰지 않는다
+        WebtoonLikeShard.objects.create(webtoon=self.webtoon, shard=0, count=-1)
+        self.assertEqual(rollup_like_counts(), 0)
+        self.webtoon.refresh_from_db()
+        self.assertEqual(self.webtoon.like_count, 0)
+
+    def test_delete_likes(self):
+        for i in range(1, 4):
+            like_webtoon(create_user(i), self.webtoon.pk)
+        likes = WebtoonLike.objects.filter(user__nick_name__in=["유저1", "유저2"])
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(delete_likes(likes), 2)
+        # 좋아요 행을 읽지 않고 DELETE 한 번으로 지운다
+        deletes = [q["sql"] for q in queries if q["sql"].startswith("DELETE")]
+        self.assertEqual(len(deletes), 1)
+        self.assertEqual(rollup_like_counts(), 1)
+        self.webtoon.refresh_from_db()
+        self.assertEqual(self.webtoon.like_count, 1)
+
+    def test_requires_login(self):
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.post(self.url).status_code, 401)
+
+    def test_not_found(self):
+        self.assertEqual(self.client.post("/api/webtoons/0/like").status_code, 404)
+
+
+# sqlite 메모리 DB 는 스레드별 연결을 지원하지 않으므로 MySQL(CI) 에서만 실행
+@skipUnlessDBFeature("test_db_allows_multiple_connections")
+@override_settings(LIKE_COUNTER_SHARDS=4)
+class WebtoonLikeConcurrencyTestCase(TransactionTestCase):
+    """여러 스레드에서 동시에 좋아요해도 합계가 맞는지 확인"""
+
+    def test_parallel_likes(self):
+        webtoon = create_webtoon()
+        users = [create_user(i) for i in range(16)]
+        errors = []
+        barrier = threading.Barrier(len(users))
+
+        def like(user):
+            try:
+                barrier.wait()
+                # 같은 사용자의 중복 요청도 섞어서 보낸다
+                like_webtoon(user, webtoon.pk)
+                like_webtoon(user, webtoon.pk)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=like, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(WebtoonLikeShard.objects.count(), 4)
+        rollup_like_counts()
+        webtoon.refresh_from_db()
+        self.assertEqual(webtoon.like_count, len(users))
+
+
+class RankingSnapshotTestCase(TestCase):
+    """랭킹 스냅샷 기반 목록 조회와 무효화 확인"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.webtoons = [
+            create_webtoon(title=f"웹툰{i}", like_count=i, view_count=10 - i)
+            for i in range(5)
+        ]
+
+    def titles(self, **params):
+        response = self.client.get("/api/webtoons/list", params)
+        self.assertEqual(response.status_code, 200)
+        return [item["title"] for item in response.data["results"]], response.data
+
+    def test_page_without_order_by(self):
+        self.titles(sort="view")
+        with CaptureQueriesContext(connection) as queries:
+            titles, data = self.titles(sort="view", page_size=2)
+        self.assertEqual(titles, ["웹툰0", "웹툰1"])
+        self.assertFalse(any("ORDER BY" in query["sql"] for query in queries))
+
+        # 다음 페이지 커서도 스냅샷에서 이어서 조회
+        response = self.client.get(data["next"])
+        titles = [item["title"] for item in response.data["results"]]
+        self.assertEqual(titles, ["웹툰2", "웹툰3"])
+
+    def test_cursor_after_snapshot_rebuild(self):
+        _, data = self.titles(sort="view", page_size=2)
+        # 커서 행(웹툰1)의 조회수가 바뀌어 스냅샷에서 맨 뒤로 가도 커서 다음부터 이어서
+        Webtoon.objects.filter(pk=self.webtoons[1].pk).update(view_count=0)
+        invalidate_rankings("view_count")
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(data["next"])
+        titles = [item["title"] for item in response.data["results"]]
+        self.assertEqual(titles, ["웹툰2", "웹툰3"])
+        self.assertTrue(any("ORDER BY" in query["sql"] for query in queries))
+
+    def test_skip_deleted_page(self):
+        _, data = self.titles(sort="view", page_size=1)
+        # 스냅샷에는 남아 있는 채로 다음 두 페이지의 웹툰이 삭제됨
+        Webtoon.objects.filter(pk__in=[w.pk for w in self.webtoons[1:3]]).delete()
+        response = self.client.get(data["next"])
+        titles = [item["title"] for item in response.data["results"]]
+        self.assertEqual(titles, ["웹툰3"])
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["title"], "웹툰4")
+        self.assertIsNone(response.data["next"])
+
+    @override_settings(KEYSET_SNAPSHOT_SCAN_RATIO=2)
+    def test_rare_tag_from_db(self):
+        tag = Tag.objects.create(tag_name="액션", category="genre")
+        rare = Tag.objects.create(tag_name="로맨스", category="genre")
+        for webtoon in self.webtoons[:3]:
+            WebtoonTag.objects.create(webtoon=webtoon, tag=tag)
+        WebtoonTag.objects.create(webtoon=self.webtoons[4], tag=rare)
+
+        # 5개 중 3개는 스냅샷을 훑고, 1개는 스냅샷 대신 DB 에서 정렬
+        self.titles(sort="view")
+        for tag_id, expected, ordered in [
+            (tag.id, ["웹툰0", "웹툰1", "웹툰2"], False),
+            (rare.id, ["웹툰4"], True),
+        ]:
+            with CaptureQueriesContext(connection) as queries:
+                titles, _ = self.titles(sort="view", id=tag_id)
+            self.assertEqual(titles, expected)
+            self.assertEqual(
+                any("ORDER BY" in query["sql"] for query in queries), ordered
+            )
+
+    def test_snapshot_holds_big_ids(self):
+        # BigAutoField 범위의 id 도 플랫폼과 관계없이 담긴다
+        self.assertEqual(build_ranking("-view_count").itemsize, 8)
+
+    def test_invalidated_on_counter_rollup(self):
+        self.assertEqual(self.titles()[0][0], "웹툰4")
+        for i in range(5):
+            like_webtoon(create_user(i), self.webtoons[0].pk)
+        rollup_like_counts()
+        self.assertEqual(self.titles(page_size=3)[0][0], "웹툰0")
+
+    def test_invalidated_on_webtoon_change(self):
+        self.assertEqual(len(self.titles(status="completed")[0]), 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            webtoon = self.webtoons[1]
+            webtoon.is_completed = True
+            webtoon.save()
+        self.assertEqual(self.titles(status="completed")[0], ["웹툰1"])
+
+    def test_refresh_command(self):
+        call_command("refresh_rankings", stdout=io.StringIO())
+        with self.assertNumQueries(2):
+            self.titles(sort="created", day="mon", status="new")
+
+
+class KeysetPaginationTestCase(TestCase):
+    """DB 정렬 경로의 동점 처리, 잘못된 커서, 페이지 크기 범위"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        # 좋아요 수가 같은 웹툰이 페이지 경계에 걸치도록
+        self.webtoons = [
+            create_webtoon(title=f"웹툰{i}", like_count=1 if i < 4 else 2)
+            for i in range(5)
+        ]
+
+    def paginate(self, paginator, cursor=None):
+        params = {"cursor": cursor} if cursor else {}
+        request = Request(APIRequestFactory().get("/", params))
+        return paginator.paginate_queryset(Webtoon.objects.all(), request)
+
+    def test_ties_across_pages(self):
+        paginator = KeysetPagination("-like_count", page_size=2)
+        ids = []
+        page = self.paginate(paginator)
+        while True:
+            ids += [webtoon.pk for webtoon in page]
+            if paginator.next_cursor is None:
+                break
+            page = self.paginate(paginator, paginator.next_cursor)
+        expected = sorted(
+            self.webtoons, key=lambda webtoon: (-webtoon.like_count, -webtoon.pk)
+        )
+        self.assertEqual(ids, [webtoon.pk for webtoon in expected])
+
+    def test_invalid_cursor(self):
+        def encode(cursor):
+            return base64.urlsafe_b64encode(json.dumps(cursor).encode()).decode()
+
+        cursors = [
+            "!!!",
+            "abc",
+            encode(1),
+            encode({"a": 1, "b": 2}),
+            encode([None, 1]),
+            encode([1, None]),
+            encode([1, 2**64]),
+            encode([1, 1, -1]),
+            encode([1, 1, "a"]),
+            encode([1, 1, 1, 1]),
+            base64.urlsafe_b64encode(b"\xff\xfe").decode(),
+        ]
+        # 랭킹 스냅샷 경로와 DB 정렬 경로 모두
+        for cursor in cursors:
+            for params in [{}, {"day": "weekly"}, {"sort": "created"}]:
+                with self.subTest(cursor=cursor, **params):
+                    response = self.client.get(
+                        "/api/webtoons/list", {**params, "cursor": cursor}
+                    )
+                    self.assertEqual(response.status_code, 400)
+
+    @override_settings(KEYSET_PAGE_SIZE=2, KEYSET_MAX_PAGE_SIZE=3)
+    def test_page_size_bounds(self):
+        for page_size, expected in [("0", 2), ("-1", 2), ("abc", 2), ("1", 1)]:
+            response = self.client.get("/api/webtoons/list", {"page_size": page_size})
+            self.assertEqual(len(response.data["results"]), expected)
+        response = self.client.get("/api/webtoons/list", {"page_size": 10**6})
+        self.assertEqual(len(response.data["results"]), 3)
@@ -7,6 +7,8 @@ from .views import (
     SearchByTagView,
     WebtoonApprovalView,
     WebtoonCreateView,
+    WebtoonLikeView,
+    WebtoonViewCountView,
 )
 
 urlpatterns = [
@@ -16,4 +18,6 @@ urlpatterns = [
     path("list", ListView.as_view(), name="webtoons-sort"),
     path("tag", ListByTagView.as_view(), name="webtoons-tag"),
     path("<int:pk>/approve", WebtoonApprovalView.as_view(), name="webtoons-approve"),
+    path("<int:pk>/view", WebtoonViewCountView.as_view(), name="webtoons-view"),
+    path("<int:pk>/like", WebtoonLikeView.as_view(), name="webtoons-like"),
 ]
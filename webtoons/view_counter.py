@@ -0,0 +1,184 @@
+"""
+웹툰 조회수 집계.
+
+조회 이벤트마다 UPDATE 를 날리면 인기 웹툰 행에 락이 몰리므로, 이벤트는 프로세스
+메모리 버퍼에 쌓고 백그라운드 스레드가 VIEW_COUNT_FLUSH_INTERVAL 초마다 모아서
+반영한다. VIEW_COUNT_FLUSH_INTERVAL 이 0 이면 스레드 없이 캐시의 웹툰별 카운터에 쌓고
+flush_view_counts 명령이 반영한다. 같은 사용자(비로그인은 IP)의 같은 웹툰 조회는
+VIEW_COUNT_DEDUP_WINDOW 동안 한 번만 센다.
+
+조회순 스냅샷과 응답 캐시는 반영할 때마다 무효화하지 않고, 모든 프로세스를 합쳐
+VIEW_COUNT_RANKING_INTERVAL 에 한 번 flusher 가 스냅샷을 다시 만들어 덮어쓴다.
+"""
+
+import atexit
+import logging
+import threading
+import time
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections
+from django.db.models import F
+from rest_framework.throttling import BaseThrottle
+
+from common.cache import bump_versions
+
+from .models import Webtoon
+from .ranking import refresh_rankings
+from .signals import WEBTOONS_CACHE_NAMESPACE
+
+logger = logging.getLogger(__name__)
+
+VIEW_SEEN_KEY = "webtoons:view_seen:{webtoon_id}:{viewer}"
+VIEW_RANKING_REFRESH_KEY = "webtoons:view_ranking_refreshed"
+VIEW_PENDING_KEY = "webtoons:view_pending:{webtoon_id}"
+
+
+def write_view_counts(counts):
+    """
+    웹툰별 증가량을 DB 에 반영하고 (실행한 UPDATE 수, 반영하지 못한 증가량) 을 반환.
+    증가량이 같은 웹툰끼리 묶어 UPDATE 한 번으로 반영한다 (웹툰당 최대 1회).
+    """
+    by_increment = defaultdict(list)
+    for webtoon_id, count in counts.items():
+        by_increment[count].append(webtoon_id)
+
+    updates = 0
+    failed = Counter()
+    try:
+        for increment, webtoon_ids in by_increment.items():
+            Webtoon.objects.filter(id__in=webtoon_ids).update(
+                view_count=F("view_count") + increment
+            )
+            updates += 1
+    except Exception:
+        logger.exception("조회수 반영 실패, 다음 주기에 다시 시도합니다")
+        for increment, webtoon_ids in list(by_increment.items())[updates:]:
+            for webtoon_id in webtoon_ids:
+                failed[webtoon_id] += increment
+    return updates, failed
+
+
+class ViewCountBuffer:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = Counter()
+        self._flusher = None
+
+    def add(self, webtoon_id, count=1):
+        with self._lock:
+            self._counts[webtoon_id] += count
+        self.start_flusher()
+
+    def drain(self):
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+        return counts
+
+    def flush(self):
+        """쌓인 조회수를 DB 에 반영하고 실행한 UPDATE 수를 반환"""
+        counts = self.drain()
+        if not counts:
+            return 0
+        updates, failed = write_view_counts(counts)
+        # 반영하지 못한 묶음만 버퍼로 되돌린다
+        for webtoon_id, count in failed.items():
+            self.add(webtoon_id, count)
+        return updates
+
+    def start_flusher(self):
+        interval = settings.VIEW_COUNT_FLUSH_INTERVAL
+        if not interval or self._flusher is not None:
+            return
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._flusher = threading.Thread(
+                target=self._run_flusher,
+                args=(interval,),
+                name="view-count-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+        atexit.register(self.flush)
+
+    def _run_flusher(self, interval):
+        while True:
+            time.sleep(interval)
+            close_old_connections()
+            if self.flush():
+                refresh_view_rankings()
+
+
+view_count_buffer = ViewCountBuffer()
+
+
+def refresh_view_rankings():
+    """조회순 스냅샷을 다시 만들고 응답 캐시를 무효화, 최근에 했으면 False"""
+    if not cache.add(
+        VIEW_RANKING_REFRESH_KEY, True, timeout=settings.VIEW_COUNT_RANKING_INTERVAL
+    ):
+        return False
+    # 버전을 올리지 않고 같은 키에 덮어써서 요청이 스냅샷을 다시 만들지 않게 한다
+    refresh_rankings(["-view_count"])
+    bump_versions(WEBTOONS_CACHE_NAMESPACE)
+    return True
+
+
+def get_viewer_key(request):
+    if request.user.is_authenticated:
+        return f"user:{request.user.pk}"
+    # X-Forwarded-For 는 클라이언트가 바꿀 수 있으므로 DRF NUM_PROXIES 만큼만 신뢰
+    return f"ip:{BaseThrottle().get_ident(request)}"
+
+
+def add_pending_view(webtoon_id, count=1):
+    """flusher 스레드가 없을 때 조회수를 프로세스 사이에 공유되는 캐시 카운터에 더한다"""
+    key = VIEW_PENDING_KEY.format(webtoon_id=webtoon_id)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key, count)
+    except ValueError:
+        # add 와 incr 사이에 flush 가 키를 지운 경우
+        cache.set(key, count, timeout=None)
+
+
+def flush_pending_views(batch_size=1000):
+    """캐시 카운터에 쌓인 조회수를 DB 에 반영하고 실행한 UPDATE 수를 반환"""
+    webtoon_ids = list(Webtoon.objects.values_list("id", flat=True))
+    counts = Counter()
+    for start in range(0, len(webtoon_ids), batch_size):
+        keys = {
+            VIEW_PENDING_KEY.format(webtoon_id=webtoon_id): webtoon_id
+            for webtoon_id in webtoon_ids[start : start + batch_size]
+        }
+        for key, count in cache.get_many(keys).items():
+            if not count:
+                continue
+            # 읽은 만큼만 빼서 그사이 더해진 조회는 다음 반영으로 남긴다
+            try:
+                cache.decr(key, count)
+            except ValueError:
+                continue
+            counts[keys[key]] += count
+    if not counts:
+        return 0
+
+    updates, failed = write_view_counts(counts)
+    for webtoon_id, count in failed.items():
+        add_pending_view(webtoon_id, count)
+    return updates
+
+
+def record_view(webtoon_id, viewer_key):
+    """조회를 기록, 중복 조회 기간 안의 재조회면 False"""
+    seen_key = VIEW_SEEN_KEY.format(webtoon_id=webtoon_id, viewer=viewer_key)
+    if not cache.add(seen_key, 1, timeout=settings.VIEW_COUNT_DEDUP_WINDOW):
+        return False
+    if settings.VIEW_COUNT_FLUSH_INTERVAL:
+        view_count_buffer.add(webtoon_id)
+    else:
+        add_pending_view(webtoon_id)
+    return True
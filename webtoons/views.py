@@ -2,8 +2,8 @@ import json
 import os
 
 import requests
-from django.db.models import Count, Q
 from django.http import JsonResponse, QueryDict
+from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import (
     OpenApiParameter,
     OpenApiTypes,
@@ -16,13 +16,32 @@ from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from bookmark.bookmarked import BookmarkFlagMixin
+from common.cache import cache_response
+from common.pagination import KeysetPagination
+from common.routers import ReplicaReadMixin
+
+from .like_counter import like_webtoon, unlike_webtoon
 from .models import Tag, Webtoon
+from .ranking import get_ranking
+from .search import search_webtoons
 from .serializers import (
     TagSerializer,
     WebtoonsSerializer,
     WebtoonTagSerializer,
 )
+from .signals import TAGS_CACHE_NAMESPACE, WEBTOONS_CACHE_NAMESPACE
+from .tag_index import match_all_tags
 from .utils.image_handler import upload_file_to_s3
+from .view_counter import get_viewer_key, record_view
+
+
+def parse_tag_ids(values):
+    """쿼리스트링 태그 id 목록을 int 로 변환, 숫자가 아니면 None"""
+    try:
+        return [int(value) for value in values]
+    except ValueError:
+        return None
 
 
 class WebtoonCreateView(CreateAPIView):
@@ -50,14 +69,14 @@ class WebtoonCreateView(CreateAPIView):
             data["tags"] = json.loads(request.data["tags"]) if data["tags"] else []
 
         try:
-            thumbnail_url = upload_file_to_s3(request)
+            thumbnail_url, thumbnail_variants = upload_file_to_s3(request)
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         data["thumbnail"] = thumbnail_url
 
         serializer = self.get_serializer(data=data)
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        serializer.save(thumbnail_variants=thumbnail_variants)
         headers = self.get_success_headers(serializer.data)
         return Response(
             serializer.data, status=status.HTTP_201_CREATED, headers=headers
@@ -69,12 +88,12 @@ class WebtoonCreateView(CreateAPIView):
         tags=["Webtoons"],
     )
     def get(self, request):
-        webtoons = Webtoon.objects.all()
+        webtoons = Webtoon.objects.for_listing()
         serializer = WebtoonsSerializer(webtoons, many=True)
         return Response(serializer.data)
 
 
-class SearchByIntegrateView(APIView):
+class SearchByIntegrateView(BookmarkFlagMixin, ReplicaReadMixin, APIView):
     permission_classes = [AllowAny]
 
     @extend_schema(
@@ -97,12 +116,13 @@ class SearchByIntegrateView(APIView):
             400: OpenApiTypes.OBJECT,
         },
     )
+    @cache_response(WEBTOONS_CACHE_NAMESPACE, TAGS_CACHE_NAMESPACE)
     def get(self, request):
         provider = request.query_params.get("provider", "")
         tags = request.query_params.getlist("tag")
         term = request.query_params.get("term", "")
 
-        queryset = Webtoon.objects.all()
+        queryset = Webtoon.objects.for_listing()
 
         if provider and provider != "all":
             queryset = queryset.filter(
@@ -113,17 +133,14 @@ class SearchByIntegrateView(APIView):
             queryset = queryset.filter(webtoon_tags__tag__tag_name__in=tags).distinct()
 
         if term:
-            queryset = queryset.filter(
-                Q(title__icontains=term) | Q(author__icontains=term)
-            )
-
-        queryset = queryset.prefetch_related("webtoon_tags__tag")
+            # 2-gram 검색 색인으로 후보를 좁히고 정확/앞부분 일치 순으로 정렬
+            queryset = search_webtoons(queryset, term)
 
         serializer = WebtoonsSerializer(queryset, many=True)
         return Response(serializer.data)
 
 
-class ListByTagView(APIView):
+class ListByTagView(ReplicaReadMixin, APIView):
     permission_classes = [AllowAny]
 
     @extend_schema(
@@ -139,6 +156,7 @@ class ListByTagView(APIView):
             400: OpenApiTypes.OBJECT,
         },
     )
+    @cache_response(TAGS_CACHE_NAMESPACE)
     def get(self, request):
         category = request.GET.get("category")
         if category not in [choice[0] for choice in Tag.CATEGORY_CHOICES]:
@@ -151,7 +169,7 @@ class ListByTagView(APIView):
         return Response(serializer.data)
 
 
-class SearchByTagView(APIView):
+class SearchByTagView(BookmarkFlagMixin, ReplicaReadMixin, APIView):
     permission_classes = [AllowAny]
 
     @extend_schema(
@@ -167,35 +185,25 @@ class SearchByTagView(APIView):
             400: OpenApiTypes.OBJECT,
         },
     )
+    @cache_response(WEBTOONS_CACHE_NAMESPACE, TAGS_CACHE_NAMESPACE)
     def get(self, request):
-        tag_ids = request.GET.getlist("id")
+        tag_ids = parse_tag_ids(request.GET.getlist("id"))
+        if tag_ids is None:
+            return Response(
+                {"error": "유효하지 않은 태그 ID입니다"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
         # webtoons/search/tag?id=1&id=3&....
-        webtoons = Webtoon.objects.all()
-        filtered_webtoons = (
-            webtoons.filter(webtoon_tags__tag__id__in=tag_ids)
-            .annotate(
-                matching_tags=Count(
-                    "webtoon_tags", filter=Q(webtoon_tags__tag__id__in=tag_ids)
-                )
-            )
-            .filter(matching_tags=len(tag_ids))
-        )
-        # 웹툰과 연결 되어 있는 태그 수 카운팅
-
-        # for tag_id in tag_id:
-        #     try:
-        #         tag_id = int(tag_id)
-        #         tag = Tag.objects.get(id=tag_id)
-        #         if tag:
-        #             webtoons = webtoons.filter(webtoon_tags__tag__id=tag_id)
-        #     except Tag.DoesNotExist:
-        #         return Response({"error":"유효하지 않은 ID입니다"},status=status.HTTP_400_BAD_REQUEST)
+        # 태그 역색인 비트맵 교집합으로 모든 태그를 가진 웹툰 id 를 구한 뒤 해당 웹툰만 조회
+        webtoon_ids = match_all_tags(tag_ids)
+        filtered_webtoons = Webtoon.objects.for_listing().filter(id__in=webtoon_ids)
+
         serializer = WebtoonsSerializer(filtered_webtoons, many=True)
         return Response(serializer.data)
 
 
-class ListView(APIView):
+class ListView(BookmarkFlagMixin, ReplicaReadMixin, APIView):
     permission_classes = [AllowAny]
     serializer_class = WebtoonsSerializer
 
@@ -228,38 +236,31 @@ class ListView(APIView):
                 type=int,
                 many=True,
             ),
+            OpenApiParameter(
+                name="cursor",
+                description="다음 페이지 커서 (응답의 next 링크에 포함)",
+                type=str,
+            ),
+            OpenApiParameter(
+                name="page_size",
+                description="페이지 크기 (기본 20, 최대 100)",
+                type=int,
+            ),
         ],
+        responses={200: WebtoonsSerializer(many=True)},
     )
+    @cache_response(WEBTOONS_CACHE_NAMESPACE, TAGS_CACHE_NAMESPACE)
     def get(self, request):
         day = request.query_params.get("day", "")
-        status = request.query_params.get("status", "")
+        webtoon_status = request.query_params.get("status", "")
         sort = self.request.query_params.get("sort", "popular")
-        tag_ids = request.GET.getlist("id")
-        webtoons = Webtoon.objects.all()
-
-        # 요일 필터링
-        # if day:
-        #     webtoons = webtoons.filter(Q(serial_day__regex=r'\b{}\b'.format(day)))
-        if day:
-            webtoons = webtoons.filter(serial_day__contains=f"{day}")
-
-        # 상태 필터링
-        if status == "new":
-            webtoons = webtoons.filter(is_new=True)
-        elif status == "completed":
-            webtoons = webtoons.filter(is_completed=True)
-
-        # 태그 필터링
-        if tag_ids:
-            webtoons = (
-                Webtoon.objects.filter(webtoon_tags__tag__id__in=tag_ids)
-                .annotate(
-                    matching_tags=Count(
-                        "webtoon_tags", filter=Q(webtoon_tags__tag__id__in=tag_ids)
-                    )
-                )
-                .filter(matching_tags=len(tag_ids))
+        tag_ids = parse_tag_ids(request.GET.getlist("id"))
+        if tag_ids is None:
+            return Response(
+                {"error": "유효하지 않은 태그 ID입니다"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        webtoons = Webtoon.objects.for_listing()
 
         sort_mapping = {
             "popular": "-like_count",
@@ -269,10 +270,38 @@ class ListView(APIView):
         }
         ordering = sort_mapping.get(sort, "-like_count")
 
-        webtoons = webtoons.order_by(ordering)
+        # (정렬 컬럼, id) 키셋 페이지네이션
+        paginator = KeysetPagination(ordering)
+        page = None
+
+        # 랭킹 스냅샷(정렬된 id 목록)에서 페이지 id 만 잘라 해당 행만 조회
+        if not day or day in Webtoon.SERIAL_DAY_BITS:
+            ids = get_ranking(ordering, day, webtoon_status)
+            # 태그 필터는 스냅샷 전체를 거르지 않고 페이지가 찰 때까지만 훑는다
+            matched = set(match_all_tags(tag_ids)) if tag_ids else None
+            page = paginator.paginate_ids(
+                ids, webtoons, request, view=self, include=matched
+            )
 
-        serializer = WebtoonsSerializer(webtoons, many=True)
-        return Response(serializer.data)
+        # 스냅샷에 없는 커서 등은 DB 에서 정렬해 조회
+        if page is None:
+            # 요일 필터링
+            # if day:
+            #     webtoons = webtoons.filter(Q(serial_day__regex=r'\b{}\b'.format(day)))
+            if day:
+                webtoons = webtoons.on_serial_day(day)
+
+            # 상태 필터링
+            webtoons = webtoons.with_status(webtoon_status)
+
+            # 태그 필터링 (역색인 비트맵 교집합 → 요일/상태 필터와 함께 페이지만 조회)
+            if tag_ids:
+                webtoons = webtoons.filter(id__in=match_all_tags(tag_ids))
+
+            page = paginator.paginate_queryset(webtoons, request, view=self)
+
+        serializer = WebtoonsSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
 
 
 class WebtoonApprovalView(UpdateAPIView):
@@ -318,6 +347,51 @@ class WebtoonApprovalView(UpdateAPIView):
         tags=["Webtoon approval"],
     )
     def get(self, request, pk):
-        webtoon = self.get_object()
+        # 태그는 응답에 그리는 GET 에서만 미리 가져온다 (PATCH 는 승인 상태만 바꾼다)
+        webtoon = get_object_or_404(Webtoon.objects.for_listing(), pk=pk)
         serializer = WebtoonsSerializer(webtoon)
         return Response(serializer.data)
+
+
+class WebtoonViewCountView(APIView):
+    permission_classes = [AllowAny]
+
+    @extend_schema(
+        summary="웹툰 조회수 기록",
+        description="웹툰 조회를 기록하는 api, 조회수는 모아서 주기적으로 반영됩니다. "
+        "같은 사용자(비로그인은 IP)의 재조회는 일정 시간 동안 한 번만 셉니다.",
+        tags=["Webtoons"],
+        request=None,
+        responses={202: OpenApiTypes.OBJECT, 404: OpenApiTypes.OBJECT},
+    )
+    def post(self, request, pk):
+        # 없는 웹툰 id 로 버퍼와 중복 조회 키가 늘어나지 않도록 먼저 확인
+        webtoon = get_object_or_404(Webtoon.objects.only("id"), pk=pk)
+        counted = record_view(webtoon.pk, get_viewer_key(request))
+        return Response({"counted": counted}, status=status.HTTP_202_ACCEPTED)
+
+
+class WebtoonLikeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="웹툰 좋아요",
+        description="웹툰에 좋아요를 누르는 api, 좋아요 수는 주기적으로 반영됩니다.",
+        tags=["Webtoons"],
+        request=None,
+        responses={200: OpenApiTypes.OBJECT, 404: OpenApiTypes.OBJECT},
+    )
+    def post(self, request, pk):
+        webtoon = get_object_or_404(Webtoon.objects.only("id"), pk=pk)
+        created = like_webtoon(request.user, webtoon.pk)
+        return Response({"liked": True, "created": created}, status=status.HTTP_200_OK)
+
+    @extend_schema(
+        summary="웹툰 좋아요 취소",
+        tags=["Webtoons"],
+        request=None,
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    def delete(self, request, pk):
+        deleted = unlike_webtoon(request.user, pk)
+        return Response({"liked": False, "deleted": deleted}, status=status.HTTP_200_OK)